@@ -0,0 +1,169 @@
+import argparse
+import concurrent.futures
+import itertools
+import json
+import os
+from simulation import ReferencePlayer, Simulation, difficulties
+
+#  Plays thousands of seeded games with the scripted player to show how each difficulty plays out
+#  Reports score distributions, how many games survive to each height and what ends them
+#  $ python3 analyze.py --games 2000 --sweep enemy_chance=5,10,20 --output analysis.json
+
+height_step = 250  # height between the points of the survival curves
+percentiles = [10, 25, 50, 75, 90, 99]
+
+
+def play(difficulty: str, settings: dict, seed: int, frames: int) -> tuple:
+
+    """
+    Plays one game with the scripted player
+    settings: difficulty setting overrides
+    frames: games that last this long are cut off
+    Returns the score, the height reached, the number of frames and the cause of death, 'alive' if cut off
+    """
+
+    sim = Simulation(difficulty, 'knight_m', seed, settings=settings)
+    bot = ReferencePlayer()
+    while not sim.game_over and sim.frame < frames:
+        sim.step(bot.inputs(sim))
+    return sim.score, sim.height, sim.frame, sim.cause_of_death or 'alive'
+
+
+def play_many(difficulty: str, settings: dict, seeds: range, frames: int) -> list:
+
+    """
+    Plays a batch of games in a worker process
+    Returns the result of each game
+    """
+
+    return [play(difficulty, settings, seed, frames) for seed in seeds]
+
+
+def summarize(results: list) -> dict:
+
+    """
+    results: results of play
+    Returns the score percentiles, the survival curve and the causes of death of the games
+    """
+
+    scores = sorted(result[0] for result in results)
+    heights = sorted(result[1] for result in results)
+    n = len(results)
+
+    # fraction of games that climbed at least each height
+    survival = []
+    height = 0
+    reached = n
+    i = 0
+    while reached > 0:
+        while i < n and heights[i] < height:
+            i += 1
+        reached = n-i
+        survival.append([height, reached/n])
+        height += height_step
+
+    causes = {}
+    for result in results:
+        causes[result[3]] = causes.get(result[3], 0)+1
+
+    return {'games': n,
+            'score_mean': sum(scores)/n,
+            'score_percentiles': {p: scores[min(n-1, p*n//100)] for p in percentiles},
+            'score_max': scores[-1],
+            'frames_mean': sum(result[2] for result in results)/n,
+            'survival_by_height': survival,
+            'causes_of_death': {cause: count/n for cause, count in sorted(causes.items())}}
+
+
+def analyze(difficulty: str, settings: dict, games: int, seed: int, frames: int,
+            executor: concurrent.futures.Executor, batch=50) -> dict:
+
+    """
+    Plays games seeded seed to seed+games-1 in batches across the executor's processes
+    settings: difficulty setting overrides, None for the plain difficulty
+    Returns the summary of the games
+    """
+
+    batches = [range(start, min(start+batch, seed+games)) for start in range(seed, seed+games, batch)]
+    futures = [executor.submit(play_many, difficulty, settings, seeds, frames) for seeds in batches]
+    results = [result for future in futures for result in future.result()]
+    summary = summarize(results)
+    summary['difficulty'] = difficulty
+    summary['settings'] = dict(difficulties[difficulty], **(settings or {}))
+    return summary
+
+
+def parse_sweep(sweeps: list) -> list:
+
+    """
+    sweeps: 'name=value,value' strings
+    Returns every combination of the swept values as a settings dictionary, one empty dictionary without sweeps
+    Raises ValueError for an unknown setting or a value the game cannot use
+    """
+
+    names = []
+    values = []
+    for sweep in sweeps:
+        name, _, listed = sweep.partition('=')
+        if name not in difficulties['hard']:
+            raise ValueError('unknown setting {}, expected one of {}'.format(name, ', '.join(difficulties['hard'])))
+        try:
+            swept = [int(value) for value in listed.split(',')]
+        except ValueError:
+            raise ValueError('values of {} must be integers, got {}'.format(name, listed)) from None
+
+        # a chance of 1 in n needs at least one outcome to choose from
+        if name.endswith('_chance') and min(swept) < 1:
+            raise ValueError('values of {} must be at least 1'.format(name))
+        names.append(name)
+        values.append(swept)
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+
+def report(summary: dict) -> str:
+
+    """
+    Returns a short text report of a summary
+    """
+
+    overrides = ', '.join('{}={}'.format(name, value) for name, value in summary['settings'].items()
+                          if difficulties[summary['difficulty']][name] != value)
+    lines = ['{} {}'.format(summary['difficulty'], overrides).rstrip(),
+             '  score mean {:.0f}  '.format(summary['score_mean']) +
+             '  '.join('p{} {}'.format(p, score) for p, score in summary['score_percentiles'].items()),
+             '  deaths  ' + '  '.join('{} {:.1%}'.format(cause, share)
+                                       for cause, share in summary['causes_of_death'].items()),
+             '  survival  ' + '  '.join('{} {:.0%}'.format(height, share)
+                                         for height, share in summary['survival_by_height'][:12])]
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Dungeon Jump difficulty analysis')
+    parser.add_argument('--difficulty', nargs='+', choices=list(difficulties), default=list(difficulties))
+    parser.add_argument('--games', type=int, default=1000, help='games per difficulty and setting combination')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first game of every combination')
+    parser.add_argument('--frames', type=int, default=36000, help='games that last this long are cut off')
+    parser.add_argument('--sweep', nargs='*', default=[], metavar='SETTING=VALUES',
+                        help='comma separated values of a difficulty setting, every combination is played')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='number of worker processes')
+    parser.add_argument('--output', metavar='PATH', help='file to write every summary to as json')
+    args = parser.parse_args()
+    if args.games < 1:
+        parser.error('--games must be at least 1')
+    try:
+        combinations = parse_sweep(args.sweep)
+    except ValueError as error:
+        parser.error('--sweep: {}'.format(error))
+
+    summaries = []
+    with concurrent.futures.ProcessPoolExecutor(args.workers) as executor:
+        for difficulty in args.difficulty:
+            for settings in combinations:
+                summary = analyze(difficulty, settings, args.games, args.seed, args.frames, executor)
+                summaries.append(summary)
+                print(report(summary), flush=True)
+
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(summaries, file, indent=2)
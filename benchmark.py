@@ -0,0 +1,230 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# benchmarks never open a window or an audio device
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+import frames
+import main
+from platforms import next_platform_position
+from simulation import ReferencePlayer, Simulation
+
+#  Times the hot paths of the game with fixed seeds and the scripted player, results are printed as json
+#  Run before and after a change: $ python3 benchmark.py --output before.json
+
+# menu scenes timed from opening to their first frame
+screens = ['title', 'selection', 'options', 'help', 'leaderboard', 'pause', 'death']
+
+
+class FirstFrame(Exception):
+    pass
+
+
+def stats(samples: list) -> dict:
+
+    """
+    samples: list of times in seconds
+    Returns the mean, median, 99th percentile, minimum and maximum in milliseconds and the number of samples
+    """
+
+    ordered = sorted(samples)
+
+    def percentile(p):
+        return ordered[min(len(ordered)-1, int(p*len(ordered)))]*1000
+
+    return {'mean': sum(ordered)/len(ordered)*1000, 'p50': percentile(0.5), 'p99': percentile(0.99),
+            'min': ordered[0]*1000, 'max': ordered[-1]*1000, 'samples': len(ordered)}
+
+
+def bench_game(state: main.State, difficulty: str, seed: int, number_of_frames: int, dirty: bool) -> tuple:
+
+    """
+    Plays seeded games with the scripted player until number_of_frames frames have been played
+    dirty: draw with the dirty rect renderer
+    Returns the times of every game rule step and of drawing every frame, drawing includes the display flip
+    """
+
+    state.dirty_rendering = dirty
+    update = []
+    render = []
+    while len(update) < number_of_frames:
+        sim = Simulation(difficulty, state.character, seed)
+        bot = ReferencePlayer()
+        view = main.GameView(state, sim)
+        while not sim.game_over and len(update) < number_of_frames:
+            inputs = bot.inputs(sim)
+            previous = sim.positions()
+            previous_camera = sim.camera.y
+
+            start = time.perf_counter()
+            sim.step(inputs)
+            update.append(time.perf_counter()-start)
+
+            sim.player.animate()
+            start = time.perf_counter()
+            view.draw(previous, previous_camera, 0.5)
+            render.append(time.perf_counter()-start)
+        seed += 1
+    return update, render
+
+
+def bench_next_platform(repeat: int, batch=1000) -> list:
+
+    """
+    Returns the time of creating one platform position, averaged over batches of calls
+    """
+
+    rng = random.Random(0)
+    w = frames.platform_img.get_width()
+    samples = []
+    for i in range(repeat):
+        pos = (main.screen_w//2, 0)
+        start = time.perf_counter()
+        for j in range(batch):
+            pos = next_platform_position(pos, w, rng)
+        samples.append((time.perf_counter()-start)/batch)
+    return samples
+
+
+def bench_render_text(state: main.State, repeat: int, cached: bool) -> list:
+
+    """
+    cached: render through the text cache, otherwise every call renders the text again
+    Returns the time of rendering one line of text
+    """
+
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        main.render_text(state.small_font, 'Score: {}'.format(i % 10), x=main.screen_w//2, y=100, cached=cached)
+        samples.append(time.perf_counter()-start)
+    return samples
+
+
+def bench_import(repeat: int) -> dict:
+
+    """
+    Returns the times of importing pygame and then the frames module in a new interpreter
+    """
+
+    code = ('import time; start = time.perf_counter(); import pygame; middle = time.perf_counter(); import frames; '
+            'print(middle-start, time.perf_counter()-middle)')
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT='1')
+    directory = os.path.dirname(os.path.abspath(__file__))
+    samples = {'import_pygame': [], 'import_frames': []}
+    for i in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], cwd=directory, env=env, capture_output=True, text=True,
+                                check=True).stdout.split()
+        samples['import_pygame'].append(float(output[0]))
+        samples['import_frames'].append(float(output[1]))
+    return samples
+
+
+def bench_character_frames(repeat: int) -> list:
+
+    """
+    Returns the times of loading the frames of a character that is not loaded yet
+    """
+
+    samples = []
+    for i in range(repeat):
+        frames.images.clear()
+        frames.animations.clear()
+        frames.atlas.clear()
+        frames.pack.clear()
+        start = time.perf_counter()
+        frames.character_frames(frames.characters[i % len(frames.characters)])
+        samples.append(time.perf_counter()-start)
+    return samples
+
+
+def bench_screen(state: main.State, screen: str, repeat: int) -> list:
+
+    """
+    screen: name of the menu scene
+    Returns the times from switching to the scene until its first frame is shown, with an empty text cache
+    """
+
+    def flip():
+        raise FirstFrame()
+
+    samples = []
+    display_flip = pygame.display.flip
+    pygame.display.flip = flip
+    try:
+        for i in range(repeat):
+            main.text_surface.cache_clear()
+            start = time.perf_counter()
+            try:
+                state.scenes.switch(screen)
+                state.scenes.top().frame()
+            except FirstFrame:
+                samples.append(time.perf_counter()-start)
+    finally:
+        pygame.display.flip = display_flip
+    return samples
+
+
+def run(difficulty: str, seed: int, number_of_frames: int, repeat: int) -> dict:
+
+    """
+    Runs every benchmark
+    Returns the results by benchmark name
+    """
+
+    pygame.init()
+    leaderboard_dir = tempfile.mkdtemp()  # the player's leaderboard is never touched
+    state = main.State(leaderboard_dir=leaderboard_dir)
+    state.finish_startup()
+    state.difficulty = difficulty
+    state.character = 'knight_m'
+
+    results = {'config': {'difficulty': difficulty, 'seed': seed, 'frames': number_of_frames, 'repeat': repeat,
+                          'python': sys.version.split()[0], 'pygame': pygame.version.ver, 'unit': 'ms'}}
+
+    update, render = bench_game(state, difficulty, seed, number_of_frames, False)
+    results['update'] = stats(update)
+    results['render'] = stats(render)
+    update, render = bench_game(state, difficulty, seed, number_of_frames, True)
+    results['render_dirty'] = stats(render)
+
+    micro = {'next_platform_position': stats(bench_next_platform(repeat)),
+             'render_text_cached': stats(bench_render_text(state, repeat, True)),
+             'render_text_uncached': stats(bench_render_text(state, repeat, False)),
+             'character_frames': stats(bench_character_frames(min(repeat, 50)))}
+    for name, samples in bench_import(min(repeat, 10)).items():
+        micro[name] = stats(samples)
+    for screen in screens:
+        micro[screen+'_first_frame'] = stats(bench_screen(state, screen, min(repeat, 50)))
+    results['micro'] = micro
+
+    pygame.quit()
+    state.writer.close()
+    shutil.rmtree(leaderboard_dir, ignore_errors=True)
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Dungeon Jump benchmarks')
+    parser.add_argument('--difficulty', choices=['easy', 'medium', 'hard'], default='hard')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first game, later games use the next seeds')
+    parser.add_argument('--frames', type=int, default=3000, help='number of game frames to time')
+    parser.add_argument('--repeat', type=int, default=200, help='number of samples of each microbenchmark')
+    parser.add_argument('--output', metavar='PATH', help='file to write the results to instead of printing them')
+    args = parser.parse_args()
+
+    output = json.dumps(run(args.difficulty, args.seed, args.frames, args.repeat), indent=2)
+    if args.output is None:
+        print(output)
+    else:
+        with open(args.output, 'w') as file:
+            file.write(output+'\n')
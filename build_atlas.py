@@ -0,0 +1,60 @@
+import json
+import pygame
+import frames
+
+#  Packs every frame the game loads into frames/atlas.png with an index of the rect of each frame in frames/atlas.json
+#  Run again after changing any image in the frames directory: $ python3 build_atlas.py
+
+atlas_w = 1024
+padding = 1  # empty pixels between frames
+
+
+def pack(sizes: dict, width: int) -> tuple:
+
+    """
+    sizes: dictionary of image sizes by name
+    width: width of the atlas
+    Places the images on shelves, tallest images first
+    Returns a dictionary of (x, y, w, h) rects by name and the height of the atlas
+    """
+
+    rects = {}
+    x = y = shelf_h = 0
+    for name in sorted(sizes, key=lambda n: (-sizes[n][1], -sizes[n][0], n)):
+        w, h = sizes[name]
+        if w > width:
+            raise ValueError('image {} is wider than the atlas'.format(name))
+
+        # start a new shelf once the current one is full
+        if x+w > width:
+            x = 0
+            y += shelf_h+padding
+            shelf_h = 0
+        rects[name] = (x, y, w, h)
+        x += w+padding
+        shelf_h = max(shelf_h, h)
+    return rects, y+shelf_h
+
+
+def build_atlas() -> None:
+
+    """
+    Writes the atlas image and index
+    """
+
+    sources = {name: pygame.image.load('frames/{}.png'.format(name)) for name in frames.image_names()}
+    rects, atlas_h = pack({name: image.get_size() for name, image in sources.items()}, atlas_w)
+
+    atlas = pygame.Surface((atlas_w, atlas_h), pygame.SRCALPHA, 32)
+    atlas.fill((0, 0, 0, 0))
+    for name, image in sources.items():
+        atlas.blit(image, rects[name][:2])
+
+    pygame.image.save(atlas, frames.atlas_path)
+    with open(frames.atlas_index_path, 'w') as file:
+        json.dump(rects, file, indent=1, sort_keys=True)
+    print('packed {} frames into a {}x{} atlas'.format(len(rects), atlas_w, atlas_h))
+
+
+if __name__ == '__main__':
+    build_atlas()
@@ -0,0 +1,51 @@
+import json
+import pygame
+import frames
+from persistence import write_atomic
+
+#  Writes every frame and its mirrored version as raw pixels in the display pixel format to frames/sprites.pack
+#  Games memory map the pack instead of decoding and converting each image, so running games share one copy
+#  Run on the machine the game runs on after changing any image in the frames directory: $ python3 build_pack.py
+
+alignment = 64  # images start at multiples of this offset
+
+
+def build_pack() -> None:
+
+    """
+    Writes the sprite pack
+    """
+
+    # a hidden window gives the pixel format the game's window will use
+    pygame.display.init()
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+
+    converted = {}
+    for name in frames.image_names():
+        image = pygame.image.load('frames/{}.png'.format(name)).convert_alpha()
+        converted[name] = image
+        converted[name+':mirrored'] = frames.mirrored(image)
+
+    masks = list(converted[frames.static_images['platform_img']].get_masks())
+    pixel_format = frames.pixel_format(masks)
+    index = {'format': pixel_format, 'masks': masks, 'images': {}}
+
+    # the header is followed by the pixels of each image, the index goes last once every offset is known
+    data = bytearray(alignment)
+    for name, image in converted.items():
+        w, h = image.get_size()
+        index['images'][name] = [len(data), w, h]
+        data += pygame.image.tobytes(image, pixel_format)
+        data += bytes(-len(data) % alignment)
+    encoded = json.dumps(index).encode()
+    data[:frames.pack_header.size] = frames.pack_header.pack(frames.pack_magic, frames.pack_version, len(data),
+                                                             len(encoded))
+    data += encoded
+
+    # replaced in one step, games that have the old pack mapped keep reading the old file
+    write_atomic(frames.pack_path, bytes(data))
+    print('packed {} images in {} format, {} kB'.format(len(converted), pixel_format, len(data)//1024))
+
+
+if __name__ == '__main__':
+    build_pack()
@@ -0,0 +1,98 @@
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # the vectorized collision stage is optional, games fall back to one check per sprite pair
+    np = None
+
+#  Vectorized collision checks between the player and the sprites of every platform
+#  Check it gives the same games as the per sprite checks: $ python3 collisions.py
+
+
+def available() -> bool:
+
+    """
+    Returns true if numpy is installed and the vectorized collision stage can be used
+    """
+
+    return np is not None
+
+
+def rect_array(rects: list):
+
+    """
+    rects: list of pygame.Rect objects, None for rows without a sprite
+    Returns an (n, 4) array of left, top, right, bottom rows, rows without a sprite are empty and overlap nothing
+    """
+
+    return np.array([(0, 0, 0, 0) if rect is None else (rect.left, rect.top, rect.right, rect.bottom)
+                     for rect in rects], dtype=np.int64).reshape(len(rects), 4)
+
+
+def overlapping(a, b):
+
+    """
+    a, b: rect arrays with the same number of rows, or a single row that is compared with every row of the other
+    Returns a boolean array that is true for every row where the rects overlap, the same test as Rect.colliderect
+    """
+
+    return ((a[:, 0] < b[:, 2]) & (b[:, 0] < a[:, 2]) & (a[:, 1] < b[:, 3]) & (b[:, 1] < a[:, 3]) &
+            (a[:, 0] < a[:, 2]) & (a[:, 1] < a[:, 3]) & (b[:, 0] < b[:, 2]) & (b[:, 1] < b[:, 3]))
+
+
+def occupied(a):
+
+    """
+    a: rect array
+    Returns a boolean array that is true for every row holding a sprite
+    """
+
+    return a[:, 0] < a[:, 2]
+
+
+def trace(difficulty: str, seed: int, vectorized: bool, frames: int) -> list:
+
+    """
+    Plays one game with the scripted player
+    Returns the score, lives, powerups and sound events after every frame
+    """
+
+    from simulation import ReferencePlayer, Simulation
+
+    sim = Simulation(difficulty, 'knight_m', seed, vectorized=vectorized)
+    bot = ReferencePlayer()
+    states = []
+    while not sim.game_over and sim.frame < frames:
+        events = sim.step(bot.inputs(sim))
+        states.append((sim.score, sim.player.rect.topleft, dict(sim.player.powerups), events))
+    return states
+
+
+def check(seeds=range(20), frames=3000) -> bool:
+
+    """
+    Plays the same seeded games with per sprite and vectorized collision checks
+    Returns true if every frame of every game is the same
+    """
+
+    same = True
+    for difficulty in ('easy', 'medium', 'hard'):
+        for seed in seeds:
+            expected = trace(difficulty, seed, False, frames)
+            result = trace(difficulty, seed, True, frames)
+            if result != expected:
+                frame = next((i for i, (a, b) in enumerate(zip(expected, result)) if a != b),
+                             min(len(expected), len(result)))
+                print('{} seed {}: games differ from frame {}'.format(difficulty, seed, frame))
+                same = False
+    return same
+
+
+if __name__ == '__main__':
+    if not available():
+        raise SystemExit('numpy is not installed')
+    pygame.init()
+    if check():
+        print('vectorized collisions match the per sprite checks')
+    else:
+        raise SystemExit(1)
@@ -0,0 +1,265 @@
+import math
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from simulation import Inputs, Simulation
+
+#  Gym style environments for bots and learning agents, the game rules without a window, audio or frame rate limit
+#  An action is (left, right, jump, fire, angle): the first four are on when above 0.5, angle is the fireball direction
+#  in radians with 0 pointing right and pi/2 pointing down
+
+screen_w = 512
+screen_h = 704
+
+action_size = 5
+nearest_platforms = 5
+nearest_enemies = 3
+nearest_projectiles = 3
+
+# player: x, height on screen, on platform, jumping, falling, lives, double jumps, fireballs, own fireball dx, dy, shown
+# then dx, dy, shown of the nearest platforms, dx, dy, facing right, shown of the nearest enemies
+# and dx, dy, vertical speed, shown of the nearest enemy projectiles, all positions relative to the player
+observation_size = 11+3*nearest_platforms+4*nearest_enemies+4*nearest_projectiles
+
+fireball_range = 240  # distance of the fireball target from the player, fireballs leave at their lowest speed
+
+
+class DungeonJumpEnv:
+
+    def __init__(self, difficulty='hard', character='knight_m', max_frames=10000, settings=None):
+        self.difficulty = difficulty
+        self.character = character
+        self.max_frames = max_frames  # games that last this long are cut off
+        self.settings = settings  # difficulty setting overrides, see simulation.difficulties
+        self.sim = None
+
+    def reset(self, seed=None) -> np.ndarray:
+
+        """
+        seed: random seed of the new game, a random game if None
+        Starts a new game
+        Returns the first observation
+        """
+
+        self.sim = Simulation(self.difficulty, self.character, seed, settings=self.settings)
+        return self.observe()
+
+    def step(self, action) -> tuple:
+
+        """
+        action: (left, right, jump, fire, angle) sequence
+        Advances the game by one frame
+        Returns the observation, the reward, whether the game ended and an info dictionary
+        The reward is the score gained this frame, the info holds the score, the frame and whether the game was cut off
+        """
+
+        reward, done, info = self.advance(action)
+        return self.observe(), reward, done, info
+
+    def advance(self, action) -> tuple:
+
+        """
+        action: (left, right, jump, fire, angle) sequence
+        Same as step without making the observation
+        Returns the reward, whether the game ended and the info dictionary
+        """
+
+        sim = self.sim
+        fire = None
+        if action[3] > 0.5:
+            x, y = sim.player.rect.center
+            fire = (x+round(fireball_range*math.cos(action[4])), y+round(fireball_range*math.sin(action[4])))
+
+        score = sim.score
+        sim.step(Inputs(left=action[0] > 0.5, right=action[1] > 0.5, jump=action[2] > 0.5, fire=fire))
+
+        truncated = not sim.game_over and sim.frame >= self.max_frames
+        info = {'score': sim.score, 'frame': sim.frame, 'truncated': truncated}
+        return sim.score-score, sim.game_over or truncated, info
+
+    def observe(self, out=None) -> np.ndarray:
+
+        """
+        out: float32 array of observation_size to write to, a new one if None
+        Returns the observation of the current frame
+        """
+
+        sim = self.sim
+        player = sim.player
+        platforms = sim.platforms
+        obs = np.zeros(observation_size, dtype=np.float32) if out is None else out
+        obs[:] = 0
+
+        x, y = player.rect.center
+        obs[0] = x/screen_w
+        obs[1] = (y-sim.camera.y)/screen_h
+        obs[2] = player.on_platform
+        obs[3] = player.is_jumping
+        obs[4] = player.is_falling
+        obs[5] = player.powerups['lives']
+        obs[6] = player.powerups['double_jump']
+        obs[7] = player.powerups['fireball']
+        if player.projectile is not None:
+            obs[8] = (player.projectile.rect.centerx-x)/screen_w
+            obs[9] = (player.projectile.rect.centery-y)/screen_h
+            obs[10] = 1
+        i = 11
+
+        def nearest(positions, n):
+            return sorted(positions, key=lambda p: (p[0]-x)**2+(p[1]-y)**2)[:n]
+
+        slots = [platforms.slot(j) for j in range(len(platforms))]
+        for px, py in nearest([platforms.center(slot) for slot in slots], nearest_platforms):
+            obs[i:i+3] = (px-x)/screen_w, (py-y)/screen_h, 1
+            i += 3
+        i = 11+3*nearest_platforms
+
+        enemies = [platforms.enemy[slot] for slot in slots if platforms.enemy[slot] is not None]
+        for ex, ey, right in nearest([(e.rect.centerx, e.rect.centery, e.face_right) for e in enemies], nearest_enemies):
+            obs[i:i+4] = (ex-x)/screen_w, (ey-y)/screen_h, right, 1
+            i += 4
+        i = 11+3*nearest_platforms+4*nearest_enemies
+
+        projectiles = [platforms.projectile[slot] for slot in slots if platforms.projectile[slot] is not None]
+        for px, py, v_y in nearest([(p.rect.centerx, p.rect.centery, p.v_y) for p in projectiles],
+                                   nearest_projectiles):
+            obs[i:i+4] = (px-x)/screen_w, (py-y)/screen_h, v_y, 1
+            i += 4
+        return obs
+
+
+class VectorEnv:
+
+    def __init__(self, n: int, workers=None, difficulty='hard', character='knight_m', max_frames=10000, settings=None):
+        self.n = n
+        workers = min(n, workers or multiprocessing.cpu_count())
+
+        # every step the actions are written to shared memory, the workers step their games and write back the
+        # observations, rewards and ends, only a short command goes through each pipe
+        self.memory = []
+        self.actions = self.shared((n, action_size), np.float32)
+        self.observations = self.shared((n, observation_size), np.float32)
+        self.rewards = self.shared((n,), np.float64)
+        self.dones = self.shared((n,), np.bool_)
+        names = [memory.name for memory in self.memory]
+
+        self.pipes = []
+        self.processes = []
+        for worker in range(workers):
+            envs = range(worker*n//workers, (worker+1)*n//workers)
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=run_worker, daemon=True,
+                                              args=(child, names, n, envs.start, envs.stop,
+                                                    (difficulty, character, max_frames, settings)))
+            process.start()
+            child.close()
+            self.pipes.append(parent)
+            self.processes.append(process)
+
+    def shared(self, shape: tuple, dtype) -> np.ndarray:
+
+        """
+        Returns an array of the given shape in new shared memory
+        """
+
+        memory = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape))*np.dtype(dtype).itemsize))
+        self.memory.append(memory)
+        return np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+
+    def command(self, *message) -> list:
+
+        """
+        Sends the message to every worker and returns their answers
+        """
+
+        for pipe in self.pipes:
+            pipe.send(message)
+        return [pipe.recv() for pipe in self.pipes]
+
+    def reset(self, seed=None) -> np.ndarray:
+
+        """
+        seed: game i starts with seed+i, random games if None
+        Returns the first observations, one row per game
+        """
+
+        self.command('reset', seed)
+        return self.observations.copy()
+
+    def step(self, actions) -> tuple:
+
+        """
+        actions: (n, 5) array with one action per game
+        Steps every game once, games that end are started again and return the first observation of the new game
+        Returns the observations, rewards and ends of every game and a list of info dictionaries
+        """
+
+        self.actions[:] = actions
+        infos = [info for answer in self.command('step') for info in answer]
+        return self.observations.copy(), self.rewards.copy(), self.dones.copy(), infos
+
+    def close(self) -> None:
+
+        """
+        Stops the workers and frees the shared memory
+        """
+
+        for pipe in self.pipes:
+            pipe.send(('close',))
+        for process in self.processes:
+            process.join()
+        for memory in self.memory:
+            memory.close()
+            memory.unlink()
+        self.pipes = []
+        self.processes = []
+        self.memory = []
+
+
+def run_worker(pipe, names: list, n: int, start: int, stop: int, options: tuple) -> None:
+
+    """
+    Worker process of a VectorEnv, steps the games start to stop
+    """
+
+    memory = [shared_memory.SharedMemory(name=name) for name in names]
+    actions = np.ndarray((n, action_size), dtype=np.float32, buffer=memory[0].buf)
+    observations = np.ndarray((n, observation_size), dtype=np.float32, buffer=memory[1].buf)
+    rewards = np.ndarray((n,), dtype=np.float64, buffer=memory[2].buf)
+    dones = np.ndarray((n,), dtype=np.bool_, buffer=memory[3].buf)
+
+    envs = [DungeonJumpEnv(*options) for i in range(start, stop)]
+    seeds = [None]*len(envs)  # seed of the next game of each env
+    try:
+        while True:
+            message = pipe.recv()
+            if message[0] == 'reset':
+                seed = message[1]
+                for i, env in enumerate(envs):
+                    seeds[i] = None if seed is None else seed+start+i
+                    env.reset(seeds[i])
+                    env.observe(observations[start+i])
+                pipe.send(None)
+
+            elif message[0] == 'step':
+                infos = []
+                for i, env in enumerate(envs):
+                    reward, done, info = env.advance(actions[start+i])
+                    rewards[start+i] = reward
+                    dones[start+i] = done
+
+                    # seeded games continue with seeds no other game of the vector env uses
+                    if done:
+                        if seeds[i] is not None:
+                            seeds[i] += n
+                        env.reset(seeds[i])
+                    env.observe(observations[start+i])
+                    infos.append(info)
+                pipe.send(infos)
+
+            else:
+                break
+    finally:
+        del actions, observations, rewards, dones
+        for block in memory:
+            block.close()
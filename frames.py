@@ -1,154 +1,268 @@
+import json
+import mmap
+import struct
+import sys
 import pygame
 
-#  Holds all the animation frames
-
-screen_w = 512
-screen_h = 704
-pygame.display.init()
-screen = pygame.display.set_mode((screen_w, screen_h))
-
-background_img = pygame.image.load('frames/background.png').convert_alpha()
-platform_img = pygame.image.load('frames/platform.png').convert_alpha()
-heart_img = pygame.image.load('frames/ui_heart_full.png').convert_alpha()
-blue_flask_img = pygame.image.load('frames/flask_big_blue.png').convert_alpha()
-red_flask_img = pygame.image.load('frames/flask_big_red.png').convert_alpha()
-fire_img = pygame.image.load('frames/fire.png').convert_alpha()
-
-demon_run_right_img = [pygame.image.load('frames/big_demon_run_anim_r0.png').convert_alpha(),
-                       pygame.image.load('frames/big_demon_run_anim_r1.png').convert_alpha(),
-                       pygame.image.load('frames/big_demon_run_anim_r2.png').convert_alpha(),
-                       pygame.image.load('frames/big_demon_run_anim_r3.png').convert_alpha()]
-demon_run_left_img = [pygame.image.load('frames/big_demon_run_anim_l0.png').convert_alpha(),
-                      pygame.image.load('frames/big_demon_run_anim_l1.png').convert_alpha(),
-                      pygame.image.load('frames/big_demon_run_anim_l2.png').convert_alpha(),
-                      pygame.image.load('frames/big_demon_run_anim_l3.png').convert_alpha()]
-
-knight_m_run_right_img = [pygame.image.load('frames/knight_m_run_anim_r0.png').convert_alpha(),
-                          pygame.image.load('frames/knight_m_run_anim_r1.png').convert_alpha(),
-                          pygame.image.load('frames/knight_m_run_anim_r2.png').convert_alpha(),
-                          pygame.image.load('frames/knight_m_run_anim_r3.png').convert_alpha()]
-knight_m_run_left_img = [pygame.image.load('frames/knight_m_run_anim_l0.png').convert_alpha(),
-                         pygame.image.load('frames/knight_m_run_anim_l1.png').convert_alpha(),
-                         pygame.image.load('frames/knight_m_run_anim_l2.png').convert_alpha(),
-                         pygame.image.load('frames/knight_m_run_anim_l3.png').convert_alpha()]
-knight_m_idle_img = [pygame.image.load('frames/knight_m_idle_anim_r0.png').convert_alpha(),
-                     pygame.image.load('frames/knight_m_idle_anim_l0.png').convert_alpha()]
-knight_m_jump_img = [pygame.image.load('frames/knight_m_hit_anim_r0.png').convert_alpha(),
-                     pygame.image.load('frames/knight_m_hit_anim_l0.png').convert_alpha()]
-
-elf_m_run_right_img = [pygame.image.load('frames/elf_m_run_anim_r0.png').convert_alpha(),
-                       pygame.image.load('frames/elf_m_run_anim_r1.png').convert_alpha(),
-                       pygame.image.load('frames/elf_m_run_anim_r2.png').convert_alpha(),
-                       pygame.image.load('frames/elf_m_run_anim_r3.png').convert_alpha()]
-elf_m_run_left_img = [pygame.image.load('frames/elf_m_run_anim_l0.png').convert_alpha(),
-                      pygame.image.load('frames/elf_m_run_anim_l1.png').convert_alpha(),
-                      pygame.image.load('frames/elf_m_run_anim_l2.png').convert_alpha(),
-                      pygame.image.load('frames/elf_m_run_anim_l3.png').convert_alpha()]
-elf_m_idle_img = [pygame.image.load('frames/elf_m_idle_anim_r0.png').convert_alpha(),
-                  pygame.image.load('frames/elf_m_idle_anim_l0.png').convert_alpha()]
-elf_m_jump_img = [pygame.image.load('frames/elf_m_hit_anim_r0.png').convert_alpha(),
-                  pygame.image.load('frames/elf_m_hit_anim_l0.png').convert_alpha()]
-
-wizard_m_run_right_img = [pygame.image.load('frames/wizard_m_run_anim_r0.png').convert_alpha(),
-                          pygame.image.load('frames/wizard_m_run_anim_r1.png').convert_alpha(),
-                          pygame.image.load('frames/wizard_m_run_anim_r2.png').convert_alpha(),
-                          pygame.image.load('frames/wizard_m_run_anim_r3.png').convert_alpha()]
-wizard_m_run_left_img = [pygame.image.load('frames/wizard_m_run_anim_l0.png').convert_alpha(),
-                         pygame.image.load('frames/wizard_m_run_anim_l1.png').convert_alpha(),
-                         pygame.image.load('frames/wizard_m_run_anim_l2.png').convert_alpha(),
-                         pygame.image.load('frames/wizard_m_run_anim_l3.png').convert_alpha()]
-wizard_m_idle_img = [pygame.image.load('frames/wizard_m_idle_anim_r0.png').convert_alpha(),
-                     pygame.image.load('frames/wizard_m_idle_anim_l0.png').convert_alpha()]
-wizard_m_jump_img = [pygame.image.load('frames/wizard_m_hit_anim_r0.png').convert_alpha(),
-                     pygame.image.load('frames/wizard_m_hit_anim_l0.png').convert_alpha()]
-
-dragon_m_run_right_img = [pygame.image.load('frames/dragon_m_run_anim_r0.png').convert_alpha(),
-                          pygame.image.load('frames/dragon_m_run_anim_r1.png').convert_alpha(),
-                          pygame.image.load('frames/dragon_m_run_anim_r2.png').convert_alpha(),
-                          pygame.image.load('frames/dragon_m_run_anim_r3.png').convert_alpha()]
-dragon_m_run_left_img = [pygame.image.load('frames/dragon_m_run_anim_l0.png').convert_alpha(),
-                         pygame.image.load('frames/dragon_m_run_anim_l1.png').convert_alpha(),
-                         pygame.image.load('frames/dragon_m_run_anim_l2.png').convert_alpha(),
-                         pygame.image.load('frames/dragon_m_run_anim_l3.png').convert_alpha()]
-dragon_m_idle_img = [pygame.image.load('frames/dragon_m_idle_anim_r0.png').convert_alpha(),
-                     pygame.image.load('frames/dragon_m_idle_anim_l0.png').convert_alpha()]
-dragon_m_jump_img = [pygame.image.load('frames/dragon_m_hit_anim_r0.png').convert_alpha(),
-                     pygame.image.load('frames/dragon_m_hit_anim_l0.png').convert_alpha()]
-
-knight_f_run_right_img = [pygame.image.load('frames/knight_f_run_anim_r0.png').convert_alpha(),
-                          pygame.image.load('frames/knight_f_run_anim_r1.png').convert_alpha(),
-                          pygame.image.load('frames/knight_f_run_anim_r2.png').convert_alpha(),
-                          pygame.image.load('frames/knight_f_run_anim_r3.png').convert_alpha()]
-knight_f_run_left_img = [pygame.image.load('frames/knight_f_run_anim_l0.png').convert_alpha(),
-                         pygame.image.load('frames/knight_f_run_anim_l1.png').convert_alpha(),
-                         pygame.image.load('frames/knight_f_run_anim_l2.png').convert_alpha(),
-                         pygame.image.load('frames/knight_f_run_anim_l3.png').convert_alpha()]
-knight_f_idle_img = [pygame.image.load('frames/knight_f_idle_anim_r0.png').convert_alpha(),
-                     pygame.image.load('frames/knight_f_idle_anim_l0.png').convert_alpha()]
-knight_f_jump_img = [pygame.image.load('frames/knight_f_hit_anim_r0.png').convert_alpha(),
-                     pygame.image.load('frames/knight_f_hit_anim_l0.png').convert_alpha()]
-
-elf_f_run_right_img = [pygame.image.load('frames/elf_f_run_anim_r0.png').convert_alpha(),
-                       pygame.image.load('frames/elf_f_run_anim_r1.png').convert_alpha(),
-                       pygame.image.load('frames/elf_f_run_anim_r2.png').convert_alpha(),
-                       pygame.image.load('frames/elf_f_run_anim_r3.png').convert_alpha()]
-elf_f_run_left_img = [pygame.image.load('frames/elf_f_run_anim_l0.png').convert_alpha(),
-                      pygame.image.load('frames/elf_f_run_anim_l1.png').convert_alpha(),
-                      pygame.image.load('frames/elf_f_run_anim_l2.png').convert_alpha(),
-                      pygame.image.load('frames/elf_f_run_anim_l3.png').convert_alpha()]
-elf_f_idle_img = [pygame.image.load('frames/elf_f_idle_anim_r0.png').convert_alpha(),
-                  pygame.image.load('frames/elf_f_idle_anim_l0.png').convert_alpha()]
-elf_f_jump_img = [pygame.image.load('frames/elf_f_hit_anim_r0.png').convert_alpha(),
-                  pygame.image.load('frames/elf_f_hit_anim_l0.png').convert_alpha()]
-
-wizard_f_run_right_img = [pygame.image.load('frames/wizard_f_run_anim_r0.png').convert_alpha(),
-                          pygame.image.load('frames/wizard_f_run_anim_r1.png').convert_alpha(),
-                          pygame.image.load('frames/wizard_f_run_anim_r2.png').convert_alpha(),
-                          pygame.image.load('frames/wizard_f_run_anim_r3.png').convert_alpha()]
-wizard_f_run_left_img = [pygame.image.load('frames/wizard_f_run_anim_l0.png').convert_alpha(),
-                         pygame.image.load('frames/wizard_f_run_anim_l1.png').convert_alpha(),
-                         pygame.image.load('frames/wizard_f_run_anim_l2.png').convert_alpha(),
-                         pygame.image.load('frames/wizard_f_run_anim_l3.png').convert_alpha()]
-wizard_f_idle_img = [pygame.image.load('frames/wizard_f_idle_anim_r0.png').convert_alpha(),
-                     pygame.image.load('frames/wizard_f_idle_anim_l0.png').convert_alpha()]
-wizard_f_jump_img = [pygame.image.load('frames/wizard_f_hit_anim_r0.png').convert_alpha(),
-                     pygame.image.load('frames/wizard_f_hit_anim_l0.png').convert_alpha()]
-
-dragon_f_run_right_img = [pygame.image.load('frames/dragon_f_run_anim_r0.png').convert_alpha(),
-                          pygame.image.load('frames/dragon_f_run_anim_r1.png').convert_alpha(),
-                          pygame.image.load('frames/dragon_f_run_anim_r2.png').convert_alpha(),
-                          pygame.image.load('frames/dragon_f_run_anim_r3.png').convert_alpha()]
-dragon_f_run_left_img = [pygame.image.load('frames/dragon_f_run_anim_l0.png').convert_alpha(),
-                         pygame.image.load('frames/dragon_f_run_anim_l1.png').convert_alpha(),
-                         pygame.image.load('frames/dragon_f_run_anim_l2.png').convert_alpha(),
-                         pygame.image.load('frames/dragon_f_run_anim_l3.png').convert_alpha()]
-dragon_f_idle_img = [pygame.image.load('frames/dragon_f_idle_anim_r0.png').convert_alpha(),
-                     pygame.image.load('frames/dragon_f_idle_anim_l0.png').convert_alpha()]
-dragon_f_jump_img = [pygame.image.load('frames/dragon_f_hit_anim_r0.png').convert_alpha(),
-                     pygame.image.load('frames/dragon_f_hit_anim_l0.png').convert_alpha()]
-
-pumpkin_run_right_img = [pygame.image.load('frames/pumpkin_dude_run_anim_r0.png').convert_alpha(),
-                         pygame.image.load('frames/pumpkin_dude_run_anim_r1.png').convert_alpha(),
-                         pygame.image.load('frames/pumpkin_dude_run_anim_r2.png').convert_alpha(),
-                         pygame.image.load('frames/pumpkin_dude_run_anim_r3.png').convert_alpha()]
-pumpkin_run_left_img = [pygame.image.load('frames/pumpkin_dude_run_anim_l0.png').convert_alpha(),
-                        pygame.image.load('frames/pumpkin_dude_run_anim_l1.png').convert_alpha(),
-                        pygame.image.load('frames/pumpkin_dude_run_anim_l2.png').convert_alpha(),
-                        pygame.image.load('frames/pumpkin_dude_run_anim_l3.png').convert_alpha()]
-pumpkin_idle_img = [pygame.image.load('frames/pumpkin_dude_idle_anim_r0.png').convert_alpha(),
-                    pygame.image.load('frames/pumpkin_dude_idle_anim_l0.png').convert_alpha()]
-pumpkin_jump_img = [pygame.image.load('frames/pumpkin_dude_hit_anim_r0.png').convert_alpha(),
-                    pygame.image.load('frames/pumpkin_dude_hit_anim_l0.png').convert_alpha()]
-
-doc_run_right_img = [pygame.image.load('frames/doc_run_anim_r0.png').convert_alpha(),
-                     pygame.image.load('frames/doc_run_anim_r1.png').convert_alpha(),
-                     pygame.image.load('frames/doc_run_anim_r2.png').convert_alpha(),
-                     pygame.image.load('frames/doc_run_anim_r3.png').convert_alpha()]
-doc_run_left_img = [pygame.image.load('frames/doc_run_anim_l0.png').convert_alpha(),
-                    pygame.image.load('frames/doc_run_anim_l1.png').convert_alpha(),
-                    pygame.image.load('frames/doc_run_anim_l2.png').convert_alpha(),
-                    pygame.image.load('frames/doc_run_anim_l3.png').convert_alpha()]
-doc_idle_img = [pygame.image.load('frames/doc_idle_anim_r0.png').convert_alpha(),
-                pygame.image.load('frames/doc_idle_anim_l0.png').convert_alpha()]
-doc_jump_img = [pygame.image.load('frames/doc_hit_anim_r0.png').convert_alpha(),
-                pygame.image.load('frames/doc_hit_anim_l0.png').convert_alpha()]
+#  Holds all the animation frames, images are only loaded the first time they are used
+
+characters = ['knight_m', 'elf_m', 'wizard_m', 'dragon_m', 'knight_f', 'elf_f', 'wizard_f', 'dragon_f', 'pumpkin', 'doc']
+
+# file name prefix of each character's frames
+file_prefixes = {'pumpkin': 'pumpkin_dude'}
+
+# images that are not part of a character animation
+static_images = {
+    'background_img': 'background',
+    'platform_img': 'platform',
+    'heart_img': 'ui_heart_full',
+    'blue_flask_img': 'flask_big_blue',
+    'red_flask_img': 'flask_big_red',
+    'fire_img': 'fire'}
+
+# all frames packed into one image by build_atlas.py, with the rect of each frame
+atlas_path = 'frames/atlas.png'
+atlas_index_path = 'frames/atlas.json'
+
+# every frame and its mirrored version as raw pixels in the display pixel format, written by build_pack.py
+# header: magic, version, offset and length of the json index, then the pixels of each image and the index
+pack_path = 'frames/sprites.pack'
+pack_magic = b'DJSP'
+pack_version = 1
+pack_header = struct.Struct('<4sBQI')
+
+images = {}  # decoded images by file name
+animations = {}  # animation frame lists by attribute name, e.g. 'knight_m_run_right_img'
+atlas = {}  # 'surface' and 'index' of the atlas once it has been read
+pack = {}  # 'index', 'view' of the memory mapped pack and whether it 'matches' the display once it has been opened
+
+
+def image_names() -> list:
+
+    """
+    Returns the file names of every image the game loads, left facing frames are flipped from these
+    """
+
+    names = list(static_images.values())
+    names += ['big_demon_run_anim_r{}'.format(i) for i in range(4)]
+    for character in characters:
+        prefix = file_prefixes.get(character, character)
+        names += ['{}_run_anim_r{}'.format(prefix, i) for i in range(4)]
+        names += ['{}_idle_anim_r0'.format(prefix), '{}_hit_anim_r0'.format(prefix)]
+    return names
+
+
+def display_ready() -> bool:
+
+    """
+    Returns true if images can be converted to the display pixel format
+    """
+
+    return pygame.display.get_init() and pygame.display.get_surface() is not None
+
+
+def atlas_index() -> dict:
+
+    """
+    Returns the atlas rect of each image by file name, empty if no atlas has been built
+    """
+
+    if 'index' not in atlas:
+        try:
+            with open(atlas_index_path) as file:
+                atlas['index'] = json.load(file)
+        except FileNotFoundError:
+            atlas['index'] = {}
+    return atlas['index']
+
+
+def pixel_format(masks: tuple) -> str:
+
+    """
+    masks: red, green, blue and alpha masks of a 32 bit surface
+    Returns the order of the color bytes in memory as a pygame.image.frombuffer format such as 'BGRA'
+    """
+
+    order = {}
+    for color, mask in zip('RGBA', masks):
+        byte = mask.bit_length()//8-1
+        order[byte if sys.byteorder == 'little' else 3-byte] = color
+    return ''.join(order[i] for i in range(4))
+
+
+def sprite_pack() -> dict:
+
+    """
+    Returns the pack index with the pixel 'format', 'masks' and the (offset, w, h) of each of the 'images'
+    The pack is memory mapped, games on the same machine share its pages instead of each decoding every image
+    Empty if no pack has been built
+    """
+
+    if 'index' not in pack:
+        pack['index'] = {}
+        try:
+            with open(pack_path, 'rb') as file:
+                # copy on write, so the pages are shared and drawing on an image could never change the file
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError):
+            return pack['index']
+
+        # a pack that is unreadable, truncated or from another version is ignored, the images load from the atlas
+        try:
+            magic, version, offset, length = pack_header.unpack_from(data)
+            if magic != pack_magic or version != pack_version:
+                raise ValueError('unsupported sprite pack')
+            index = json.loads(bytes(data[offset:offset+length]))
+        except (struct.error, ValueError):
+            data.close()
+            return pack['index']
+        pack['view'] = memoryview(data)
+        pack['index'] = index
+    return pack['index']
+
+
+def packed(name: str):
+
+    """
+    name: file name of the image, with ':mirrored' for its left facing version
+    Returns the image from the sprite pack without copying its pixels, None if it is not in the pack
+    """
+
+    index = sprite_pack()
+    if name not in index.get('images', {}):
+        return None
+    offset, w, h = index['images'][name]
+    image = pygame.image.frombuffer(pack['view'][offset:offset+4*w*h], (w, h), index['format'])
+
+    # a pack built for another pixel format works but every blit would convert it, so it is converted once instead
+    if display_ready():
+        if 'matches' not in pack:
+            pack['matches'] = list(pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks()) == index['masks']
+        if not pack['matches']:
+            image = image.convert_alpha()
+    return image
+
+
+def load(name: str) -> pygame.Surface:
+
+    """
+    name: file name of the image in the frames directory without the extension
+    Returns the image, decoded the first time it is requested
+    Images in the sprite pack are used from it directly, images in the atlas are subsurfaces of the atlas, which is decoded once for all of them
+    """
+
+    if name not in images:
+        index = atlas_index()
+        image = packed(name)
+        if image is None and name in index and 'surface' not in atlas:
+
+            # an index without its image leaves the atlas unused, the images are loaded from their own files
+            try:
+                atlas['surface'] = pygame.image.load(atlas_path)
+            except (FileNotFoundError, pygame.error):
+                atlas['surface'] = None
+            if atlas['surface'] is not None and display_ready():
+                atlas['surface'] = atlas['surface'].convert_alpha()
+        if image is None and name in index and atlas['surface'] is not None:
+            image = atlas['surface'].subsurface(index[name])
+        elif image is None:
+            image = pygame.image.load('frames/{}.png'.format(name))
+
+            # converting to the display pixel format needs a display, headless games use the decoded image as is
+            if display_ready():
+                image = image.convert_alpha()
+        images[name] = image
+    return images[name]
+
+
+def mirrored(image: pygame.Surface) -> pygame.Surface:
+
+    """
+    image: right facing image
+    Returns the left facing version of the image
+    """
+
+    return pygame.transform.flip(image, True, False)
+
+
+def load_mirrored(name: str) -> pygame.Surface:
+
+    """
+    name: file name of a right facing image
+    Returns the left facing version of the image
+    """
+
+    image = packed(name+':mirrored')
+    return mirrored(load(name)) if image is None else image
+
+
+def character_frames(character: str) -> dict:
+
+    """
+    character: name of the character
+    Returns a dictionary with the 'run_right', 'run_left', 'idle' and 'jump' frame lists of the character
+    The idle and jump lists hold the right facing image followed by the left facing image
+    """
+
+    if character not in characters:
+        raise ValueError('unknown character {}'.format(character))
+
+    key = '{}_run_right_img'.format(character)
+    if key not in animations:
+        prefix = file_prefixes.get(character, character)
+        run = ['{}_run_anim_r{}'.format(prefix, i) for i in range(4)]
+        idle = '{}_idle_anim_r0'.format(prefix)
+        jump = '{}_hit_anim_r0'.format(prefix)
+        animations['{}_run_right_img'.format(character)] = [load(name) for name in run]
+        animations['{}_run_left_img'.format(character)] = [load_mirrored(name) for name in run]
+        animations['{}_idle_img'.format(character)] = [load(idle), load_mirrored(idle)]
+        animations['{}_jump_img'.format(character)] = [load(jump), load_mirrored(jump)]
+
+    return {'run_right': animations['{}_run_right_img'.format(character)],
+            'run_left': animations['{}_run_left_img'.format(character)],
+            'idle': animations['{}_idle_img'.format(character)],
+            'jump': animations['{}_jump_img'.format(character)]}
+
+
+def release_characters(keep: str) -> None:
+
+    """
+    keep: name of the character whose frames stay loaded
+    Drops the frames of every other character, they are loaded again when next used
+    """
+
+    for character in characters:
+        if character == keep:
+            continue
+        prefix = file_prefixes.get(character, character)
+        for name in list(animations):
+            if name.startswith(character+'_'):
+                del animations[name]
+        for name in list(images):
+            if name.startswith(prefix+'_'):
+                del images[name]
+
+
+def __getattr__(name: str):
+
+    """
+    Loads module attributes such as frames.platform_img or frames.knight_m_run_left_img on first use
+    """
+
+    if name in static_images:
+        return load(static_images[name])
+
+    if name in ('demon_run_right_img', 'demon_run_left_img'):
+        if 'demon_run_right_img' not in animations:
+            run = ['big_demon_run_anim_r{}'.format(i) for i in range(4)]
+            animations['demon_run_right_img'] = [load(name) for name in run]
+            animations['demon_run_left_img'] = [load_mirrored(name) for name in run]
+        return animations[name]
+
+    for character in characters:
+        if name.startswith(character+'_') and name.endswith('_img'):
+            frame_type = name[len(character)+1:-len('_img')]
+            if frame_type in ('run_right', 'run_left', 'idle', 'jump'):
+                return character_frames(character)[frame_type]
+
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
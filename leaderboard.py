@@ -0,0 +1,232 @@
+import bisect
+import contextlib
+import os
+import sqlite3
+import threading
+import time
+from persistence import BackgroundWriter
+
+#  Stores every leaderboard score in a SQLite database shared by all game instances using the same directory
+#  The database uses write ahead logging so several games can read the leaderboard while another one saves a score
+#  Write ahead logging needs shared memory, so the games must run on one machine with the database on a local disk
+#  Scores are loaded and saved on a background thread, the game itself never waits for the database
+
+database_name = 'leaderboard.db'
+text_name = 'leaderboard.txt'  # leaderboard of older versions, imported into the database once
+size = 10  # number of scores shown on the leaderboard
+busy_timeout = 10  # seconds to wait for another game to finish writing
+
+
+class TopScores:
+
+    def __init__(self, entries=(), k=size):
+        self.k = k  # most scores kept
+
+        # sorted best first by (-score, order), equal scores keep the order they were added in
+        self.ranks = []
+        self.names = []
+        self.added = 0
+
+        for name, score in entries:
+            self.add(name, score)
+
+    def __len__(self) -> int:
+        return len(self.ranks)
+
+    def qualifies(self, score: int) -> bool:
+
+        """
+        score: final score of a game
+        Returns true if the score would be kept, a score equal to the lowest kept score does not replace it
+        """
+
+        return len(self.ranks) < self.k or score > -self.ranks[-1][0]
+
+    def add(self, name: str, score: int) -> int:
+
+        """
+        name: player name
+        score: final score of the game
+        Returns the position of the score, best score first, or None if it is not good enough to be kept
+        """
+
+        self.added += 1
+        if not self.qualifies(score):
+            return None
+        rank = (-score, self.added)
+        position = bisect.bisect(self.ranks, rank)
+        self.ranks.insert(position, rank)
+        self.names.insert(position, name)
+        if len(self.ranks) > self.k:
+            self.ranks.pop()
+            self.names.pop()
+        return position
+
+    def entries(self) -> list:
+
+        """
+        Returns the kept [name, score] entries, best first
+        """
+
+        return [[name, -rank[0]] for name, rank in zip(self.names, self.ranks)]
+
+
+class Leaderboard:
+
+    def __init__(self, directory='.', writer=None):
+        self.directory = directory
+        self.path = os.path.join(directory, database_name)
+        self.writer = writer if writer is not None else BackgroundWriter()  # scores are saved on its thread
+
+        # the game only reads the best scores kept in memory, the writer thread saves new scores and reloads them
+        self.lock = threading.Lock()
+        self.pending = []  # (name, score, time) of scores that have not been saved yet
+        self.connection = None  # database connection of the writer thread
+        self.best = TopScores()
+        self.loaded = threading.Event()  # set once the scores have been read from the database
+
+        # opening the database can wait on another game's write lock, so the scores are loaded in the background
+        self.refresh()
+
+    def add(self, name: str, score: int) -> None:
+
+        """
+        name: player name
+        score: final score of the game
+        The score is shown right away and saved in the background
+        """
+
+        with self.lock:
+            self.pending.append((name, score, time.time()))
+            self.best.add(name, score)
+        self.writer.submit(('leaderboard', self.path), self.save)
+
+    def refresh(self) -> None:
+
+        """
+        Reloads the best scores in the background, to show the scores saved by other games
+        """
+
+        self.writer.submit(('leaderboard', self.path), self.save)
+
+    def save(self) -> None:
+
+        """
+        Saves every pending score in one transaction and reloads the best scores, runs on the writer thread
+        The first save opens the database
+        """
+
+        if self.connection is None:
+            self.open()
+
+        with self.lock:
+            saving = self.pending
+            self.pending = []
+        try:
+            if saving:
+                with transaction(self.connection):
+                    self.connection.executemany('INSERT INTO scores (name, score, time) VALUES (?, ?, ?)', saving)
+        except BaseException:
+            with self.lock:
+                self.pending = saving+self.pending
+            raise
+
+        rows = top(self.connection)
+        with self.lock:
+            self.best = TopScores(rows+[[name, score] for name, score, added in self.pending])
+        self.loaded.set()
+
+    def open(self) -> None:
+
+        """
+        Connects to the database, creating its tables and importing the old text leaderboard the first time
+        """
+
+        connection = connect(self.path)
+        try:
+            with transaction(connection):
+                connection.execute('CREATE TABLE IF NOT EXISTS scores (id INTEGER PRIMARY KEY, name TEXT NOT NULL, '
+                                   'score INTEGER NOT NULL, time REAL NOT NULL)')
+                connection.execute('CREATE INDEX IF NOT EXISTS scores_by_rank ON scores (score DESC, id)')
+                connection.execute('CREATE TABLE IF NOT EXISTS imports (name TEXT PRIMARY KEY)')
+                import_text(connection, os.path.join(self.directory, text_name))
+        except BaseException:
+            connection.close()
+            raise
+        self.connection = connection
+
+    def top_scores(self, k=size) -> TopScores:
+
+        """
+        k: number of scores, at most the leaderboard size
+        Returns the k best scores known to this game, including scores still being saved
+        """
+
+        with self.lock:
+            return TopScores(self.best.entries(), k)
+
+
+def connect(path: str) -> sqlite3.Connection:
+
+    """
+    path: database file
+    Returns a connection to the database in write ahead logging mode, it can only be used by the calling thread
+    """
+
+    connection = sqlite3.connect(path, timeout=busy_timeout, isolation_level=None)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    return connection
+
+
+@contextlib.contextmanager
+def transaction(connection: sqlite3.Connection):
+
+    """
+    Holds the database write lock until the block ends
+    Changes made in the block are committed together, or not at all if the block raises
+    """
+
+    connection.execute('BEGIN IMMEDIATE')
+    try:
+        yield
+    except BaseException:
+        connection.execute('ROLLBACK')
+        raise
+    connection.execute('COMMIT')
+
+
+def import_text(connection: sqlite3.Connection, path: str) -> None:
+
+    """
+    path: leaderboard text file with one 'name score' line per entry
+    Adds the scores of the text file unless it has been imported before, must be called in a transaction
+    """
+
+    if connection.execute('SELECT 1 FROM imports WHERE name = ?', (text_name,)).fetchone() is not None:
+        return
+    if os.path.exists(path):
+        with open(path) as file:
+            for line in file:
+
+                # the score is the last word, everything before it is the name, which can contain spaces or be
+                # empty when the player saved without typing one, lines without a score are skipped
+                fields = line.rsplit(None, 1)
+                try:
+                    score = int(fields[-1])
+                except (IndexError, ValueError):
+                    continue
+                name = fields[0].strip() if len(fields) == 2 else ''
+                connection.execute('INSERT INTO scores (name, score, time) VALUES (?, ?, ?)', (name, score, 0))
+    connection.execute('INSERT INTO imports (name) VALUES (?)', (text_name,))
+
+
+def top(connection: sqlite3.Connection, n=size) -> list:
+
+    """
+    n: number of scores
+    Returns the n best [name, score] entries, best first, equal scores in the order they were saved
+    """
+
+    rows = connection.execute('SELECT name, score FROM scores ORDER BY score DESC, id LIMIT ?', (n,))
+    return [[name, score] for name, score in rows]
@@ -1,8 +1,29 @@
-import pygame
-import random as rnd
+from __future__ import annotations
+import argparse
+import functools
+import importlib
+import json
+import os
 import sys
+import time
+from typing import TYPE_CHECKING
+
+started = time.perf_counter()  # start of the startup report, before the slow pygame import
+
+import pygame
 import frames
+from pacer import FramePacer
+from persistence import BackgroundWriter, write_atomic
 import sounds
+from profiler import FrameProfiler, NullProfiler, StartupTimer
+from renderer import DirtyRenderer, IdleScreen, allowed_events
+from scenes import Scene, SceneStack
+from sprites import Player, Powerup, Background
+
+# the game rules are imported once the title screen is shown, type checkers still need their names
+if TYPE_CHECKING:
+    import replay
+    from simulation import Simulation
 
 from pygame.locals import (
     K_ESCAPE,
@@ -11,6 +32,8 @@ from pygame.locals import (
     K_LEFT,
     K_RIGHT,
     K_SPACE,
+    K_F3,
+    K_F4,
     K_a,
     K_d,
     KEYDOWN)
@@ -18,1694 +41,1177 @@ from pygame.locals import (
 screen_w = 512
 screen_h = 704
 
+replay_dir = 'replays'  # every finished game is saved here so its score can be checked later
 
-def main():
-    pygame.init()
-    game = State()
-    running = True
-    while running:
+# menus move by time so they look the same at every frame rate
+menu_scroll_speed = 60  # pixels per second the menu background scrolls
+max_menu_step = 0.05  # most seconds a menu moves on by in one frame, after waiting for input or another screen
 
-        if game.showing_title:
-            game.show_title()
 
-        elif game.showing_selection:
-            game.show_character_selection()
+def main():
+    args = parse_args()
+    startup = StartupTimer(started)
+    startup.mark('imports')
+
+    # the game rules and leaderboard are only imported once they are needed so the title screen shows sooner
+    if args.replay is not None:
+        import replay
+        recording = replay.load(args.replay)
+        sim = replay.play(recording, args.vectorized)
+        print('score: {}  recorded score: {}  frames: {}'.format(sim.score, recording.score, sim.frame))
+        if sim.score != recording.score:
+            sys.exit(1)
+        return
+
+    if args.headless:
+        import replay
+        from simulation import run_headless
+        recording = None
+        if args.record is not None:
+            recording = replay.Recording(args.seed, args.difficulty, args.character)
+        sim = run_headless(args.difficulty, args.character, args.seed, args.frames, args.vectorized, recording)
+        print('score: {}  frames: {}  {}'.format(sim.score, sim.frame, 'died' if sim.game_over else 'alive'))
+        if recording is not None:
+            recording.seed = sim.seed
+            recording.score = sim.score
+            recording.save(args.record)
+        return
+
+    # only the display and fonts are started here, the mixer is opened after the first title frame
+    sounds.pre_init(args.audio_buffer)
+    pygame.display.init()
+    pygame.font.init()
+    startup.mark('pygame init')
+    game = State(dirty_rendering=args.dirty_rects, profiling=args.profile, leaderboard_dir=args.leaderboard_dir,
+                 fps=args.fps, vsync=args.vsync, frame_stats=args.frame_stats, startup=startup,
+                 startup_report=args.startup_report, idle_menus=args.idle_menus)
+    game.scenes.switch('title')
+    while game.scenes:
+        game.scenes.top().frame()
+
+    game.exit()
+
+
+def parse_args() -> argparse.Namespace:
 
-        elif game.showing_leaderboard:
-            game.show_leaderboard()
+    """
+    Returns the parsed command line arguments
+    """
 
-        elif game.showing_options: 
-            game.show_options(None)
+    parser = argparse.ArgumentParser(description='Dungeon Jump')
+    parser.add_argument('--headless', action='store_true',
+                        help='simulate a game with a scripted player and no window, as fast as possible')
+    parser.add_argument('--dirty-rects', action='store_true',
+                        help='redraw only the changed regions of the game screen when the world is not scrolling')
+    parser.add_argument('--profile', action='store_true',
+                        help='time each phase of the game loop, F3 shows the timings and F4 saves them as a trace')
+    parser.add_argument('--fps', type=int, default=60, help='frames drawn per second, 0 for no limit')
+    parser.add_argument('--vsync', action='store_true',
+                        help='wait for the display refresh when showing a frame instead of pacing to --fps')
+    parser.add_argument('--idle-menus', action='store_true',
+                        help='hold the menu backgrounds still so menus only redraw on input, saving power')
+    parser.add_argument('--frame-stats', action='store_true', help='print frame time statistics on exit')
+    parser.add_argument('--startup-report', action='store_true',
+                        help='print the time of each startup stage once the title screen is shown')
+    parser.add_argument('--audio-buffer', type=int, default=sounds.buffer,
+                        help='samples per audio buffer, smaller buffers lower the sound delay')
+    parser.add_argument('--leaderboard-dir', default='.',
+                        help='local directory of the leaderboard database, games on this machine using it share scores')
+    parser.add_argument('--seed', type=int, default=None, help='random seed for the headless game')
+    parser.add_argument('--frames', type=int, default=10000, help='maximum number of frames to simulate')
+    parser.add_argument('--difficulty', choices=['easy', 'medium', 'hard'], default='hard',
+                        help='difficulty of the headless game')
+    parser.add_argument('--character', choices=frames.characters, default='knight_m', help='character of the headless game')
+    parser.add_argument('--vectorized', action='store_true',
+                        help='check the collisions of the headless game with numpy')
+    parser.add_argument('--record', metavar='PATH', help='save the inputs of the headless game to a replay file')
+    parser.add_argument('--replay', metavar='PATH',
+                        help='play a replay file again without a window and check it reaches the recorded score')
+    return parser.parse_args()
 
-        elif game.showing_help:
-            game.show_help(None)
 
-        elif game.running:
-            game.run_game()
+class State:
 
-        elif game.showing_death:
-            game.show_death_screen()
+    def __init__(self, dirty_rendering=False, profiling=False, leaderboard_dir='.', fps=60, vsync=False,
+                 frame_stats=False, startup=None, startup_report=False, idle_menus=False):
 
-        else:
-            running = False
+        self.startup = startup or StartupTimer()  # times each stage until the title screen is shown
+        self.startup_report = startup_report  # print the startup times
+        self.started = False  # whether the deferred startup stages have run
 
-    pygame.display.quit()
-    pygame.quit()
-    sys.exit()
+        # vsync needs a scaled or OpenGL window and is not available on every display driver
+        self.screen = None
+        self.vsync = False  # whether showing a frame waits for the display refresh
+        if vsync:
+            try:
+                self.screen = pygame.display.set_mode((screen_w, screen_h), pygame.SCALED, vsync=1)
 
+                # a software renderer accepts vsync but ignores it, only flips that wait mean it is on
+                self.vsync = flips_wait(self.screen)
+            except pygame.error:
+                pass
+        if self.screen is None:
+            self.screen = pygame.display.set_mode((screen_w, screen_h))
 
-class State:
+        # events the game never reads would only wake the idle menus
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(allowed_events)
+        self.startup.mark('display')
 
-    def __init__(self):
-    
-        self.screen = pygame.display.set_mode((screen_w, screen_h))
-        self.clock = pygame.time.Clock()
-        
         # fonts for text rendering 
-        self.large_font = pygame.font.Font(None, 50)
-        self.medium_font = pygame.font.Font(None, 37)
-        self.small_yellow_font = pygame.font.SysFont(None, 28)
-        self.small_font = pygame.font.SysFont(None, 24)
+        self.large_font = default_font(50)
+        self.medium_font = default_font(37)
+        self.small_yellow_font = default_font(28)
+        self.small_font = default_font(24)
+        self.startup.mark('fonts')
         
-        self.fps = 60
-
-        # two background images stacked on top for scrolling
-        self.background1 = Background(screen_w//2)
-        self.background2 = Background(screen_w//2-704)
-
-        # boolean values holding which game screen to show
-        self.running = False
-        self.paused = False
-        self.showing_title = True
-        self.showing_leaderboard = False
-        self.showing_selection = False
-        self.showing_death = False
-        self.showing_options = False
-        self.showing_help = False
+        self.fps = fps
+
+        # with working vsync the display refresh paces the frames, waiting for a rate as well would skip refreshes
+        # unevenly, without it the rate caps the frames
+        self.pacer = FramePacer(0 if self.vsync else fps)  # waits between frames and measures their times
+        self.frame_stats = frame_stats  # print frame time statistics on exit
+        self.tick_rate = 60  # game rule steps per second
+        self.max_steps = 5  # most game rule steps to catch up on in a single frame
+        self.dirty_rendering = dirty_rendering  # redraw only changed regions of the game screen
+        self.idle_menus = idle_menus  # menus hold the background still and only redraw when something changes
+        self.profiling = profiling
+        self.profiler = FrameProfiler() if profiling else NullProfiler()  # times the phases of the game loop
+        self.sounds = sounds.SoundManager()  # opens the mixer when the first game starts
+
+        # background layers shared by the menus and the game, scrolled as the world moves
+        self.background = Background(screen_w//2)
+        self.scrolled_at = time.perf_counter()  # time the menu background was last drawn
 
         self.character = None
         self.difficulty = None
 
-        self.leaderboard = get_leaderboard()
-        self.highscore = False
+        self.writer = BackgroundWriter()  # saves scores, replays and traces without blocking the game
+        self.leaderboard_dir = leaderboard_dir
+        self.scores = None  # leaderboard database, may be shared with other games, opened after the first title frame
+        self.leaderboard = None
         self.score = 0
 
-    def run_game(self) -> None:
-    
+        # screens of the game, the scene on top of the stack runs
+        self.scenes = SceneStack(self, {'title': TitleScene, 'selection': SelectionScene,
+                                        'leaderboard': LeaderboardScene, 'options': OptionsScene, 'help': HelpScene,
+                                        'game': GameScene, 'pause': PauseScene, 'death': DeathScene})
+        self.startup.mark('state')
+
+    def finish_startup(self) -> None:
+
         """
-        Handling the events during the running game state
+        Loads what the title screen does not need, called once the first title frame is shown
         """
 
-        # sprite group that holds all movable sprites
-        dynamic_sprites = pygame.sprite.Group()
-        dynamic_sprites.add([self.background1, self.background2])
-        
-        # creating all the current platforms
-        number_of_platforms = 15
-        pos = [rnd.uniform(100, screen_w-100), screen_h-25]  # create lowest platform
-        platforms = [Platform(pos)]
-        for i in range(1, number_of_platforms):
-            platforms.append(Platform(platforms[i-1].rect.center))  # randomly create platforms using previous
-        dynamic_sprites.add(platforms)
+        if self.started:
+            return
+        self.started = True
+        self.startup.mark('first frame')
 
-        player = Player(platforms[3].rect.center[0], platforms[3].rect.top, self.character)
+        # loaded now so starting the first game does not wait for them, they are imported where they are used
+        for module in ('replay', 'simulation'):
+            importlib.import_module(module)
+        self.startup.mark('game modules')
 
-        origin = Origin(player.rect.center)  # for scoring system, score is vertical distance from this object
-        dynamic_sprites.add(origin)
+        from leaderboard import Leaderboard
+        self.scores = Leaderboard(self.leaderboard_dir, self.writer)  # the scores are loaded on the writer thread
+        self.leaderboard = self.scores.top_scores()
+        self.startup.mark('leaderboard')
 
-        # sprite group that holds all static sprites
-        static_sprites = pygame.sprite.Group()
+        self.sounds.init()
+        self.startup.mark('sounds')
 
-        # marker symbols for the graphical interface
-        lives_marker = Powerup(screen_w-155, 30, 'lives')
-        d_jump_marker = Powerup(screen_w-155, 60, 'double_jump')
-        fireball_marker = Powerup(screen_w-155, 90, 'fireball')
-        static_sprites.add([lives_marker, d_jump_marker, fireball_marker, player])
-        
-        if self.difficulty == 'easy':
-            enemy_chance = 20  # 1 in 20 chance of being spawned on a platform
-            projectile_chance = 200  # 1 in 200 chance of being created each frame
-            projectile_speed = 4
-            powerup_chance = 5  # 1 in 5 chance of being spawned on a platform
-            enemy_speed = 3
-
-        elif self.difficulty == 'medium':
-            enemy_chance = 10
-            projectile_chance = 100
-            projectile_speed = 6
-            powerup_chance = 10
-            enemy_speed = 5
+        if self.startup_report:
+            print(self.startup.report(), flush=True)
 
-        else:
-            enemy_chance = 5
-            projectile_chance = 50
-            projectile_speed = 8
-            powerup_chance = 20
-            enemy_speed = 7
+    def save_replay(self, recording: replay.Recording) -> None:
 
-        self.score = 0
+        """
+        recording: recording of the finished game
+        Saves the recording in the replay directory, named by the time the game ended and its score
+        """
 
-        while self.running:
-            for event in pygame.event.get():
-
-                if event.type == KEYDOWN:
-
-                    if event.key == K_ESCAPE:
-                        self.pause_game()
-                        self.show_pause_screen()
-
-                    if event.key == K_SPACE:
-
-                        # change player state to jumping if space is pressed while on a platform
-                        if player.on_platform:
-                            player.is_jumping = True
-                            player.on_platform = False
-                            player.time = 0
-                            pygame.mixer.Sound.play(sounds.jump_sound)
-
-                        # reset jump time if space is pressed in the air and the player has a double jump powerup
-                        elif player.powerups['double_jump'] > 0:
-                            player.powerups['double_jump'] -= 1
-                            player.is_jumping = True
-                            player.time = 0
-                            pygame.mixer.Sound.play(sounds.jump_sound)
-
-                # create player fireball by mouseclick if player has powerup and no active fireballs
-                if event.type == pygame.MOUSEBUTTONDOWN and player.powerups['fireball'] > 0 and player.projectile is None:
-                    player.powerups['fireball'] -= 1
-                    mouse_pos = pygame.mouse.get_pos()
-                    player.create_projectile(mouse_pos, dynamic_sprites)
-
-                if event.type == pygame.QUIT:
-                    self.exit()
-
-            pressed_keys = pygame.key.get_pressed()
-            player.move(pressed_keys, dynamic_sprites)
-
-            # move and check fireball position
-            if player.projectile is not None:
-                player.projectile.move()
-                if player.projectile.hits_boundary():
-                    player.remove_projectile()
-
-            # check if lowest platform is out of bounds, create new one if true
-            if platforms[0].rect.top > screen_h+50:
-                platforms[0].remove_platform(platforms)
-                platforms.append(Platform(platforms[-1].rect.center))
-                dynamic_sprites.add(platforms[-1])
-                
-                # create new enemy if true
-                if rnd.choice(range(enemy_chance)) == 0:
-                    platforms[-1].create_enemy(dynamic_sprites, enemy_speed)
-                    
-                # create new powerup if true
-                if rnd.choice(range(powerup_chance)) == 0:
-                    platforms[-1].create_powerup(dynamic_sprites)
-
-            
-            current_platform = True  # for checking player position relative to all platforms below the player
-            for platform in platforms:
-
-                if current_platform:
-                
-                    if player.falls_off(platform):
-                        current_platform = False  # stop checking player position realtive to platforms above
-                    
-                    # change player state to on platform and create walking sound
-                    elif player.lands_on(platform, platform.lastYPos, dynamic_sprites):
-                        pygame.mixer.Sound.play(sounds.step_sound)
-                        current_platform = False
-                        
-                # position of platform top for checking logic in next frame
-                platform.lastYPos = platform.rect.top
-
-                # add powerup to player powerups and remove from game
-                if platform.powerup is not None and player.touches(platform.powerup):
-                    player.consumes(platform.powerup)
-                    platform.remove_powerup()
-
-                # move enemy and check logic if platform has an enemy associated
-                if platform.enemy is not None:
-                    platform.enemy.move()
-                    
-                    # check if player kills an enemy
-                    if player.projectile is not None and player.projectile.hits(platform.enemy):
-                        pygame.mixer.Sound.play(sounds.explosion_sound)
-                        platform.remove_enemy()
-                        self.score += 500
-                        
-                    # check if enemy kills the player
-                    elif player.touches(platform.enemy):
-                        self.go_to_death_screen()
-
-                # if platform enemy created a projectile
-                if platform.projectile is not None:
-                    platform.projectile.move()
-                    
-                    if platform.projectile.hits(player):
-                        pygame.mixer.Sound.play(sounds.explosion_sound)
-                        
-                        # check if player has any extra lives
-                        if player.powerups['lives'] > 1:
-                            player.powerups['lives'] -= 1
-                            platform.remove_projectile()
-                          
-                        else:
-                            self.go_to_death_screen()
-
-                    # remove projectile if out of bounds
-                    elif platform.projectile.hits_boundary():
-                        platform.remove_projectile()
-                
-                # create new projectile if platform has an associated enemy and random chance returns true
-                elif platform.enemy is not None and rnd.choice(range(projectile_chance)) == 0:
-                    platform.create_projectile(projectile_speed, dynamic_sprites)
-
-            # if player is below the lowest platform
-            if player.falls_below(platforms[0]):
-                self.go_to_death_screen()
-
-            player.animate()
-
-            # background scrolling
-            self.background1.check_background()
-            self.background2.check_background()
-
-            # recalculate the current score
-            if origin.rect.center[1]-player.rect.center[1] > self.score:
-                self.score = origin.rect.center[1]-player.rect.center[1]
-
-            # create interface text
-            scoreboard_surf, scoreboard_rect = render_text(self.small_font, 'Score: {}'.format(self.score), left=20,
-                                                           top=20)
-            lives_surf, lives_rect = render_text(self.small_font, 'Lives: {}'.format(player.powerups['lives']),
-                                                 left=lives_marker.rect.right+10, top=lives_marker.rect.top+5)
-            d_jump_surf, d_jump_rect = render_text(self.small_font, 'Double Jump: {}'.format(player.powerups['double_jump']),
-                                                   left=d_jump_marker.rect.right+10, top=d_jump_marker.rect.top+5)
-            fireball_surf, fireball_rect = render_text(self.small_font, 'Fireball: {}'.format(player.powerups['fireball']),
-                                                       left=fireball_marker.rect.right+10, top=fireball_marker.rect.top+5)
-
-            # blit all active images to the screen
-            for entity in dynamic_sprites:
-                self.screen.blit(entity.surf, entity.rect)
-            for entity in static_sprites:
-                self.screen.blit(entity.surf, entity.rect)
-            self.screen.blit(scoreboard_surf, scoreboard_rect)
-            self.screen.blit(lives_surf, lives_rect)
-            self.screen.blit(d_jump_surf, d_jump_rect)
-            self.screen.blit(fireball_surf, fireball_rect)
+        file_name = '{}_{}_{}.djr'.format(time.strftime('%Y%m%d_%H%M%S'), recording.difficulty, recording.score)
+        path = os.path.join(replay_dir, file_name)
+        data = recording.encode()
 
-            pygame.display.flip()
-            self.clock.tick(self.fps)
+        def save():
+            os.makedirs(replay_dir, exist_ok=True)
+            write_atomic(path, data)
+
+        self.writer.submit(('file', os.path.abspath(path)), save)
 
-    def show_title(self) -> None:
+    def exit(self) -> None:
     
         """
-        Title screen state of the game showing options: play game, leaderboards, options, help
+        Exit all states and the application
         """
     
-        # enlarged yellow fonts are for active user selections
-        title_surf, title_rect = render_text(self.large_font, 'Dungeon Jump', x=screen_w//2, y=1.5*screen_h//5)
-        play_game_surf_w, play_game_rect_w = render_text(self.small_font, 'Play Game', x=screen_w//2, y=2.5*screen_h//5)
-        play_game_surf_y, play_game_rect_y = render_text(self.small_yellow_font, 'Play Game', x=screen_w//2, y=2.5*screen_h//5,
-                                                         color=(255, 255, 0))
-        leaderboard_surf_w, leaderboard_rect_w = render_text(self.small_font, 'Leaderboards', x=screen_w//2,
-                                                             y=3*screen_h//5)
-        leaderboard_surf_y, leaderboard_rect_y = render_text(self.small_yellow_font, 'Leaderboards', x=screen_w//2,
-                                                             y=3*screen_h//5, color=(255, 255, 0))
-        options_surf_w, options_rect_w = render_text(self.small_font, 'Options', x=screen_w//2, y=3.5*screen_h//5)
-        options_surf_y, options_rect_y = render_text(self.small_yellow_font, 'Options', x=screen_w//2, y=3.5*screen_h//5,
-                                                     color=(255, 255, 0))
-        help_surf_w, help_rect_w = render_text(self.small_font, 'Help', x=screen_w//2, y=4*screen_h//5)
-        help_surf_y, help_rect_y = render_text(self.small_yellow_font, 'Help', x=screen_w//2, y=4*screen_h//5,
-                                               color=(255, 255, 0))
-
-        while self.showing_title:
-            mouse_pos = pygame.mouse.get_pos()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.exit()
-
-                # check if user made any of the possible selections
-                if play_game_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        self.go_to_character_selection()
-
-                if leaderboard_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        self.go_to_leaderboard()
-
-                if options_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        self.go_to_options()
-
-                if help_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        self.go_to_help()
-
-            # blit the scrolling background and add the game title
-            self.scrolling_background()
-            self.screen.blit(title_surf, title_rect)
-            
-            # check if mouse is hovering over a selection
-            if play_game_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(play_game_surf_y, play_game_rect_y)
-            else:
-                self.screen.blit(play_game_surf_w, play_game_rect_w)
+        pygame.display.quit()
+        pygame.quit()
+        if self.frame_stats:
+            stats = self.pacer.stats()
+            print('frames {}'.format(stats.pop('frames')) +
+                  ''.join('  {} {:.2f} ms'.format(name, value) for name, value in stats.items()))
+        self.writer.close()  # finish saving before the process ends
+        sys.exit()
 
-            if leaderboard_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(leaderboard_surf_y, leaderboard_rect_y)
-            else:
-                self.screen.blit(leaderboard_surf_w, leaderboard_rect_w)
+    def new_highscore(self) -> bool:
+    
+        """
+        Returns a boolean value indicating whether the player has achieved a top 10 score, None while the leaderboard
+        is still loading since any score would make an empty leaderboard
+        """
+    
+        if not self.scores.loaded.is_set():
+            return None
+        self.leaderboard = self.scores.top_scores()
+        self.scores.refresh()
+        return self.leaderboard.qualifies(self.score)
 
-            if options_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(options_surf_y, options_rect_y)
-            else:
-                self.screen.blit(options_surf_w, options_rect_w)
+    def update_leaderboard(self, name) -> None:
+    
+        """
+        Saves the score in the leaderboard database in the background
+        name: player name for storing score
+        """
+    
+        self.leaderboard.add(name, self.score)
+        self.scores.add(name, self.score)
 
-            if help_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(help_surf_y, help_rect_y)
-            else:
-                self.screen.blit(help_surf_w, help_rect_w)
+    def scrolling_background(self, scroll=True) -> None:
+        
+        """
+        Shifts the background by the time since the last frame
+        scroll: False draws the background where it is, for menus that only redraw on input
+        """
 
-            pygame.display.flip()
-            self.clock.tick(self.fps)
+        now = time.perf_counter()
+        if scroll:
+            self.background.move(menu_scroll_speed*min(now-self.scrolled_at, max_menu_step))
+        self.scrolled_at = now
+        self.background.draw(self.screen)
+
+
+class TitleScene(Scene):
+
+    def __init__(self, state: State):
+        super().__init__(state)
+        self.title_surf, self.title_rect = render_text(state.large_font, 'Dungeon Jump', x=screen_w//2,
+                                                       y=1.5*screen_h//5)
+        self.play_game_button = Button(state, 'Play Game', x=screen_w//2, y=2.5*screen_h//5)
+        self.leaderboard_button = Button(state, 'Leaderboards', x=screen_w//2, y=3*screen_h//5)
+        self.options_button = Button(state, 'Options', x=screen_w//2, y=3.5*screen_h//5)
+        self.help_button = Button(state, 'Help', x=screen_w//2, y=4*screen_h//5)
+        self.buttons = [self.play_game_button, self.leaderboard_button, self.options_button, self.help_button]
+        self.idle = IdleScreen([button.rect for button in self.buttons], pacer=state.pacer)
+
+    def enter(self) -> None:
+        self.idle.idle = self.state.idle_menus
+        self.idle.changed = True
+
+    def resume(self) -> None:
+        self.idle.changed = True
+
+    def frame(self) -> None:
 
-    def show_character_selection(self) -> None:
-    
         """
-        Character selection screen state of the game showing character options and difficulty
+        Title screen of the game showing options: play game, leaderboards, options, help
         """
-    
-        difficulty_surf, difficulty_rect = render_text(self.medium_font, 'Choose Your Difficulty', x=screen_w//2,
-                                                       y=screen_h//6)
-        easy_surf_w, easy_rect_w = render_text(self.small_font, 'Easy', x=0.75*screen_w//3, y=1.5*screen_h//6)
-        easy_surf_y, easy_rect_y = render_text(self.small_yellow_font, 'Easy', x=0.75*screen_w//3, y=1.5*screen_h//6,
-                                               color=(255, 255, 0))
-        medium_surf_w, medium_rect_w = render_text(self.small_font, 'Medium', x=1.5*screen_w//3, y=1.5*screen_h//6)
-        medium_surf_y, medium_rect_y = render_text(self.small_yellow_font, 'Medium', x=1.5*screen_w//3, y=1.5*screen_h//6,
-                                                   color=(255, 255, 0))
-        hard_surf_w, hard_rect_w = render_text(self.small_font, 'Hard', x=2.25*screen_w//3, y=1.5*screen_h//6)
-        hard_surf_y, hard_rect_y = render_text(self.small_yellow_font, 'Hard', x=2.25*screen_w//3, y=1.5*screen_h//6,
-                                               color=(255, 255, 0))
-
-        character_surf, character_rect = render_text(self.medium_font, 'Choose Your Character', x=screen_w//2,
-                                                     y=2*screen_h//6)
-        knight_m = Player(screen_w//5, 2.75*screen_h//6, 'knight_m')
-        knight_m_surf_w, knight_m_rect_w = render_text(self.small_font, 'Knight (m)', x=screen_w//5, y=2.9*screen_h//6)
-        knight_m_surf_y, knight_m_rect_y = render_text(self.small_yellow_font, 'Knight (m)', x=screen_w//5, y=2.9*screen_h//6,
-                                                       color=(255, 255, 0))
-        elf_m = Player(2*screen_w//5, 2.75*screen_h//6, 'elf_m')
-        elf_m_surf_w, elf_m_rect_w = render_text(self.small_font, 'Elf (m)', x=2*screen_w//5, y=2.9*screen_h//6)
-        elf_m_surf_y, elf_m_rect_y = render_text(self.small_yellow_font, 'Elf (m)', x=2*screen_w//5, y=2.9*screen_h//6,
-                                                 color=(255, 255, 0))
-        wizard_m = Player(3*screen_w//5, 2.75*screen_h//6, 'wizard_m')
-        wizard_m_surf_w, wizard_m_rect_w = render_text(self.small_font, 'Wizard (m)', x=3*screen_w//5,
-                                                       y=2.9*screen_h//6)
-        wizard_m_surf_y, wizard_m_rect_y = render_text(self.small_yellow_font, 'Wizard (m)', x=3*screen_w//5,
-                                                       y=2.9*screen_h//6, color=(255, 255, 0))
-        dragon_m = Player(4*screen_w//5, 2.75*screen_h//6, 'dragon_m')
-        dragon_m_surf_w, dragon_m_rect_w = render_text(self.small_font, 'Dragon (m)', x=4*screen_w//5,
-                                                       y=2.9*screen_h//6)
-        dragon_m_surf_y, dragon_m_rect_y = render_text(self.small_yellow_font, 'Dragon (m)', x=4*screen_w//5,
-                                                       y=2.9*screen_h//6, color=(255, 255, 0))
-        knight_f = Player(screen_w//5, 3.5*screen_h//6, 'knight_f')
-        knight_f_surf_w, knight_f_rect_w = render_text(self.small_font, 'Knight (f)', x=screen_w//5, y=3.65*screen_h//6)
-        knight_f_surf_y, knight_f_rect_y = render_text(self.small_yellow_font, 'Knight (f)', x=screen_w//5, y=3.65*screen_h//6,
-                                                       color=(255, 255, 0))
-        elf_f = Player(2*screen_w//5, 3.5*screen_h//6, 'elf_f')
-        elf_f_surf_w, elf_f_rect_w = render_text(self.small_font, 'Elf (f)', x=2*screen_w//5, y=3.65*screen_h//6)
-        elf_f_surf_y, elf_f_rect_y = render_text(self.small_yellow_font, 'Elf (f)', x=2*screen_w//5, y=3.65*screen_h//6,
-                                                 color=(255, 255, 0))
-        wizard_f = Player(3*screen_w//5, 3.5*screen_h//6, 'wizard_f')
-        wizard_f_surf_w, wizard_f_rect_w = render_text(self.small_font, 'Wizard (f)', x=3*screen_w//5,
-                                                       y=3.65*screen_h//6)
-        wizard_f_surf_y, wizard_f_rect_y = render_text(self.small_yellow_font, 'Wizard (f)', x=3*screen_w//5,
-                                                       y=3.65*screen_h//6, color=(255, 255, 0))
-        dragon_f = Player(4*screen_w//5, 3.5*screen_h//6, 'dragon_f')
-        dragon_f_surf_w, dragon_f_rect_w = render_text(self.small_font, 'Dragon (f)', x=4*screen_w//5,
-                                                       y=3.65*screen_h//6)
-        dragon_f_surf_y, dragon_f_rect_y = render_text(self.small_yellow_font, 'Dragon (f)', x=4*screen_w//5,
-                                                       y=3.65*screen_h//6, color=(255, 255, 0))
-        pumpkin = Player(1.5*screen_w//5, 4.25*screen_h//6, 'pumpkin')
-        pumpkin_surf_w, pumpkin_rect_w = render_text(self.small_font, 'Pumpkin', x=1.5*screen_w//5, y=4.4*screen_h//6)
-        pumpkin_surf_y, pumpkin_rect_y = render_text(self.small_yellow_font, 'Pumpkin', x=1.5*screen_w//5,
-                                                     y=4.4*screen_h//6, color=(255, 255, 0))
-        doc = Player(3.5*screen_w//5, 4.25*screen_h//6, 'doc')
-        doc_surf_w, doc_rect_w = render_text(self.small_font, 'Plague Doctor', x=3.5*screen_w//5, y=4.4*screen_h//6)
-        doc_surf_y, doc_rect_y = render_text(self.small_yellow_font, 'Plague Doctor', x=3.5*screen_w//5, y=4.4*screen_h//6,
-                                             color=(255, 255, 0))
-
-        # sprite group that contains all character images
-        sprites = pygame.sprite.Group()
-        sprites.add([knight_m, elf_m, wizard_m, dragon_m, knight_f, elf_f, wizard_f, dragon_f, pumpkin, doc])
-
-        play_game_surf_w, play_game_rect_w = render_text(self.small_font, 'Play Game', x=screen_w//3, y=5*screen_h//6)
-        play_game_surf_y, play_game_rect_y = render_text(self.small_yellow_font, 'Play Game', x=screen_w//3, y=5*screen_h//6,
-                                                         color=(255, 255, 0))
-        back_surf_w, back_rect_w = render_text(self.small_font, 'Main Menu', x=2*screen_w//3, y=5*screen_h//6)
-        back_surf_y, back_rect_y = render_text(self.small_yellow_font, 'Main Menu', x=2*screen_w//3, y=5*screen_h//6,
-                                               color=(255, 255, 0))
-        error_surf, error_rect = render_text(self.small_yellow_font, 'Select Your Character/Difficulty', x=screen_w//2,
-                                             y=5.5*screen_h//6, color=(255, 0, 0))
-
-        error = False  # for preventing game start without a character and difficulty selection
-
-        while self.showing_selection:
-            mouse_pos = pygame.mouse.get_pos()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.exit()
-
-                if play_game_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                    
-                        # check if selections have been made or show error message
-                        if self.difficulty is not None and self.character is not None:
-                            self.go_to_game()
-                        else:
-                            error = True
-
-                # check if user made a selection by mouseclick
-                if back_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        self.go_to_title()
-                        
-                # set difficulty by user choice
-                elif easy_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        if self.difficulty != 'easy':
-                            self.difficulty = 'easy'
-                        else:
-                            self.difficulty = None
-
-                elif medium_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        if self.difficulty != 'medium':
-                            self.difficulty = 'medium'
-                        else:
-                            self.difficulty = None
-
-                elif hard_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        if self.difficulty != 'hard':
-                            self.difficulty = 'hard'
-                        else:
-                            self.difficulty = None
-
-                # set character by user choice
-                elif knight_m_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        if self.character != 'knight_m':
-                            self.character = 'knight_m'
-                        else:
-                            self.character = None
-
-                elif elf_m_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        if self.character != 'elf_m':
-                            self.character = 'elf_m'
-                        else:
-                            self.character = None
-
-                elif wizard_m_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        if self.character != 'wizard_m':
-                            self.character = 'wizard_m'
-                        else:
-                            self.character = None
-
-                elif dragon_m_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        if self.character != 'dragon_m':
-                            self.character = 'dragon_m'
-                        else:
-                            self.character = None
-
-                elif knight_f_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        if self.character != 'knight_f':
-                            self.character = 'knight_f'
-                        else:
-                            self.character = None
-
-                elif elf_f_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        if self.character != 'elf_f':
-                            self.character = 'elf_f'
-                        else:
-                            self.character = None
-
-                elif wizard_f_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        if self.character != 'wizard_f':
-                            self.character = 'wizard_f'
-                        else:
-                            self.character = None
-
-                elif dragon_f_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        if self.character != 'dragon_f':
-                            self.character = 'dragon_f'
-                        else:
-                            self.character = None
-
-                elif pumpkin_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        if self.character != 'pumpkin':
-                            self.character = 'pumpkin'
-                        else:
-                            self.character = None
-
-                elif doc_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        if self.character != 'doc':
-                            self.character = 'doc'
-                        else:
-                            self.character = None
-
-            self.scrolling_background()
-            self.screen.blit(difficulty_surf, difficulty_rect)
-            self.screen.blit(character_surf, character_rect)
-            
-            # show yellow selection font if user mouse is hovering over a selection or blit default font
-            if self.difficulty == 'easy' or easy_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(easy_surf_y, easy_rect_y)
-            else:
-                self.screen.blit(easy_surf_w, easy_rect_w)
 
-            if self.difficulty == 'medium' or medium_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(medium_surf_y, medium_rect_y)
-            else:
-                self.screen.blit(medium_surf_w, medium_rect_w)
+        state = self.state
+        events = self.idle.events()
+        mouse_pos = pygame.mouse.get_pos()
 
-            if self.difficulty == 'hard' or hard_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(hard_surf_y, hard_rect_y)
-            else:
-                self.screen.blit(hard_surf_w, hard_rect_w)
+        for event in events:
+            if event.type == pygame.QUIT:
+                state.exit()
 
-            if self.character == 'knight_m' or knight_m_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(knight_m_surf_y, knight_m_rect_y)
-                knight_m.selection_animate()
-            else:
-                self.screen.blit(knight_m_surf_w, knight_m_rect_w)
-                knight_m.surf = knight_m.stationary_image[0]
+            # check if user made any of the possible selections
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if self.play_game_button.hovered(mouse_pos):
+                    state.scenes.switch('selection')
+                elif self.leaderboard_button.hovered(mouse_pos):
+                    state.scenes.switch('leaderboard')
+                elif self.options_button.hovered(mouse_pos):
+                    state.scenes.push('options')
+                elif self.help_button.hovered(mouse_pos):
+                    state.scenes.push('help')
 
-            if self.character == 'elf_m' or elf_m_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(elf_m_surf_y, elf_m_rect_y)
-                elf_m.selection_animate()
-            else:
-                self.screen.blit(elf_m_surf_w, elf_m_rect_w)
-                elf_m.surf = elf_m.stationary_image[0]
+            if not self.active():
+                return
 
-            if self.character == 'wizard_m' or wizard_m_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(wizard_m_surf_y, wizard_m_rect_y)
-                wizard_m.selection_animate()
-            else:
-                self.screen.blit(wizard_m_surf_w, wizard_m_rect_w)
-                wizard_m.surf = wizard_m.stationary_image[0]
+        if not self.idle.needs_redraw(events, mouse_pos):
+            return
 
-            if self.character == 'dragon_m' or dragon_m_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(dragon_m_surf_y, dragon_m_rect_y)
-                dragon_m.selection_animate()
-            else:
-                self.screen.blit(dragon_m_surf_w, dragon_m_rect_w)
-                dragon_m.surf = dragon_m.stationary_image[0]
+        # blit the scrolling background and add the game title
+        state.scrolling_background(scroll=not state.idle_menus)
+        state.screen.blit(self.title_surf, self.title_rect)
+        for button in self.buttons:
+            button.draw(state.screen, button.hovered(mouse_pos))
 
-            if self.character == 'knight_f' or knight_f_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(knight_f_surf_y, knight_f_rect_y)
-                knight_f.selection_animate()
-            else:
-                self.screen.blit(knight_f_surf_w, knight_f_rect_w)
-                knight_f.surf = knight_f.stationary_image[0]
+        pygame.display.flip()
+        state.finish_startup()
+        state.pacer.tick()
 
-            if self.character == 'elf_f' or elf_f_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(elf_f_surf_y, elf_f_rect_y)
-                elf_f.selection_animate()
-            else:
-                self.screen.blit(elf_f_surf_w, elf_f_rect_w)
-                elf_f.surf = elf_f.stationary_image[0]
 
-            if self.character == 'wizard_f' or wizard_f_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(wizard_f_surf_y, wizard_f_rect_y)
-                wizard_f.selection_animate()
-            else:
-                self.screen.blit(wizard_f_surf_w, wizard_f_rect_w)
-                wizard_f.surf = wizard_f.stationary_image[0]
+class SelectionScene(Scene):
 
-            if self.character == 'dragon_f' or dragon_f_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(dragon_f_surf_y, dragon_f_rect_y)
-                dragon_f.selection_animate()
-            else:
-                self.screen.blit(dragon_f_surf_w, dragon_f_rect_w)
-                dragon_f.surf = dragon_f.stationary_image[0]
+    # difficulty choices: name, label and position in thirds of the screen width
+    difficulties = [('easy', 'Easy', 0.75), ('medium', 'Medium', 1.5), ('hard', 'Hard', 2.25)]
 
-            if self.character == 'pumpkin' or pumpkin_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(pumpkin_surf_y, pumpkin_rect_y)
-                pumpkin.selection_animate()
-            else:
-                self.screen.blit(pumpkin_surf_w, pumpkin_rect_w)
-                pumpkin.surf = pumpkin.stationary_image[0]
+    # character choices: name, label, position in fifths of the screen width and of the character and label in sixths
+    # of the screen height
+    characters = [('knight_m', 'Knight (m)', 1, 2.75, 2.9), ('elf_m', 'Elf (m)', 2, 2.75, 2.9),
+                  ('wizard_m', 'Wizard (m)', 3, 2.75, 2.9), ('dragon_m', 'Dragon (m)', 4, 2.75, 2.9),
+                  ('knight_f', 'Knight (f)', 1, 3.5, 3.65), ('elf_f', 'Elf (f)', 2, 3.5, 3.65),
+                  ('wizard_f', 'Wizard (f)', 3, 3.5, 3.65), ('dragon_f', 'Dragon (f)', 4, 3.5, 3.65),
+                  ('pumpkin', 'Pumpkin', 1.5, 4.25, 4.4), ('doc', 'Plague Doctor', 3.5, 4.25, 4.4)]
 
-            if self.character == 'doc' or doc_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(doc_surf_y, doc_rect_y)
-                doc.selection_animate()
-            else:
-                self.screen.blit(doc_surf_w, doc_rect_w)
-                doc.surf = doc.stationary_image[0]
+    def __init__(self, state: State):
+        super().__init__(state)
+        self.difficulty_surf, self.difficulty_rect = render_text(state.medium_font, 'Choose Your Difficulty',
+                                                                 x=screen_w//2, y=screen_h//6)
+        self.difficulty_buttons = {difficulty: Button(state, label, x=x*screen_w//3, y=1.5*screen_h//6)
+                                   for difficulty, label, x in self.difficulties}
 
-            if play_game_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(play_game_surf_y, play_game_rect_y)
-            else:
-                self.screen.blit(play_game_surf_w, play_game_rect_w)
+        self.character_surf, self.character_rect = render_text(state.medium_font, 'Choose Your Character',
+                                                               x=screen_w//2, y=2*screen_h//6)
+        self.character_buttons = {character: Button(state, label, x=x*screen_w//5, y=label_y*screen_h//6)
+                                  for character, label, x, y, label_y in self.characters}
 
-            if back_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(back_surf_y, back_rect_y)
-            else:
-                self.screen.blit(back_surf_w, back_rect_w)
-                
-            
-            # show error text if user hasn't selected a character and difficulty and presses start
-            if error:
-                self.screen.blit(error_surf, error_rect)
+        # the characters run in place while chosen or hovered, they only exist while the screen is open so the game
+        # can release the frames of the characters it does not use
+        self.players = {}
+        self.animated_at = 0  # time the characters were last drawn
 
-            for entity in sprites:
-                self.screen.blit(entity.surf, entity.rect)
+        self.play_game_button = Button(state, 'Play Game', x=screen_w//3, y=5*screen_h//6)
+        self.back_button = Button(state, 'Main Menu', x=2*screen_w//3, y=5*screen_h//6)
+        self.error_surf, self.error_rect = render_text(state.small_yellow_font, 'Select Your Character/Difficulty',
+                                                       x=screen_w//2, y=5.5*screen_h//6, color=(255, 0, 0))
+        self.error = False  # for preventing game start without a character and difficulty selection
+
+        buttons = [self.play_game_button, self.back_button]+list(self.difficulty_buttons.values())
+        self.idle = IdleScreen([button.rect for button in buttons+list(self.character_buttons.values())],
+                               pacer=state.pacer)
+
+    def enter(self) -> None:
+        self.players = {character: Player(x*screen_w//5, y*screen_h//6, character)
+                        for character, label, x, y, label_y in self.characters}
+        self.animated_at = time.perf_counter()
+        self.error = False
+        self.idle.changed = True
 
-            pygame.display.flip()
-            self.clock.tick(self.fps)
+    def exit(self) -> None:
+        self.players = {}
+
+    def frame(self) -> None:
 
-    def show_options(self, entities: list) -> None:
-    
         """
-        Options screen state of the game
-        entities: list of sprites to be blit to the screen, None will produce a scrolling background
+        Character selection screen of the game showing character options and difficulty
         """
-    
-        title_surf, title_rect = render_text(self.medium_font, 'Options', x=screen_w//2, y=2*screen_h//5)
-        plus_volume_surf_w, plus_volume_rect_w = render_text(self.small_font, '+', x=3.1*screen_w//5, y=2.5*screen_h//5)
-        plus_volume_surf_y, plus_volume_rect_y = render_text(self.small_yellow_font, '+', x=3.1*screen_w//5,
-                                                             y=2.5*screen_h//5, color=(255, 255, 0))
-        minus_volume_surf_w, minus_volume_rect_w = render_text(self.small_font, '-', x=3.2*screen_w//5,
-                                                               y=2.5*screen_h//5)
-        minus_volume_surf_y, minus_volume_rect_y = render_text(self.small_yellow_font, '-', x=3.2*screen_w//5,
-                                                               y=2.5*screen_h//5, color=(255, 255, 0))
-        back_surf_w, back_rect_w = render_text(self.small_font, 'Back', x=screen_w//2, y=3*screen_h//5)
-        back_surf_y, back_rect_y = render_text(self.small_yellow_font, 'Back', x=screen_w//2, y=3*screen_h//5,
-                                               color=(255, 255, 0))
-
-        while self.showing_options:
-            mouse_pos = pygame.mouse.get_pos()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.exit()
-
-                if back_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        if self.running:
-                            self.pause_game()
-                        else:
-                            self.go_to_title()
-
-                elif plus_volume_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        current_sound = sounds.fireball_sound.get_volume()
-                        if current_sound > 0.85:
-                            sounds.adjust_volume(1)
-                        else:
-                            sounds.adjust_volume(current_sound+0.1)
-
-                elif minus_volume_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        current_sound = sounds.fireball_sound.get_volume()
-                        if current_sound < 0.15:
-                            sounds.adjust_volume(0)
-                        else:
-                            sounds.adjust_volume(current_sound-0.1)
-
-            # create scrolling background if no sprites are passed to the function
-            if entities is None:
-                self.scrolling_background()
-            else:
-                self.screen.blit(entities[0], entities[1])
-            self.screen.blit(title_surf, title_rect)
 
-            if back_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(back_surf_y, back_rect_y)
-            else:
-                self.screen.blit(back_surf_w, back_rect_w)
+        state = self.state
 
-            if plus_volume_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(plus_volume_surf_y, plus_volume_rect_y)
-            else:
-                self.screen.blit(plus_volume_surf_w, plus_volume_rect_w)
+        # the screen only waits for input while no character is running in place
+        mouse_pos = pygame.mouse.get_pos()
+        self.idle.idle = (state.idle_menus and state.character is None and
+                          not any(button.hovered(mouse_pos) for button in self.character_buttons.values()))
+        events = self.idle.events()
+        mouse_pos = pygame.mouse.get_pos()
+
+        for event in events:
+            if event.type == pygame.QUIT:
+                state.exit()
+
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if self.play_game_button.hovered(mouse_pos):
 
-            if minus_volume_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(minus_volume_surf_y, minus_volume_rect_y)
+                    # check if selections have been made or show error message
+                    if state.difficulty is not None and state.character is not None:
+                        state.scenes.switch('game')
+                    else:
+                        self.error = True
+
+                elif self.back_button.hovered(mouse_pos):
+                    state.scenes.switch('title')
+
+                # choosing the current difficulty or character again clears the choice
+                for difficulty, button in self.difficulty_buttons.items():
+                    if button.hovered(mouse_pos):
+                        state.difficulty = difficulty if state.difficulty != difficulty else None
+                for character, button in self.character_buttons.items():
+                    if button.hovered(mouse_pos):
+                        state.character = character if state.character != character else None
+
+            if not self.active():
+                return
+
+        if not self.idle.needs_redraw(events, mouse_pos):
+            return
+
+        state.scrolling_background(scroll=not state.idle_menus)
+        state.screen.blit(self.difficulty_surf, self.difficulty_rect)
+        state.screen.blit(self.character_surf, self.character_rect)
+
+        # show yellow selection font if user mouse is hovering over a selection or blit default font
+        for difficulty, button in self.difficulty_buttons.items():
+            button.draw(state.screen, state.difficulty == difficulty or button.hovered(mouse_pos))
+
+        now = time.perf_counter()
+        dt = min(now-self.animated_at, max_menu_step)
+        self.animated_at = now
+        for character, button in self.character_buttons.items():
+            player = self.players[character]
+            if state.character == character or button.hovered(mouse_pos):
+                button.draw(state.screen, True)
+                player.selection_animate(dt)
             else:
-                self.screen.blit(minus_volume_surf_w, minus_volume_rect_w)
+                button.draw(state.screen, False)
+                player.surf = player.stationary_image[0]
 
-            volume_surf, volume_rect = render_text(self.small_font, 'Volume: {:<3.0f}'.format(100*round(sounds.fireball_sound.get_volume(), 1)),
-                                                   x=screen_w//2, y=2.5*screen_h//5)
-            self.screen.blit(volume_surf, volume_rect)
+        self.play_game_button.draw(state.screen, self.play_game_button.hovered(mouse_pos))
+        self.back_button.draw(state.screen, self.back_button.hovered(mouse_pos))
 
-            pygame.display.flip()
-            self.clock.tick(self.fps)
+        # show error text if user hasn't selected a character and difficulty and presses start
+        if self.error:
+            state.screen.blit(self.error_surf, self.error_rect)
 
-    def show_help(self, entities: list) -> None:
-    
-        """
-        Help screen state of the game
-        entities: list of sprites to be blit to the screen, None will produce a scrolling background
-        """
+        for player in self.players.values():
+            state.screen.blit(player.surf, player.rect)
 
-        controls_surf, controls_rect = render_text(self.medium_font, 'Controls', x=screen_w//2, y=screen_h//5)
-        jump_surf, jump_rect = render_text(self.small_font, '<ENTER> - Jump', x=screen_w//2, y=1.25*screen_h//5)
-        move_right_surf, move_right_rect = render_text(self.small_font, '<RIGHT ARROW or D Key> - Move Right',
-                                                       x=screen_w//2, y=1.5*screen_h//5)
-        move_left_surf, move_left_rect = render_text(self.small_font, '<LEFT ARROW or A Key> - Move Left',
-                                                     x=screen_w//2, y=1.75 * screen_h//5)
-        shoot_surf, shoot_rect = render_text(self.small_font, '<MOUSE CLICK> - Shoot Fireball', x=screen_w//2,
-                                             y=2*screen_h//5)
-
-        tips_surf, tips_rect = render_text(self.medium_font, 'Help', x=screen_w//2, y=2.5*screen_h//5)
-
-        lives_surf, lives_rect = render_text(self.small_font, 'Collect          to gain extra lives when hit by an enemy fireball!',
-                                             x=screen_w//2, y=2.75*screen_h//5)
-        jumps_surf, jumps_rect = render_text(self.small_font, 'Collect          to gain extra jumps to use in the air!',
-                                             x=screen_w//2, y=3*screen_h//5)
-        fireballs_surf, fireballs_rect = render_text(self.small_font, 'Collect          to gain fireballs to shoot at enemies!',
-                                                     x=screen_w//2, y=3.25*screen_h//5)
-        sprite_surfs = [controls_surf, jump_surf, move_right_surf, move_left_surf, shoot_surf, tips_surf, lives_surf, jumps_surf, fireballs_surf]
-        sprite_rects = [controls_rect, jump_rect, move_right_rect, move_left_rect, shoot_rect, tips_rect, lives_rect, jumps_rect, fireballs_rect]
-
-        marker_sprites = pygame.sprite.Group()
-        lives_marker = Powerup(screen_w//2-160, 2.75*screen_h//5+10, 'lives')
-        d_jump_marker = Powerup(screen_w//2-110, 3*screen_h//5+10, 'double_jump')
-        fireball_marker = Powerup(screen_w//2-110, 3.25*screen_h//5+10, 'fireball')
-        marker_sprites.add([lives_marker, d_jump_marker, fireball_marker])
-
-        back_surf_w, back_rect_w = render_text(self.small_font, 'Back', x=screen_w//2, y=4*screen_h//5)
-        back_surf_y, back_rect_y = render_text(self.small_yellow_font, 'Back', x=screen_w//2, y=4*screen_h//5,
-                                               color=(255, 255, 0))
-
-        while self.showing_help:
-            mouse_pos = pygame.mouse.get_pos()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.exit()
-
-                if back_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        if self.running:
-                            self.pause_game()
-                        else:
-                            self.go_to_title()
-
-            if entities is None:
-                self.scrolling_background()
-            else:
-                self.screen.blit(entities[0], entities[1])
+        pygame.display.flip()
+        state.pacer.tick()
 
-            for surf, rect in zip(sprite_surfs, sprite_rects):
-                self.screen.blit(surf, rect)
 
-            for entity in marker_sprites:
-                self.screen.blit(entity.surf, entity.rect)
+class OptionsScene(Scene):
 
-            if back_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(back_surf_y, back_rect_y)
-            else:
-                self.screen.blit(back_surf_w, back_rect_w)
+    def __init__(self, state: State):
+        super().__init__(state)
+        self.title_surf, self.title_rect = render_text(state.medium_font, 'Options', x=screen_w//2, y=2*screen_h//5)
+        self.plus_volume_button = Button(state, '+', x=3.1*screen_w//5, y=2.5*screen_h//5)
+        self.minus_volume_button = Button(state, '-', x=3.2*screen_w//5, y=2.5*screen_h//5)
+        self.back_button = Button(state, 'Back', x=screen_w//2, y=3*screen_h//5)
+        self.buttons = [self.back_button, self.plus_volume_button, self.minus_volume_button]
+        self.idle = IdleScreen([button.rect for button in self.buttons], pacer=state.pacer)
+        self.background = None
 
-            pygame.display.flip()
-            self.clock.tick(self.fps)
+    def enter(self, background=None) -> None:
 
-    def show_leaderboard(self) -> None:
-    
         """
-        Leaderboard screen state of the game
+        background: image shown behind the options, None for the scrolling background
         """
-    
-        title_surf, title_rect = render_text(self.medium_font, 'Leaderboards', x=screen_w//2, y=screen_h//4)
-        leaderboards = []
-        text_y = screen_h//4+35
-        i = 0
-        for entry in self.leaderboard[:10]:
-            i += 1
-            text_y += 25
-            text = '{}.  '.format(i)+' '.join(map(str, entry))
-            leaderboards.append(render_text(self.small_font, text, x=screen_w//2, y=text_y))
-        play_game_surf_w, play_game_rect_w = render_text(self.small_font, 'Play Game', x=screen_w//3,
-                                                         y=leaderboards[-1][1].bottom+50)
-        play_game_surf_y, play_game_rect_y = render_text(self.small_yellow_font, 'Play Game', x=screen_w//3,
-                                                         y=leaderboards[-1][1].bottom+50, color=(255, 255, 0))
-        back_surf_w, back_rect_w = render_text(self.small_font, 'Main Menu', x=2*screen_w//3,
-                                               y=leaderboards[-1][1].bottom+50)
-        back_surf_y, back_rect_y = render_text(self.small_yellow_font, 'Main Menu', x=2*screen_w//3,
-                                               y=leaderboards[-1][1].bottom+50, color=(255, 255, 0))
-
-        while self.showing_leaderboard:
-            mouse_pos = pygame.mouse.get_pos()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.exit()
-
-                if play_game_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        self.go_to_character_selection()
-
-                if back_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        self.go_to_title()
-
-            self.scrolling_background()
-            self.screen.blit(title_surf, title_rect)
-
-            if play_game_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(play_game_surf_y, play_game_rect_y)
-            else:
-                self.screen.blit(play_game_surf_w, play_game_rect_w)
 
-            if back_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(back_surf_y, back_rect_y)
-            else:
-                self.screen.blit(back_surf_w, back_rect_w)
+        self.background = background
+        self.idle.idle = self.state.idle_menus or background is not None
+        self.idle.changed = True
 
-            for entity in leaderboards:
-                self.screen.blit(entity[0], entity[1])
+    def frame(self) -> None:
 
-            pygame.display.flip()
-            self.clock.tick(self.fps)
-
-    def show_pause_screen(self) -> None:
-    
         """
-        Pause screen state of the game
+        Options screen of the game
         """
-    
-        title_surf, title_rect = render_text(self.medium_font, 'Paused', x=screen_w//2, y=2*screen_w//5)
-        resume_surf_w, resume_rect_w = render_text(self.small_font, 'Resume', x=screen_w//2, y=2.5*screen_w//5)
-        resume_surf_y, resume_rect_y = render_text(self.small_yellow_font, 'Resume', x=screen_w//2, y=2.5*screen_w//5,
-                                                   color=(255, 255, 0))
-        options_surf_w, options_rect_w = render_text(self.small_font, 'Options', x=screen_w//2, y=3*screen_w//5)
-        options_surf_y, options_rect_y = render_text(self.small_yellow_font, 'Options', x=screen_w//2, y=3*screen_w//5,
-                                                     color=(255, 255, 0))
-        help_surf_w, help_rect_w = render_text(self.small_font, 'Help', x=screen_w//2, y=3.5*screen_w//5)
-        help_surf_y, help_rect_y = render_text(self.small_yellow_font, 'Help', x=screen_w//2, y=3.5*screen_w//5,
-                                               color=(255, 255, 0))
-        menu_surf_w, menu_rect_w = render_text(self.small_font, 'Main Menu', x=screen_w//2, y=4*screen_w//5)
-        menu_surf_y, menu_rect_y = render_text(self.small_yellow_font, 'Main Menu', x=screen_w//2, y=4*screen_w//5,
-                                               color=(255, 255, 0))
-        box_surf = self.screen.subsurface((0, 0, screen_w, screen_h)).copy()
-        box_rect = box_surf.get_rect()
-
-        while self.paused:
-            mouse_pos = pygame.mouse.get_pos()
-
-            for event in pygame.event.get():
-                if event.type == KEYDOWN:
-                    if event.key == K_ESCAPE:
-                        self.go_to_game()
-
-                if event.type == pygame.QUIT:
-                    self.exit()
-
-                if resume_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        self.go_to_game()
-
-                if options_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        self.go_to_options()
-                        self.show_options([box_surf, box_rect])
-
-                if help_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        self.go_to_help()
-                        self.show_help([box_surf, box_rect])
-
-                if menu_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        self.go_to_title()
-
-            self.screen.blit(box_surf, box_rect)
-            self.screen.blit(title_surf, title_rect)
-
-            if resume_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(resume_surf_y, resume_rect_y)
-            else:
-                self.screen.blit(resume_surf_w, resume_rect_w)
 
-            if options_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(options_surf_y, options_rect_y)
-            else:
-                self.screen.blit(options_surf_w, options_rect_w)
+        state = self.state
+        events = self.idle.events()
+        mouse_pos = pygame.mouse.get_pos()
 
-            if help_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(help_surf_y, help_rect_y)
-            else:
-                self.screen.blit(help_surf_w, help_rect_w)
+        for event in events:
+            if event.type == pygame.QUIT:
+                state.exit()
 
-            if menu_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(menu_surf_y, menu_rect_y)
-            else:
-                self.screen.blit(menu_surf_w, menu_rect_w)
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if self.back_button.hovered(mouse_pos):
+                    state.scenes.pop()
 
-            pygame.display.flip()
-            self.clock.tick(self.fps)
+                elif self.plus_volume_button.hovered(mouse_pos):
+                    current_sound = state.sounds.volume
+                    if current_sound > 0.85:
+                        state.sounds.adjust_volume(1)
+                    else:
+                        state.sounds.adjust_volume(current_sound+0.1)
 
-    def show_death_screen(self):
-    
-        """
-        Player death screen state of the game
-        """
+                elif self.minus_volume_button.hovered(mouse_pos):
+                    current_sound = state.sounds.volume
+                    if current_sound < 0.15:
+                        state.sounds.adjust_volume(0)
+                    else:
+                        state.sounds.adjust_volume(current_sound-0.1)
 
-        title_surf, title_rect = render_text(self.medium_font, 'You Died!', x=screen_w//2, y=screen_h//5)
-        restart_surf_w, restart_rect_w = render_text(self.small_font, 'Restart', x=screen_w//2, y=2*screen_h//5)
-        restart_surf_y, restart_rect_y = render_text(self.small_yellow_font, 'Restart', x=screen_w//2, y=2*screen_h//5,
-                                                     color=(255, 255, 0))
-        selection_surf_w, selection_rect_w = render_text(self.small_font, 'Change Character/Difficulty', x=screen_w//2,
-                                                         y=2.5*screen_h//5)
-        selection_surf_y, selection_rect_y = render_text(self.small_yellow_font, 'Change Character/Difficulty', x=screen_w//2,
-                                                         y=2.5*screen_h//5, color=(255, 255, 0))
-        menu_surf_w, menu_rect_w = render_text(self.small_font, 'Main Menu', x=screen_w//2, y=3*screen_h//5)
-        menu_surf_y, menu_rect_y = render_text(self.small_yellow_font, 'Main Menu', x=screen_w//2, y=3*screen_h//5,
-                                               color=(255, 255, 0))
-
-        highscore = self.new_highscore()
-        name = ''
-        if highscore:
-            highscore_surf, highscore_rect = render_text(self.small_font, 'New Highscore: {}'.format(self.score),
-                                                         x=screen_w//2, y=3.5*screen_h//5)
-            enter_surf, enter_rect = render_text(self.small_font, 'Press ENTER to save player name', x=screen_w//2,
-                                                 y=4*screen_h//5)
+            if not self.active():
+                return
+
+        if not self.idle.needs_redraw(events, mouse_pos):
+            return
+
+        if self.background is None:
+            state.scrolling_background(scroll=not state.idle_menus)
         else:
-            highscore_surf = None
-            highscore_rect = None
-            enter_surf = None
-            enter_rect = None
-
-        while self.showing_death:
-            mouse_pos = pygame.mouse.get_pos()
-
-            for event in pygame.event.get():
-            
-                # for typing name for highscore
-                if event.type == KEYDOWN and highscore:
-                    if event.key == K_BACKSPACE:
-                        name = name[:-1]
-                    elif event.key == K_RETURN:
-                        self.update_leaderboard(name)
-                        self.go_to_leaderboard()
-                    else:
-                        name += event.unicode
+            state.screen.blit(self.background, (0, 0))
+        state.screen.blit(self.title_surf, self.title_rect)
 
-                if event.type == pygame.QUIT:
-                    self.exit()
+        for button in self.buttons:
+            button.draw(state.screen, button.hovered(mouse_pos))
 
-                if restart_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        self.go_to_game()
+        volume_surf, volume_rect = render_text(state.small_font,
+                                               'Volume: {:<3.0f}'.format(100*round(state.sounds.volume, 1)),
+                                               x=screen_w//2, y=2.5*screen_h//5)
+        state.screen.blit(volume_surf, volume_rect)
 
-                if selection_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        self.go_to_character_selection()
+        pygame.display.flip()
+        state.pacer.tick()
 
-                if menu_rect_w.collidepoint(mouse_pos):
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        self.go_to_title()
 
-            self.scrolling_background()
-            self.screen.blit(title_surf, title_rect)
+class HelpScene(Scene):
 
-            if restart_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(restart_surf_y, restart_rect_y)
-            else:
-                self.screen.blit(restart_surf_w, restart_rect_w)
+    # lines of the help screen: font, text and position in fifths of the screen height
+    lines = [('medium', 'Controls', 1), ('small', '<ENTER> - Jump', 1.25),
+             ('small', '<RIGHT ARROW or D Key> - Move Right', 1.5),
+             ('small', '<LEFT ARROW or A Key> - Move Left', 1.75),
+             ('small', '<MOUSE CLICK> - Shoot Fireball', 2),
+             ('medium', 'Help', 2.5),
+             ('small', 'Collect          to gain extra lives when hit by an enemy fireball!', 2.75),
+             ('small', 'Collect          to gain extra jumps to use in the air!', 3),
+             ('small', 'Collect          to gain fireballs to shoot at enemies!', 3.25)]
 
-            if selection_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(selection_surf_y, selection_rect_y)
-            else:
-                self.screen.blit(selection_surf_w, selection_rect_w)
+    def __init__(self, state: State):
+        super().__init__(state)
+        fonts = {'medium': state.medium_font, 'small': state.small_font}
+        self.texts = [render_text(fonts[font], text, x=screen_w//2, y=y*screen_h//5) for font, text, y in self.lines]
 
-            if menu_rect_w.collidepoint(mouse_pos):
-                self.screen.blit(menu_surf_y, menu_rect_y)
-            else:
-                self.screen.blit(menu_surf_w, menu_rect_w)
+        # powerups drawn in the gaps of the help text
+        self.markers = [Powerup(screen_w//2-160, 2.75*screen_h//5+10, 'lives'),
+                        Powerup(screen_w//2-110, 3*screen_h//5+10, 'double_jump'),
+                        Powerup(screen_w//2-110, 3.25*screen_h//5+10, 'fireball')]
 
-            if highscore_surf is not None:
-                name_surf, name_rect = render_text(self.small_font, 'Enter Your Name: {}'.format(name), x=screen_w//2,
-                                                   y=3.75*screen_h//5)
-                self.screen.blit(highscore_surf, highscore_rect)
-                self.screen.blit(name_surf, name_rect)
-                self.screen.blit(enter_surf, enter_rect)
+        self.back_button = Button(state, 'Back', x=screen_w//2, y=4*screen_h//5)
+        self.idle = IdleScreen([self.back_button.rect], pacer=state.pacer)
+        self.background = None
 
-            pygame.display.flip()
-            self.clock.tick(self.fps)
-        self.highscore = False
+    def enter(self, background=None) -> None:
 
-    # functions for managing game states
-    def go_to_title(self) -> None:
-    
-        """
-        Change game state to show title screen
-        """
-    
-        self.showing_title = True
-        self.showing_selection = False
-        self.showing_leaderboard = False
-        self.showing_options = False
-        self.showing_help = False
-        self.running = False
-        self.paused = False
-        self.showing_death = False
-
-    def go_to_character_selection(self) -> None:
-    
         """
-        Change game state to show character selection screen
+        background: image shown behind the help, None for the scrolling background
         """
-    
-        self.showing_selection = True
-        self.showing_title = False
-        self.showing_leaderboard = False
-        self.running = False
-        self.showing_death = False
 
-    def go_to_leaderboard(self) -> None:
-    
-        """
-        Change game state to show leaderboards screen
-        """
-    
-        self.showing_leaderboard = True
-        self.showing_title = False
-        self.showing_death = False
+        self.background = background
+        self.idle.idle = self.state.idle_menus or background is not None
+        self.idle.changed = True
+
+    def frame(self) -> None:
 
-    def go_to_options(self) -> None:
-    
         """
-        Change game state to show options screen
+        Help screen of the game
         """
 
-        self.showing_options = True
-        self.showing_title = False
-        self.paused = False
+        state = self.state
+        events = self.idle.events()
+        mouse_pos = pygame.mouse.get_pos()
 
-    def go_to_help(self) -> None:
-    
-        """
-        Change game state to show help screen
-        """
-    
-        self.showing_help = True
-        self.showing_title = False
-        self.paused = False
+        for event in events:
+            if event.type == pygame.QUIT:
+                state.exit()
 
-    def go_to_game(self) -> None:
-    
-        """
-        Change game state to running
-        """
-    
-        self.running = True
-        self.showing_title = False
-        self.showing_selection = False
-        self.paused = False
-        self.showing_death = False
+            if event.type == pygame.MOUSEBUTTONDOWN and self.back_button.hovered(mouse_pos):
+                state.scenes.pop()
 
-    def pause_game(self) -> None:
-    
-        """
-        Change game state to paused
-        """
-    
-        self.paused = True
-        self.showing_help = False
-        self.showing_options = False
+            if not self.active():
+                return
 
-    def go_to_death_screen(self) -> None:
-    
-        """
-        Change game state to show death screen
-        """
+        if not self.idle.needs_redraw(events, mouse_pos):
+            return
 
-        self.showing_death = True
-        self.running = False
+        if self.background is None:
+            state.scrolling_background(scroll=not state.idle_menus)
+        else:
+            state.screen.blit(self.background, (0, 0))
 
-    def exit(self) -> None:
-    
-        """
-        Exit all states and the application
-        """
-    
-        self.showing_death = False
-        self.running = False
-        self.showing_title = False
-        self.showing_selection = False
-        self.showing_leaderboard = False
-        self.showing_help = False
-        self.paused = False
-        self.showing_options = False
-        pygame.display.quit()
-        pygame.quit()
-        sys.exit()
+        for surf, rect in self.texts:
+            state.screen.blit(surf, rect)
 
-    def new_highscore(self) -> bool:
-    
-        """
-        Returns a boolean value indicating whether the player has achieved a top 10 score
-        """
-    
-        self.leaderboard.append(['temp', self.score])
-        self.leaderboard = sorted(self.leaderboard, reverse=True, key=lambda x: x[1])
-        return ['temp', self.score] in self.leaderboard[:10]
+        for entity in self.markers:
+            state.screen.blit(entity.surf, entity.rect)
 
-    def update_leaderboard(self, name) -> None:
-    
-        """
-        Updates the leaderboard text file
-        name: player name for storing score
-        """
-    
-        self.leaderboard[self.leaderboard.index(['temp', self.score])][0] = name
-        entry_text = [' '.join(map(str, entry)) for entry in self.leaderboard[:10]]
-        open('leaderboard.txt', 'w').write('\n'.join(entry_text))
+        self.back_button.draw(state.screen, self.back_button.hovered(mouse_pos))
 
-    def scrolling_background(self) -> None:
-        
-        """
-        Shifts the background images by one pixel per frame
-        """
-    
-        self.background1.rect.top += 1
-        self.background2.rect.top += 1
-        self.background1.check_background()
-        self.background2.check_background()
-        self.screen.blit(self.background1.surf, self.background1.rect)
-        self.screen.blit(self.background2.surf, self.background2.rect)
-
-
-class Player(pygame.sprite.Sprite):
-
-    def __init__(self, x, y, name):
-        super().__init__()
-        self.name = name
-        self.v_x = 5
-        self.v_y = 8.5
-        self.g = 6
-        self.time = 0
-        self.dt = 0.135
-        self.on_platform = True
-        self.is_jumping = False
-        self.is_falling = False
-        self.face_right = True
-        self.is_stationary = True
-        self.powerups = {'lives': 1, 'double_jump': 0, 'fireball': 0}
-        self.projectile = None
-        self.frame = 0
-
-        if name == 'knight_m':
-            self.run_right = frames.knight_m_run_right_img
-            self.run_left = frames.knight_m_run_left_img
-            self.jump_image = frames.knight_m_jump_img
-            self.stationary_image = frames.knight_m_idle_img
-        elif name == 'elf_m':
-            self.run_right = frames.elf_m_run_right_img
-            self.run_left = frames.elf_m_run_left_img
-            self.jump_image = frames.elf_m_jump_img
-            self.stationary_image = frames.elf_m_idle_img
-        elif name == 'wizard_m':
-            self.run_right = frames.wizard_m_run_right_img
-            self.run_left = frames.wizard_m_run_left_img
-            self.jump_image = frames.wizard_m_jump_img
-            self.stationary_image = frames.wizard_m_idle_img
-        elif name == 'dragon_m':
-            self.run_right = frames.dragon_m_run_right_img
-            self.run_left = frames.dragon_m_run_left_img
-            self.jump_image = frames.dragon_m_jump_img
-            self.stationary_image = frames.dragon_m_idle_img
-        elif name == 'knight_f':
-            self.run_right = frames.knight_f_run_right_img
-            self.run_left = frames.knight_f_run_left_img
-            self.jump_image = frames.knight_f_jump_img
-            self.stationary_image = frames.knight_f_idle_img
-        elif name == 'elf_f':
-            self.run_right = frames.elf_f_run_right_img
-            self.run_left = frames.elf_f_run_left_img
-            self.jump_image = frames.elf_f_jump_img
-            self.stationary_image = frames.elf_f_idle_img
-        elif name == 'wizard_f':
-            self.run_right = frames.wizard_f_run_right_img
-            self.run_left = frames.wizard_f_run_left_img
-            self.jump_image = frames.wizard_f_jump_img
-            self.stationary_image = frames.wizard_f_idle_img
-        elif name == 'dragon_f':
-            self.run_right = frames.dragon_f_run_right_img
-            self.run_left = frames.dragon_f_run_left_img
-            self.jump_image = frames.dragon_f_jump_img
-            self.stationary_image = frames.dragon_f_idle_img
-        elif name == 'pumpkin':
-            self.run_right = frames.pumpkin_run_right_img
-            self.run_left = frames.pumpkin_run_left_img
-            self.jump_image = frames.pumpkin_jump_img
-            self.stationary_image = frames.pumpkin_idle_img
-        elif name == 'doc':
-            self.run_right = frames.doc_run_right_img
-            self.run_left = frames.doc_run_left_img
-            self.jump_image = frames.doc_jump_img
-            self.stationary_image = frames.doc_idle_img
-        self.surf = self.stationary_image[0]
-        self.w, self.h = self.surf.get_size()
-        self.rect = self.surf.get_rect()
-        self.rect.center = (round(x), 0)
-        self.rect.bottom = round(y)
-
-    def move(self, pressed_keys: list, dynamic_sprites: pygame.sprite.Group) -> None:
-    
-        """
-        Moves the dynamic_sprites group vertically the calculated distance each frame according to projectile motion equations
-        Moves the player horizontally according to key press
-        pressed_keys: list of keys pressed
-        dynamic_sprites: group of sprites to be moved vertically
-        """
+        pygame.display.flip()
+        state.pacer.tick()
 
-        if pressed_keys[K_LEFT] or pressed_keys[K_a]:
-            self.rect.move_ip((-self.v_x, 0))
-            self.face_right = False
-            self.frame += 1
-            self.is_stationary = False
-            if self.rect.center[0] < 0:
-                self.rect.right = screen_w+self.w//2
-        elif pressed_keys[K_RIGHT] or pressed_keys[K_d]:
-            self.rect.move_ip((self.v_x, 0))
-            self.face_right = True
-            self.frame += 1
-            self.is_stationary = False
-            if self.rect.center[0] > screen_w:
-                self.rect.left = -self.w//2
-        else:
-            self.frame = 0
-            self.is_stationary = True
-
-        dy = 0
-        if self.is_jumping:
-            self.time += self.dt
-            dy = round(self.v_y*self.time-0.5*self.g*self.time ** 2)  # projectile motion equation dy = v_y*t - 0.5*g*t**2
-        elif self.is_falling:
-            self.time += self.dt
-            dy = round(-0.5*self.g*self.time ** 2)  # projectile motion equation dy = - 0.5*g*t**2
-        if dy < -1.6*self.v_y:
-            dy = -14
-        if dy != 0:
-            for sprite in dynamic_sprites:
-                sprite.rect.move_ip((0, dy))
-
-    def touches(self, enemy: pygame.sprite.Sprite) -> bool:
-    
-        """
-        enemy: sprite object to be checked for a collision with player
-        Return truth value of collision
-        """
-    
-        return self.rect.colliderect(enemy.rect)
 
-    def falls_below(self, platform: pygame.sprite.Sprite) -> bool:
-    
-        """
-        platform: sprite object to compare height with player
-        Return true if player is below the platform
-        """
-    
-        if self.rect.top > platform.rect.bottom:
-            self.rect.move_ip((0, 5))
-            if self.rect.top >= screen_h:
-                return True
-        return False
+class LeaderboardScene(Scene):
 
-    def lands_on(self, platform: pygame.sprite.Sprite, last_top_pos: int, dynamic_sprites: pygame.sprite.Group) -> bool:
-    
-        """
-        platform: sprite object to check if player landed on
-        last_top_pos: int value of previous frame top position of platform
-        dynamic_sprites: group of sprites to shift vertically if needed to prevent issues with rounding
-        Return true if player lands on the given platform
-        Shifts all dynamic sprites to avoid rounding errors
-        """
-    
-        if not self.on_platform and (self.rect.left <= platform.rect.right) and (self.rect.right >= platform.rect.left):
-            if platform.rect.top <= self.rect.bottom <= last_top_pos:
-                dy = round(platform.rect.top-self.rect.bottom)
-                
-                # handling rounding errors
-                for sprite in dynamic_sprites:
-                    sprite.rect.move_ip((0, -dy))
-                self.on_platform = True
-                self.is_jumping = False
-                self.is_falling = False
-                self.time = 0
-                return True
-        return False
-
-    def falls_off(self, platform: pygame.sprite.Sprite) -> bool:
-    
-        """
-        platform: sprite object to check if player fell off
-        Returns boolean indicating if player moved off a platform without jumping
-        """
-     
-        if (self.rect.left > platform.rect.right) or (self.rect.right < platform.rect.left):
-            if self.rect.bottom == platform.rect.top:
-                self.on_platform = False
-                self.is_falling = True
-                return True
-        return False
-
-    def consumes(self, powerup: pygame.sprite.Sprite) -> None:
-    
-        """
-        powerup: powerup to add to player inventory
-        """
-    
-        self.powerups[powerup.name] += 1
+    def __init__(self, state: State):
+        super().__init__(state)
+        self.title_surf, self.title_rect = render_text(state.medium_font, 'Leaderboards', x=screen_w//2, y=screen_h//4)
+        self.entries = None  # entries the rows were rendered for
+        self.rows = []
+        self.play_game_button = None
+        self.back_button = None
+        self.idle = IdleScreen([], pacer=state.pacer)
 
-    def animate(self) -> None:
-    
-        """
-        For handling player animations
-        """
-    
-        if self.face_right:
-            if self.is_jumping or self.is_falling:
-                self.surf = self.jump_image[0]
-            elif self.is_stationary:
-                self.surf = self.stationary_image[0]
-            else:
-                self.surf = self.run_right[self.frame//5 % 4]
-        else:
-            if self.is_jumping or self.is_falling:
-                self.surf = self.jump_image[1]
-            elif self.is_stationary:
-                self.surf = self.stationary_image[1]
-            else:
-                self.surf = self.run_left[self.frame//5 % 4]
+    def enter(self) -> None:
 
-    def selection_animate(self) -> None:
-    
         """
-        For handling animations in the character selection screen
+        Shows the latest scores
         """
-    
-        self.surf = self.run_right[self.frame//5 % 4]
-        self.frame += 1
 
-    def create_projectile(self, pos, dynamic_sprites: pygame.sprite.Group) -> None:
-    
+        state = self.state
+        state.scores.refresh()  # scores saved by other games sharing the leaderboard show up once reloaded
+        self.update()
+        self.idle.idle = state.idle_menus
+        self.idle.changed = True
+
+    def update(self) -> None:
+
         """
-        Create fireball upon mouse click
-        pos: mouse position when clicked to create the projectile
-        dynamic_sprites: sprite group to add the projectile to
+        Lays out the rows and buttons again if the scores changed, they are loaded and reloaded in the background
         """
-    
-        v = pygame.math.Vector2()
-        v.xy = (pos[0]-self.rect.center[0]) / 40, (pos[1]-self.rect.center[1]) / 40
-        norm = v.length()
-        if norm < 6:
-            v = v*6 / norm
-        self.projectile = Projectile(self.rect.center, round(v[0]), round(v[1]))
-        dynamic_sprites.add(self.projectile)
-        pygame.mixer.Sound.play(sounds.fireball_sound)
-
-    def remove_projectile(self) -> None:
-    
+
+        state = self.state
+        state.leaderboard = state.scores.top_scores()
+        entries = state.leaderboard.entries()
+        if entries == self.entries:
+            return
+        self.entries = entries
+        self.rows = []
+        text_y = screen_h//4+35
+        for i, entry in enumerate(entries):
+            text_y += 25
+            text = '{}.  '.format(i+1)+' '.join(map(str, entry))
+            self.rows.append(render_text(state.small_font, text, x=screen_w//2, y=text_y))
+        bottom = self.rows[-1][1].bottom if self.rows else text_y
+        self.play_game_button = Button(state, 'Play Game', x=screen_w//3, y=bottom+50)
+        self.back_button = Button(state, 'Main Menu', x=2*screen_w//3, y=bottom+50)
+        self.idle.buttons = [self.play_game_button.rect, self.back_button.rect]
+        self.idle.changed = True
+
+    def frame(self) -> None:
+
         """
-        Remove projectile from associated objects
+        Leaderboard screen of the game
         """
-    
-        self.projectile.kill()
-        self.projectile = None
 
+        state = self.state
+        events = self.idle.events()
+        mouse_pos = pygame.mouse.get_pos()
 
-class Platform(pygame.sprite.Sprite):
+        for event in events:
+            if event.type == pygame.QUIT:
+                state.exit()
 
-    def __init__(self, pos):
-        super().__init__()
-        self.lastYPos = 0
-        self.enemy = None
-        self.powerup = None
-        self.projectile = None
-        self.surf = frames.platform_img
-        self.w, self.h = self.surf.get_size()
-        self.rect = self.surf.get_rect()
-        self.rect.center = self.create_platform(pos)
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if self.play_game_button.hovered(mouse_pos):
+                    state.scenes.switch('selection')
+                elif self.back_button.hovered(mouse_pos):
+                    state.scenes.switch('title')
+
+            if not self.active():
+                return
+
+        self.update()
+        if not self.idle.needs_redraw(events, mouse_pos):
+            return
+
+        state.scrolling_background(scroll=not state.idle_menus)
+        state.screen.blit(self.title_surf, self.title_rect)
+        self.play_game_button.draw(state.screen, self.play_game_button.hovered(mouse_pos))
+        self.back_button.draw(state.screen, self.back_button.hovered(mouse_pos))
+        for surf, rect in self.rows:
+            state.screen.blit(surf, rect)
+
+        pygame.display.flip()
+        state.pacer.tick()
+
+
+class GameScene(Scene):
+
+    def enter(self) -> None:
 
-    def create_platform(self, pos: tuple) -> tuple:
-    
-        """
-        Create a new platform using some random number generation and previous coordinates
-        pos: tuple containing position of other platform to use as a basis for new platform coordinates
-        Return a tuple containing position of next platform
-        """
-    
-        x_i = pos[0]
-        y_i = pos[1]
-        v_x = 5
-        v_y = 8.5
-        y_max = v_y ** 2  # 12*(v_y**2)/(2*G)
-        x_max = 4*v_x*v_y  # 24*v_x*v_y/G
-        
-        
-        # randomly generate new platform position
-        x = x_i+rnd.uniform(-x_max, x_max)
-        y = y_i-rnd.uniform(0.8*y_max, y_max)
-
-        # check if new position is valid in the game frame
-        if x <= self.w:
-            x = x_i+rnd.uniform(0.5*x_max, x_max)
-        elif x >= screen_w-self.w:
-            x = x_i-rnd.uniform(0.5*x_max, x_max)
-        if (x-x_i < 0.5*x_max) and (x-x_i > 0):
-            x = x_i+rnd.uniform(0.5*x_max, x_max)
-        if (x-x_i > -0.5*x_max) and (x-x_i < 0):
-            x = x_i-rnd.uniform(0.5*x_max, x_max)
-        if x < self.w//2:
-            x = self.w//2
-        if x > screen_w-self.w//2:
-            x = screen_w-self.w//2
-        return round(x), round(y)
-
-    def create_enemy(self, dynamic_sprites: pygame.sprite.Group, speed: int) -> None:
-    
         """
-        Create a new enemy sprite and add to dynamic sprite group
-        dynamic_sprites: sprite group to add enemy to
-        speed: speed of the enemy
+        Starts a new game with the chosen character and difficulty
         """
-    
-        self.enemy = Enemy(self.rect.center[0], self.rect.top, speed)
-        dynamic_sprites.add(self.enemy)
 
-    def create_powerup(self, dynamic_sprites: pygame.sprite.Group) -> None:
-    
+        import replay
+        from simulation import Simulation
+
+        state = self.state
+
+        # only the chosen character's frames stay loaded during the game
+        frames.release_characters(keep=state.character)
+
+        self.sim = Simulation(state.difficulty, state.character)
+        self.sim.profiler = state.profiler
+        self.recording = replay.Recording(self.sim.seed, state.difficulty, state.character)
+
+        # draws the running game, markers and interface text
+        self.view = GameView(state, self.sim)
+
+        state.score = 0
+
+        # the game rules advance in fixed steps, rendering interpolates between the last two steps
+        self.step_time = 1/state.tick_rate
+        self.accumulator = 0
+        self.last_time = time.perf_counter()
+        self.previous = self.sim.positions()
+        self.previous_camera = self.sim.camera.y
+
+        self.jump = False
+        self.fire = None
+        state.profiler.discard_frame()
+        state.pacer.reset()  # the menus before the game are not counted in the frame times
+
+    def resume(self) -> None:
+
         """
-        Create a new powerup sprite and add to dynamic sprite group
-        dynamic_sprites: sprite group to add powerup to
+        Continues the game after the pause screen
         """
-    
-        num = rnd.randint(0, 6)
-        if num == 0:
-            self.powerup = Powerup(self.rect.center[0], self.rect.top, 'lives')
-        elif num in [1, 2, 3]:
-            self.powerup = Powerup(self.rect.center[0], self.rect.top, 'double_jump')
-        elif num in [4, 5, 6]:
-            self.powerup = Powerup(self.rect.center[0], self.rect.top, 'fireball')
-        dynamic_sprites.add(self.powerup)
-
-    def create_projectile(self, v_y: int, dynamic_sprites: pygame.sprite.Group) -> None:
-    
+
+        self.last_time = time.perf_counter()  # time spent paused is not simulated
+        self.view.invalidate()
+        self.state.profiler.discard_frame()
+        self.state.pacer.reset()  # neither is the pause
+
+    def frame(self) -> None:
+
         """
-        Create a new projectile sprite and add to dynamic sprite group
-        v_y: vertical speed of the projectile
-        dynamic_sprites: sprite group to add projectile to
+        Handles the events of one frame of the running game, steps the game rules and draws the frame
         """
-    
-        self.projectile = Projectile(self.enemy.rect.center, 0, v_y)
-        dynamic_sprites.add(self.projectile)
-        pygame.mixer.Sound.play(sounds.fireball_sound)
 
-    def remove_platform(self, platforms: list) -> None:
-    
-        """
-        Remove first (lowest on screen) platform in the platforms list
-        platforms: list of all active platforms
+        from simulation import Inputs
+
+        state = self.state
+        sim = self.sim
+        profiler = state.profiler
+        profiler.begin('events')
+        for event in pygame.event.get():
+
+            if event.type == KEYDOWN:
+
+                if event.key == K_ESCAPE:
+                    state.scenes.push('pause')
+                    return
+
+                if event.key == K_SPACE:
+                    self.jump = True
+
+                # profiler overlay and trace export, only while the game is profiled
+                if event.key == K_F3 and state.profiling:
+                    profiler.showing = not profiler.showing
+                    self.view.invalidate()
+
+                if event.key == K_F4 and state.profiling:
+                    state.writer.write('trace_{}.json'.format(time.strftime('%Y%m%d_%H%M%S')),
+                                       json.dumps(profiler.trace()).encode())
+
+            # shoot a fireball towards the mouse, in world coordinates
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                mouse_pos = pygame.mouse.get_pos()
+                self.fire = (mouse_pos[0], mouse_pos[1]+sim.camera.y)
+
+            if event.type == pygame.QUIT:
+                state.exit()
+
+        now = time.perf_counter()
+        self.accumulator += now-self.last_time
+        self.last_time = now
+
+        pressed_keys = pygame.key.get_pressed()
+        steps = 0
+        while self.accumulator >= self.step_time and steps < state.max_steps and not sim.game_over:
+            self.previous = sim.positions()
+            self.previous_camera = sim.camera.y
+
+            # presses are only used by the first step, held keys by every step
+            inputs = Inputs(left=pressed_keys[K_LEFT] or pressed_keys[K_a],
+                            right=pressed_keys[K_RIGHT] or pressed_keys[K_d], jump=self.jump, fire=self.fire)
+            self.jump = False
+            self.fire = None
+            self.recording.record(inputs)
+            sounds_played = sim.step(inputs)
+            profiler.begin('sound')
+            for sound in sounds_played:
+                state.sounds.play(sound)
+
+            self.accumulator -= self.step_time
+            steps += 1
+
+        # drop the time that could not be caught up on so slow machines skip rendered frames, not game time
+        if steps == state.max_steps:
+            self.accumulator = min(self.accumulator, self.step_time)
+
+        profiler.begin('animate')
+        state.score = sim.score
+        if sim.game_over:
+            self.recording.score = sim.score
+            state.save_replay(self.recording)
+            state.scenes.switch('death')
+            return
+
+        sim.player.animate()
+
+        self.view.draw(self.previous, self.previous_camera, self.accumulator/self.step_time)
+        profiler.begin('tick')
+        state.pacer.tick()
+        profiler.end_frame()
+
+
+class PauseScene(Scene):
+
+    def __init__(self, state: State):
+        super().__init__(state)
+        self.title_surf, self.title_rect = render_text(state.medium_font, 'Paused', x=screen_w//2, y=2*screen_w//5)
+        self.resume_button = Button(state, 'Resume', x=screen_w//2, y=2.5*screen_w//5)
+        self.options_button = Button(state, 'Options', x=screen_w//2, y=3*screen_w//5)
+        self.help_button = Button(state, 'Help', x=screen_w//2, y=3.5*screen_w//5)
+        self.menu_button = Button(state, 'Main Menu', x=screen_w//2, y=4*screen_w//5)
+        self.buttons = [self.resume_button, self.options_button, self.help_button, self.menu_button]
+
+        # nothing on the pause screen moves, it is only drawn again on input
+        self.idle = IdleScreen([button.rect for button in self.buttons], pacer=state.pacer)
+        self.background = None
+
+    def enter(self) -> None:
+
+        # the paused game stays in the background of the pause screen and the screens opened from it
+        self.background = self.state.screen.copy()
+        self.idle.changed = True
+
+    def resume(self) -> None:
+        self.idle.changed = True
+
+    def frame(self) -> None:
+
+        """
+        Pause screen of the game
         """
-    
-        platforms.pop(0)
-        if self.enemy is not None:
-            self.remove_enemy()
-        if self.projectile is not None:
-            self.remove_projectile()
-        if self.powerup is not None:
-            self.remove_powerup()
-        self.kill()
-
-    def remove_enemy(self) -> None:
-    
+
+        state = self.state
+        events = self.idle.events()
+        mouse_pos = pygame.mouse.get_pos()
+
+        for event in events:
+            if event.type == KEYDOWN and event.key == K_ESCAPE:
+                state.scenes.pop()
+
+            if event.type == pygame.QUIT:
+                state.exit()
+
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if self.resume_button.hovered(mouse_pos):
+                    state.scenes.pop()
+                elif self.options_button.hovered(mouse_pos):
+                    state.scenes.push('options', background=self.background)
+                elif self.help_button.hovered(mouse_pos):
+                    state.scenes.push('help', background=self.background)
+                elif self.menu_button.hovered(mouse_pos):
+                    state.scenes.switch('title')
+
+            if not self.active():
+                return
+
+        if not self.idle.needs_redraw(events, mouse_pos):
+            return
+
+        state.screen.blit(self.background, (0, 0))
+        state.screen.blit(self.title_surf, self.title_rect)
+        for button in self.buttons:
+            button.draw(state.screen, button.hovered(mouse_pos))
+
+        pygame.display.flip()
+        state.pacer.tick()
+
+
+class DeathScene(Scene):
+
+    def __init__(self, state: State):
+        super().__init__(state)
+        self.title_surf, self.title_rect = render_text(state.medium_font, 'You Died!', x=screen_w//2, y=screen_h//5)
+        self.restart_button = Button(state, 'Restart', x=screen_w//2, y=2*screen_h//5)
+        self.selection_button = Button(state, 'Change Character/Difficulty', x=screen_w//2, y=2.5*screen_h//5)
+        self.menu_button = Button(state, 'Main Menu', x=screen_w//2, y=3*screen_h//5)
+        self.buttons = [self.restart_button, self.selection_button, self.menu_button]
+        self.enter_surf, self.enter_rect = render_text(state.small_font, 'Press ENTER to save player name',
+                                                       x=screen_w//2, y=4*screen_h//5)
+        self.idle = IdleScreen([button.rect for button in self.buttons], pacer=state.pacer)
+        self.highscore = False
+        self.highscore_surf = None
+        self.highscore_rect = None
+        self.name = ''
+
+    def enter(self) -> None:
+
         """
-        Remove enemy associated with the platform
+        Checks whether the score of the finished game makes the leaderboard
         """
-    
-        self.enemy.kill()
-        self.enemy = None
 
-    def remove_powerup(self) -> None:
-    
+        state = self.state
+        self.name = ''
+        self.check_highscore()
+        self.idle.idle = state.idle_menus
+        self.idle.changed = True
+
+    def check_highscore(self) -> None:
+
         """
-        Remove powerup associated with the platform
+        Decides whether the score makes the leaderboard, again each frame until the leaderboard has loaded
         """
-    
-        self.powerup.kill()
-        self.powerup = None
 
-    def remove_projectile(self) -> None:
-    
+        state = self.state
+        self.highscore = state.new_highscore()
+        if self.highscore:
+            self.highscore_surf, self.highscore_rect = render_text(state.small_font,
+                                                                   'New Highscore: {}'.format(state.score),
+                                                                   x=screen_w//2, y=3.5*screen_h//5)
+            self.idle.changed = True
+
+    def frame(self) -> None:
+
         """
-        Remove projectile associated with the platform
+        Player death screen of the game
         """
-    
-        self.projectile.kill()
-        self.projectile = None
 
+        state = self.state
+        if self.highscore is None:
+            self.check_highscore()
+        events = self.idle.events()
+        mouse_pos = pygame.mouse.get_pos()
 
-class Enemy(pygame.sprite.Sprite):
+        for event in events:
 
-    def __init__(self, x, y, v_x):
-        super().__init__()
-        self.v_x = v_x
-        self.face_right = rnd.randint(0, 1)
-        self.frame = 0
-        self.run_right = frames.demon_run_right_img
-        self.run_left = frames.demon_run_left_img
-        if self.face_right:
-            self.surf = self.run_right[0]
-        else:
-            self.surf = self.run_left[0]
-        self.rect = self.surf.get_rect()
-        self.rect.center = (x, 0)
-        self.rect.bottom = y
+            # for typing name for highscore
+            if event.type == KEYDOWN and self.highscore:
+                if event.key == K_BACKSPACE:
+                    self.name = self.name[:-1]
+                elif event.key == K_RETURN:
+                    state.update_leaderboard(self.name)
+                    state.scenes.switch('leaderboard')
+                else:
+                    self.name += event.unicode
 
-    def move(self) -> None:
-    
-        """
-        Moves the enemy distance (v_x, v_y) per frame
-        """
-    
-        if self.face_right:
-            self.rect.move_ip((self.v_x, 0))
-            self.frame += 1
-            self.surf = self.run_right[self.frame//4 % 4]
-            if self.rect.right > screen_w:
-                self.face_right = False
+            if event.type == pygame.QUIT:
+                state.exit()
+
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if self.restart_button.hovered(mouse_pos):
+                    state.scenes.switch('game')
+                elif self.selection_button.hovered(mouse_pos):
+                    state.scenes.switch('selection')
+                elif self.menu_button.hovered(mouse_pos):
+                    state.scenes.switch('title')
+
+            if not self.active():
+                return
+
+        if not self.idle.needs_redraw(events, mouse_pos):
+            return
+
+        state.scrolling_background(scroll=not state.idle_menus)
+        state.screen.blit(self.title_surf, self.title_rect)
+        for button in self.buttons:
+            button.draw(state.screen, button.hovered(mouse_pos))
+
+        if self.highscore:
+            name_surf, name_rect = render_text(state.small_font, 'Enter Your Name: {}'.format(self.name),
+                                               x=screen_w//2, y=3.75*screen_h//5)
+            state.screen.blit(self.highscore_surf, self.highscore_rect)
+            state.screen.blit(name_surf, name_rect)
+            state.screen.blit(self.enter_surf, self.enter_rect)
+
+        pygame.display.flip()
+        state.pacer.tick()
+
+
+class GameView:
+
+    def __init__(self, state: State, sim: Simulation):
+        self.state = state
+        self.sim = sim
+
+        # sprite group that holds all static sprites
+        self.static_sprites = pygame.sprite.Group()
+
+        # marker symbols for the graphical interface
+        lives_marker = Powerup(screen_w-155, 30, 'lives')
+        d_jump_marker = Powerup(screen_w-155, 60, 'double_jump')
+        fireball_marker = Powerup(screen_w-155, 90, 'fireball')
+        self.static_sprites.add([lives_marker, d_jump_marker, fireball_marker])
+
+        # interface text is only rendered again when its value changes
+        self.scoreboard_text = HudText(state.small_font, 'Score: {}', left=20, top=20)
+        self.lives_text = HudText(state.small_font, 'Lives: {}', left=lives_marker.rect.right+10,
+                                  top=lives_marker.rect.top+5)
+        self.d_jump_text = HudText(state.small_font, 'Double Jump: {}', left=d_jump_marker.rect.right+10,
+                                   top=d_jump_marker.rect.top+5)
+        self.fireball_text = HudText(state.small_font, 'Fireball: {}', left=fireball_marker.rect.right+10,
+                                     top=fireball_marker.rect.top+5)
+
+        # only redraws the changed parts of the screen while the world is not scrolling
+        self.renderer = DirtyRenderer(state.screen, state.background.layers, state.profiler)
+        self.profiler_font = default_font(18)
+
+        self.background_camera = sim.camera.y  # camera position the backgrounds were last scrolled to
+        self.screen_rect = state.screen.get_rect()
+
+    def invalidate(self) -> None:
+
+        """
+        Redraw the whole screen next frame, used after another screen has been drawn over the game
+        """
+
+        self.renderer.invalidate()
+
+    def draw(self, previous: dict, previous_camera: float, alpha: float) -> None:
+
+        """
+        Draws one frame of the game between the last two game rule steps
+        previous: sprite positions before the last step
+        previous_camera: camera position before the last step
+        alpha: fraction of a step that has passed since the last step
+        """
+
+        state = self.state
+        sim = self.sim
+        player = sim.player
+        profiler = state.profiler
+        profiler.begin('blits')
+
+        # camera position between the last two steps
+        camera_y = previous_camera+(sim.camera.y-previous_camera)*alpha
+
+        # background scrolling, the background stays in screen coordinates and moves against the camera
+        state.background.move(self.background_camera-round(camera_y))
+        self.background_camera = round(camera_y)
+
+        # update interface text
+        profiler.begin('hud_text')
+        scoreboard_surf, scoreboard_rect = self.scoreboard_text.update(sim.score)
+        lives_surf, lives_rect = self.lives_text.update(player.powerups['lives'])
+        d_jump_surf, d_jump_rect = self.d_jump_text.update(player.powerups['double_jump'])
+        fireball_surf, fireball_rect = self.fireball_text.update(player.powerups['fireball'])
+        profiler.begin('blits')
+
+        # all active images on the screen in drawing order
+        items = [(layer, surf, self.screen_rect) for layer, surf in state.background.views()]
+        for key, surf, rect in sim.platforms.views():
+            rect = sim.camera.to_screen(rect)
+            if rect.colliderect(self.screen_rect):
+                items.append((key, surf, rect))
+        for entity in list(sim.dynamic_sprites)+[player]:
+            x, y = interpolate(previous, entity, alpha)
+            rect = pygame.Rect((round(x), round(y-camera_y)), entity.surf.get_size())
+            if rect.colliderect(self.screen_rect):
+                items.append((entity, entity.surf, rect))
+        for entity in self.static_sprites:
+            items.append((entity, entity.surf, entity.rect))
+        items.append(('score', scoreboard_surf, scoreboard_rect))
+        items.append(('lives', lives_surf, lives_rect))
+        items.append(('double_jump', d_jump_surf, d_jump_rect))
+        items.append(('fireball', fireball_surf, fireball_rect))
+
+        # the profiler overlay covers part of the game so the whole screen is drawn while it shows
+        if state.dirty_rendering and not profiler.showing:
+            self.renderer.render(items)
         else:
-            self.rect.move_ip((-self.v_x, 0))
-            self.frame += 1
-            self.surf = self.run_left[self.frame//4 % 4]
-            if self.rect.left < 0:
-                self.face_right = True
+            for key, surf, rect in items:
+                state.screen.blit(surf, rect)
+            if profiler.showing:
+                profiler.begin('overlay')
+                profiler.draw(state.screen, self.profiler_font)
+            profiler.begin('flip')
+            pygame.display.flip()
 
 
-class Projectile(pygame.sprite.Sprite):
+def interpolate(previous: dict, entity: pygame.sprite.Sprite, alpha: float) -> tuple:
 
-    def __init__(self, pos, v_x, v_y):
-        super().__init__()
-        self.v_x = v_x
-        self.v_y = v_y
-        self.surf = frames.fire_img
-        self.rect = self.surf.get_rect()
-        self.rect.center = (pos[0], pos[1])
-        self.new_projectile = True
+    """
+    previous: sprite positions before the last game rule step
+    entity: sprite to be drawn
+    alpha: fraction of a step that has passed since the last step
+    Returns the world position to draw the sprite at, between its last two stepped positions
+    """
 
-    def move(self) -> None:
-    
-        """
-        Moves the projectile distance (v_x, v_y) per frame
-        """
-    
-        self.rect.move_ip((self.v_x, self.v_y))
+    x, y = entity.rect.topleft
+    if entity not in previous:
+        return x, y
+    x_0, y_0 = previous[entity]
+
+    # sprites that wrapped around the screen are drawn at their new position
+    if abs(x-x_0) > screen_w//2 or abs(y-y_0) > screen_h//2:
+        return x, y
+    return x_0+(x-x_0)*alpha, y_0+(y-y_0)*alpha
+
+
+class HudText:
+
+    def __init__(self, font, template, **args):
+        self.font = font
+        self.template = template  # format string the value is inserted into
+        self.args = args  # positioning arguments for render_text
+        self.value = None
+        self.surf = None
+        self.rect = None
+
+    def update(self, value) -> tuple:
 
-    def hits(self, obj: pygame.sprite.Sprite) -> bool:
-    
         """
-        obj: pygame.sprite.Sprite object that may have collided with the projectile
-        Return boolean value indicating a collision
+        value: the value currently shown by the text
+        Returns a pygame surface and rect object for the text, only rendered again if the value changed
         """
-    
-        if self.rect.colliderect(obj.rect):
-            return True
-        return False
 
-    def hits_boundary(self) -> bool:
-    
+        if self.surf is None or value != self.value:
+            self.value = value
+            self.surf, self.rect = render_text(self.font, self.template.format(value), cached=False, **self.args)
+        return self.surf, self.rect
+
+
+class Button:
+
+    def __init__(self, state: State, text: str, x: float, y: float):
+
+        # enlarged yellow text is shown while the button is hovered or chosen
+        self.surf, self.rect = render_text(state.small_font, text, x=x, y=y)
+        self.highlighted_surf, self.highlighted_rect = render_text(state.small_yellow_font, text, x=x, y=y,
+                                                                   color=(255, 255, 0))
+
+    def hovered(self, mouse_pos: tuple) -> bool:
+        return self.rect.collidepoint(mouse_pos)
+
+    def draw(self, screen: pygame.Surface, highlighted: bool) -> None:
+
         """
-        Return a boolean indicating whether the projectile has moved out of bounds
+        highlighted: whether to draw the yellow text
         """
-    
-        if self.new_projectile and self.rect.bottom <= 0:
-            return False
+
+        if highlighted:
+            screen.blit(self.highlighted_surf, self.highlighted_rect)
         else:
-            self.new_projectile = False
-        if self.rect.left >= screen_w or self.rect.right <= 0:
-            return True
-        if self.rect.top >= screen_h or self.rect.bottom <= 0:
-            return True
-        return False
-
-
-class Powerup(pygame.sprite.Sprite):
-
-    def __init__(self, x, y, name):
-        super().__init__()
-        self.name = name
-        if self.name == 'lives':
-            self.surf = frames.heart_img
-        elif self.name == 'double_jump':
-            self.surf = frames.blue_flask_img
-        elif self.name == 'fireball':
-            self.surf = frames.red_flask_img
-        self.rect = self.surf.get_rect()
-        self.rect.center = (round(x), 0)
-        self.rect.bottom = round(y)
-
-
-class Origin(pygame.sprite.Sprite):
-
-    def __init__(self, pos):
-        super().__init__()
-        self.surf = pygame.Surface((1, 1))
-        self.rect = self.surf.get_rect()
-        self.rect.center = (pos[0], pos[1])
-
-
-class Background(pygame.sprite.Sprite):
-
-    def __init__(self, y):
-        super().__init__()
-        self.surf = frames.background_img
-        self.rect = self.surf.get_rect()
-        self.w, self.h = self.surf.get_size()
-        self.rect.left = 0
-        self.rect.top = y
-
-    def check_background(self) -> None:
-    
-        """
-        Check if backgrounds have been shifted off-screen
-        Shifts background to cover the entire game screen
-        """
-    
-        if self.rect.top > screen_h:
-            self.rect.bottom = self.rect.top-self.h
-        if self.rect.bottom < 0:
-            self.rect.top = self.rect.bottom+self.h
-            
+            screen.blit(self.surf, self.rect)
+
+
+@functools.lru_cache(maxsize=None)
+def default_font(size: int) -> pygame.font.Font:
+
+    """
+    size: font height in pixels
+    Returns pygame's default font at the size, loaded once per size
+    SysFont(None, size) gives the same font but scans the system fonts first, which can take seconds on a cold start
+    """
 
-def get_leaderboard() -> list:
+    return pygame.font.Font(None, size)
+
+
+@functools.lru_cache(maxsize=256)
+def text_surface(font: pygame.font.Font, text: str, color: tuple) -> pygame.Surface:
 
     """
-    Return a list of all active leaderboard entries
+    font: the pygame font object to use
+    text: the text to render
+    color: rgb color of the text
+    Returns the antialiased text surface, the least recently used surfaces are dropped once the cache is full
     """
 
-    entries = []
-    for entry in open('leaderboard.txt', 'r').readlines():
-        name, score = entry.split()
-        entries.append([name, int(score)])
-    return entries
+    return font.render(text, True, color)
 
 
 def render_text(font: pygame.font.Font, text: str, **args) -> tuple:
@@ -1714,6 +1220,7 @@ def render_text(font: pygame.font.Font, text: str, **args) -> tuple:
     font: the pygame font object to use
     text: the text to render
     Returns a pygame surface and rect object for bltting text to the screen
+    Surfaces are shared through the text cache unless cached=False is passed, they must not be drawn on
     """
 
     # for positioning the text
@@ -1723,9 +1230,13 @@ def render_text(font: pygame.font.Font, text: str, **args) -> tuple:
     right = args.get('right', None)
     top = args.get('top', None)
     bottom = args.get('bottom', None)
-    color = args.get('color', (255, 255, 255))
+    color = tuple(args.get('color', (255, 255, 255)))
+    cached = args.get('cached', True)
 
-    _surf = font.render(text, True, color)
+    if cached:
+        _surf = text_surface(font, text, color)
+    else:
+        _surf = font.render(text, True, color)
     _rect = _surf.get_rect()
     if x is not None:
         _rect.center = (round(x), round(y))
@@ -1743,3 +1254,20 @@ def render_text(font: pygame.font.Font, text: str, **args) -> tuple:
 
 if __name__ == '__main__':
     main()
+
+
+def flips_wait(screen: pygame.Surface, flips=4, min_interval=0.003) -> bool:
+
+    """
+    screen: display surface
+    flips: number of flips to time
+    min_interval: seconds a flip waiting for the display refresh takes at least, shorter than one refresh at 300 Hz
+    Returns true if showing a frame waits for the display refresh
+    """
+
+    screen.fill((0, 0, 0))
+    pygame.display.flip()
+    start = time.perf_counter()
+    for i in range(flips):
+        pygame.display.flip()
+    return (time.perf_counter()-start)/flips >= min_interval
@@ -0,0 +1,70 @@
+import collections
+import time
+
+#  Keeps frames evenly spaced at a target rate, more precisely than pygame.time.Clock which waits in whole milliseconds
+
+
+class FramePacer:
+
+    def __init__(self, rate=60, spin=0.0015, history=600):
+        self.rate = rate  # frames per second, no limit if 0
+        self.spin = spin  # seconds before the deadline to stop sleeping and check the time in a loop
+        self.frame_times = collections.deque(maxlen=history)  # seconds between the last ticks
+        self.deadline = None  # time the next frame should start
+        self.last_tick = None
+
+    def tick(self) -> float:
+
+        """
+        Waits until the next frame should start, call once per frame after drawing
+        Sleeps most of the wait and spins for the last moment since sleeping can overshoot by a millisecond or more
+        Returns the seconds since the last tick
+        """
+
+        now = time.perf_counter()
+        if self.rate > 0:
+            period = 1/self.rate
+            if self.deadline is None:
+                self.deadline = now+period
+
+            # a late frame moves the schedule instead of rushing the next frames to catch up
+            elif now > self.deadline+period:
+                self.deadline = now
+
+            remaining = self.deadline-now-self.spin
+            if remaining > 0:
+                time.sleep(remaining)
+            while time.perf_counter() < self.deadline:
+                pass
+            now = time.perf_counter()
+            self.deadline += period
+
+        frame_time = 0 if self.last_tick is None else now-self.last_tick
+        if self.last_tick is not None:
+            self.frame_times.append(frame_time)
+        self.last_tick = now
+        return frame_time
+
+    def reset(self) -> None:
+
+        """
+        Starts a new schedule, used after a pause or a wait for input so that time is not recorded as a frame time
+        """
+
+        self.deadline = None
+        self.last_tick = None
+
+    def stats(self) -> dict:
+
+        """
+        Returns the mean, standard deviation, 99th percentile and range of the recent frame times in milliseconds
+        """
+
+        times = sorted(self.frame_times)
+        n = len(times)
+        if n == 0:
+            return {'frames': 0}
+        mean = sum(times)/n
+        variance = sum((t-mean)**2 for t in times)/n
+        return {'frames': n, 'mean': mean*1000, 'stdev': variance**0.5*1000, 'p99': times[min(n-1, 99*n//100)]*1000,
+                'min': times[0]*1000, 'max': times[-1]*1000}
@@ -0,0 +1,145 @@
+import collections
+import os
+import tempfile
+import threading
+import traceback
+
+#  Saves files and database changes on a background thread so the game never waits for the disk
+
+# the umask can only be read by setting it, which affects every thread, so it is read once while the module is imported
+umask = os.umask(0)
+os.umask(umask)
+
+
+def write_atomic(path: str, data: bytes) -> None:
+
+    """
+    path: file to write
+    data: new contents of the file
+    Writes a temporary file next to path and moves it over path once it is on disk, so a crash while writing leaves
+    either the old or the new file, never a truncated one
+    """
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.{}.'.format(os.path.basename(path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+
+        # temporary files are only readable by their owner, the file gets the mode a plain open would have given it
+        os.chmod(temp_path, file_mode(path))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    # the rename itself is only durable once the directory is on disk, not every platform can sync a directory
+    try:
+        directory_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(directory_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(directory_fd)
+
+
+def file_mode(path: str) -> int:
+
+    """
+    path: file about to be written
+    Returns the permission bits of the file if it exists, otherwise those of a new file under the current umask
+    """
+
+    try:
+        return os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        return 0o666 & ~umask
+
+
+class BackgroundWriter:
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.tasks = collections.OrderedDict()  # pending tasks by key, oldest first
+        self.busy = False  # a task is running
+        self.closed = False
+        self.thread = None
+
+    def submit(self, key, task) -> None:
+
+        """
+        key: identifies the task, a pending task with the same key is replaced so rapid updates are saved once
+        task: function without arguments, run on the writer thread
+        """
+
+        with self.condition:
+            if self.closed:
+                raise RuntimeError('writer is closed')
+            self.tasks[key] = task
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='background writer', daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+
+    def write(self, path: str, data: bytes) -> None:
+
+        """
+        path: file to write
+        data: new contents of the file, replaces data for the same file that has not been written yet
+        """
+
+        self.submit(('file', os.path.abspath(path)), lambda: write_atomic(path, data))
+
+    def flush(self, timeout=None) -> bool:
+
+        """
+        timeout: most seconds to wait, no limit if None
+        Waits until every submitted task has run
+        Returns false if the timeout passed first
+        """
+
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.tasks and not self.busy, timeout)
+
+    def close(self, timeout=None) -> None:
+
+        """
+        timeout: most seconds to wait for pending tasks
+        Runs the pending tasks and stops the writer thread
+        """
+
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def run(self) -> None:
+
+        """
+        Writer thread, runs the submitted tasks in the order they were first submitted
+        """
+
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.tasks or self.closed)
+                if not self.tasks:
+                    return
+                key, task = self.tasks.popitem(last=False)
+                self.busy = True
+
+            try:
+                task()
+            except Exception:
+                # a failed save must not stop later ones, the error is reported like an uncaught exception
+                traceback.print_exc()
+            finally:
+                with self.condition:
+                    self.busy = False
+                    self.condition.notify_all()
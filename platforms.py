@@ -0,0 +1,251 @@
+import pygame
+import random
+from array import array
+import frames
+from sprites import Enemy, Powerup, Projectile
+
+#  Holds the platforms of a running game in a fixed size ring buffer, lowest platform first
+
+screen_w = 512
+screen_h = 704
+
+
+class PlatformStore:
+
+    def __init__(self, capacity: int, rng: random.Random):
+        self.capacity = capacity
+        self.rng = rng  # random number generator of the game the platforms belong to
+        self.surf = frames.platform_img
+        self.w, self.h = self.surf.get_size()
+
+        self.start = 0  # slot of the lowest platform
+        self.count = 0
+        self.next_serial = 0
+
+        # platform records by slot, positions are world coordinates
+        self.left = array('i', [0])*capacity
+        self.top = array('i', [0])*capacity
+        self.serial = array('q', [0])*capacity  # number of the platform since the game started, never reused
+
+        # sprites standing on or shot from each platform, None if the platform has none
+        self.enemy = [None]*capacity
+        self.powerup = [None]*capacity
+        self.projectile = [None]*capacity
+
+    def __len__(self) -> int:
+        return self.count
+
+    def slot(self, i: int) -> int:
+
+        """
+        i: position of the platform counting up from the lowest platform
+        Returns the buffer slot holding the platform
+        """
+
+        return (self.start+i) % self.capacity
+
+    def center(self, slot: int) -> tuple:
+
+        """
+        slot: buffer slot of the platform
+        Returns the world position of the platform center
+        """
+
+        return self.left[slot]+self.w//2, self.top[slot]+self.h//2
+
+    def rect(self, slot: int) -> pygame.Rect:
+
+        """
+        slot: buffer slot of the platform
+        Returns a new rect for the platform in world coordinates
+        """
+
+        return pygame.Rect(self.left[slot], self.top[slot], self.w, self.h)
+
+    def first_at_or_above(self, y: int) -> int:
+
+        """
+        y: world height
+        Returns the position of the lowest platform with its top at or above height y, len(self) if there is none
+        Platform tops rise strictly from the lowest platform up so the position is found by bisection
+        """
+
+        lo = 0
+        hi = self.count
+        while lo < hi:
+            mid = (lo+hi)//2
+            if self.top[(self.start+mid) % self.capacity] <= y:
+                hi = mid
+            else:
+                lo = mid+1
+        return lo
+
+    def between(self, high: int, low: int) -> range:
+
+        """
+        high, low: world heights with high <= low
+        Returns the positions of the platforms whose tops lie between the two heights, lowest platform first
+        """
+
+        return range(self.first_at_or_above(low), self.first_at_or_above(high-1))
+
+    def add(self, pos: tuple) -> int:
+
+        """
+        Create a new highest platform using some random number generation and previous coordinates
+        pos: tuple containing position of other platform to use as a basis for new platform coordinates
+        Returns the buffer slot of the new platform
+        """
+
+        if self.count == self.capacity:
+            raise IndexError('platform store is full')
+
+        x, y = next_platform_position(pos, self.w, self.rng)
+        slot = self.slot(self.count)
+        self.left[slot] = x-self.w//2
+        self.top[slot] = y-self.h//2
+        self.serial[slot] = self.next_serial
+        self.next_serial += 1
+        self.count += 1
+        return slot
+
+    def add_next(self) -> int:
+
+        """
+        Create a new platform above the highest platform
+        Returns the buffer slot of the new platform
+        """
+
+        return self.add(self.center(self.slot(self.count-1)))
+
+    def remove_lowest(self) -> None:
+
+        """
+        Remove the lowest platform and the sprites associated with it
+        """
+
+        slot = self.start
+        if self.enemy[slot] is not None:
+            self.remove_enemy(slot)
+        if self.projectile[slot] is not None:
+            self.remove_projectile(slot)
+        if self.powerup[slot] is not None:
+            self.remove_powerup(slot)
+        self.start = (self.start+1) % self.capacity
+        self.count -= 1
+
+    def create_enemy(self, slot: int, dynamic_sprites: pygame.sprite.Group, speed: int) -> None:
+
+        """
+        Create a new enemy sprite and add to dynamic sprite group
+        slot: buffer slot of the platform the enemy walks on
+        dynamic_sprites: sprite group to add enemy to
+        speed: speed of the enemy
+        """
+
+        self.enemy[slot] = Enemy(self.center(slot)[0], self.top[slot], speed, self.rng)
+        dynamic_sprites.add(self.enemy[slot])
+
+    def create_powerup(self, slot: int, dynamic_sprites: pygame.sprite.Group) -> None:
+
+        """
+        Create a new powerup sprite and add to dynamic sprite group
+        slot: buffer slot of the platform the powerup lies on
+        dynamic_sprites: sprite group to add powerup to
+        """
+
+        x = self.center(slot)[0]
+        num = self.rng.randint(0, 6)
+        if num == 0:
+            self.powerup[slot] = Powerup(x, self.top[slot], 'lives')
+        elif num in [1, 2, 3]:
+            self.powerup[slot] = Powerup(x, self.top[slot], 'double_jump')
+        elif num in [4, 5, 6]:
+            self.powerup[slot] = Powerup(x, self.top[slot], 'fireball')
+        dynamic_sprites.add(self.powerup[slot])
+
+    def create_projectile(self, slot: int, v_y: int, dynamic_sprites: pygame.sprite.Group) -> None:
+
+        """
+        Create a new projectile sprite shot by the platform enemy and add to dynamic sprite group
+        slot: buffer slot of the platform
+        v_y: vertical speed of the projectile
+        dynamic_sprites: sprite group to add projectile to
+        """
+
+        self.projectile[slot] = Projectile(self.enemy[slot].rect.center, 0, v_y)
+        dynamic_sprites.add(self.projectile[slot])
+
+    def remove_enemy(self, slot: int) -> None:
+
+        """
+        Remove enemy associated with the platform
+        """
+
+        self.enemy[slot].kill()
+        self.enemy[slot] = None
+
+    def remove_powerup(self, slot: int) -> None:
+
+        """
+        Remove powerup associated with the platform
+        """
+
+        self.powerup[slot].kill()
+        self.powerup[slot] = None
+
+    def remove_projectile(self, slot: int) -> None:
+
+        """
+        Remove projectile associated with the platform
+        """
+
+        self.projectile[slot].kill()
+        self.projectile[slot] = None
+
+    def views(self):
+
+        """
+        Yields a (key, surface, rect) view of every platform for drawing, lowest platform first
+        """
+
+        for i in range(self.count):
+            slot = self.slot(i)
+            yield ('platform', self.serial[slot]), self.surf, self.rect(slot)
+
+
+def next_platform_position(pos: tuple, w: int, rng: random.Random) -> tuple:
+
+    """
+    Create a new platform position using some random number generation and previous coordinates
+    pos: tuple containing position of other platform to use as a basis for new platform coordinates
+    w: platform width
+    rng: random number generator of the game
+    Return a tuple containing position of next platform center
+    """
+
+    x_i = pos[0]
+    y_i = pos[1]
+    v_x = 5
+    v_y = 8.5
+    y_max = v_y ** 2  # 12*(v_y**2)/(2*G)
+    x_max = 4*v_x*v_y  # 24*v_x*v_y/G
+
+    # randomly generate new platform position
+    x = x_i+rng.uniform(-x_max, x_max)
+    y = y_i-rng.uniform(0.8*y_max, y_max)
+
+    # check if new position is valid in the game frame
+    if x <= w:
+        x = x_i+rng.uniform(0.5*x_max, x_max)
+    elif x >= screen_w-w:
+        x = x_i-rng.uniform(0.5*x_max, x_max)
+    if (x-x_i < 0.5*x_max) and (x-x_i > 0):
+        x = x_i+rng.uniform(0.5*x_max, x_max)
+    if (x-x_i > -0.5*x_max) and (x-x_i < 0):
+        x = x_i-rng.uniform(0.5*x_max, x_max)
+    if x < w//2:
+        x = w//2
+    if x > screen_w-w//2:
+        x = screen_w-w//2
+    return round(x), round(y)
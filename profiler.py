@@ -0,0 +1,186 @@
+import time
+import pygame
+
+#  Times each phase of the game loop for the last few seconds of frames
+#  Enabled with $ python3 main.py --profile, F3 shows the overlay and F4 saves a trace for chrome://tracing or Perfetto
+
+screen_w = 512
+screen_h = 704
+
+# phases of a game frame in the order they run
+phases = ['events', 'player.move', 'spawn', 'collisions', 'sound', 'animate', 'hud_text', 'blits', 'overlay', 'flip',
+          'tick']
+colors = {'events': (230, 159, 0), 'player.move': (86, 180, 233), 'spawn': (0, 158, 115), 'collisions': (240, 228, 66),
+          'sound': (0, 114, 178), 'animate': (213, 94, 0), 'hud_text': (204, 121, 167), 'blits': (160, 160, 255),
+          'overlay': (120, 120, 120), 'flip': (255, 120, 120), 'tick': (90, 90, 90)}
+
+frame_budget = 1/60
+
+
+class NullProfiler:
+
+    # used when profiling is off, every call does nothing
+    showing = False
+
+    def begin(self, phase: str) -> None:
+        pass
+
+    def end_frame(self) -> None:
+        pass
+
+    def discard_frame(self) -> None:
+        pass
+
+
+class FrameProfiler:
+
+    def __init__(self, capacity=600):
+        self.capacity = capacity
+        self.frames = [None]*capacity  # (start, end, segments) of each frame, oldest frames are overwritten
+        self.next = 0  # buffer index of the next frame
+        self.count = 0
+        self.showing = False  # draw the overlay over the game
+
+        # phase segments of the frame being timed, a phase can run more than once per frame
+        self.segments = []
+        self.phase = None
+        self.phase_start = self.frame_start = time.perf_counter()
+
+    def begin(self, phase: str) -> None:
+
+        """
+        phase: name of the phase that starts now, the phase before it ends
+        """
+
+        now = time.perf_counter()
+        if self.phase is not None:
+            self.segments.append((self.phase, self.phase_start, now))
+        self.phase = phase
+        self.phase_start = now
+
+    def end_frame(self) -> None:
+
+        """
+        Ends the current phase and the frame, the next frame starts now
+        """
+
+        now = time.perf_counter()
+        if self.phase is not None:
+            self.segments.append((self.phase, self.phase_start, now))
+        self.frames[self.next] = (self.frame_start, now, self.segments)
+        self.next = (self.next+1) % self.capacity
+        self.count = min(self.count+1, self.capacity)
+        self.segments = []
+        self.phase = None
+        self.frame_start = now
+
+    def discard_frame(self) -> None:
+
+        """
+        Drops the frame being timed and starts a new one, used after time was spent on another screen
+        """
+
+        self.segments = []
+        self.phase = None
+        self.frame_start = time.perf_counter()
+
+    def recent(self, n=None) -> list:
+
+        """
+        n: number of frames, all buffered frames if None
+        Returns the last n frames oldest first
+        """
+
+        n = self.count if n is None else min(n, self.count)
+        return [self.frames[(self.next-n+i) % self.capacity] for i in range(n)]
+
+    def phase_means(self, n=60) -> dict:
+
+        """
+        n: number of frames to average over
+        Returns the mean time per frame of every phase in seconds
+        """
+
+        frames = self.recent(n)
+        totals = dict.fromkeys(phases, 0)
+        for start, end, segments in frames:
+            for phase, phase_start, phase_end in segments:
+                totals[phase] = totals.get(phase, 0)+phase_end-phase_start
+        return {phase: total/max(len(frames), 1) for phase, total in totals.items()}
+
+    def trace(self) -> dict:
+
+        """
+        Returns the buffered frames as Chrome trace events, every frame holds a slice for each of its phases
+        """
+
+        events = []
+        for number, (start, end, segments) in enumerate(self.recent()):
+            events.append({'name': 'frame', 'ph': 'X', 'ts': start*1e6, 'dur': (end-start)*1e6, 'pid': 1, 'tid': 1,
+                           'args': {'frame': number}})
+            for phase, phase_start, phase_end in segments:
+                events.append({'name': phase, 'ph': 'X', 'ts': phase_start*1e6, 'dur': (phase_end-phase_start)*1e6,
+                               'pid': 1, 'tid': 1})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def draw(self, screen: pygame.Surface, font: pygame.font.Font) -> None:
+
+        """
+        Draws a graph of the recent frame times and a bar of the mean time of each phase
+        screen: surface to draw on
+        font: font of the phase labels
+        """
+
+        panel = pygame.Rect(0, screen_h-260, screen_w, 260)
+        shade = pygame.Surface(panel.size, pygame.SRCALPHA)
+        shade.fill((0, 0, 0, 180))
+        screen.blit(shade, panel)
+
+        # one bar per frame, the line is the 60 fps budget, frames over budget are red
+        graph_h = 90
+        scale = graph_h/(2*frame_budget)
+        bottom = panel.top+10+graph_h
+        for i, (start, end, segments) in enumerate(self.recent(screen_w//2)):
+            h = min(graph_h, round((end-start)*scale))
+            color = (220, 60, 60) if end-start > frame_budget else (80, 200, 80)
+            pygame.draw.rect(screen, color, (2*i, bottom-h, 2, h))
+        pygame.draw.line(screen, (255, 255, 255), (0, bottom-round(frame_budget*scale)),
+                         (screen_w, bottom-round(frame_budget*scale)))
+
+        # mean time of each phase, a full bar is the whole frame budget
+        top = bottom+8
+        for phase, mean in self.phase_means().items():
+            label = font.render('{} {:.2f} ms'.format(phase, mean*1000), True, (255, 255, 255))
+            screen.blit(label, (8, top))
+            w = min(screen_w-170, round(mean/frame_budget*(screen_w-170)))
+            pygame.draw.rect(screen, colors.get(phase, (200, 200, 200)), (160, top+3, max(w, 1), 8))
+            top += 13
+
+
+class StartupTimer:
+
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start  # time the process started loading the game
+        self.last = self.start
+        self.stages = []  # (stage, seconds) in the order they finished
+
+    def mark(self, stage: str) -> None:
+
+        """
+        stage: name of the stage that finished now, it started when the stage before it finished
+        """
+
+        now = time.perf_counter()
+        self.stages.append((stage, now-self.last))
+        self.last = now
+
+    def report(self) -> str:
+
+        """
+        Returns the time of every stage and the total in milliseconds, one stage per line
+        """
+
+        width = max([len(stage) for stage, seconds in self.stages]+[5])
+        lines = ['{:<{}}  {:7.1f} ms'.format(stage, width, seconds*1000) for stage, seconds in self.stages]
+        lines.append('{:<{}}  {:7.1f} ms'.format('total', width, (self.last-self.start)*1000))
+        return '\n'.join(lines)
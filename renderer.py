@@ -0,0 +1,145 @@
+import pygame
+from profiler import NullProfiler
+
+#  Redraws only the parts of the screen that changed since the last frame
+#  Menu screens that do not move wait for input instead of drawing every frame
+
+# event types the game reacts to, every other event is dropped before it reaches the queue
+# text input fills in the typed character of key presses, exposed and restored windows need a redraw
+allowed_events = [pygame.QUIT, pygame.KEYDOWN, pygame.TEXTINPUT, pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION,
+                  pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED]
+
+idle_timeout = 1000  # most milliseconds an idle screen goes without being redrawn
+
+
+class DirtyRenderer:
+
+    def __init__(self, screen: pygame.Surface, scenery: list, profiler=NullProfiler()):
+        self.screen = screen
+        self.profiler = profiler
+        self.scenery = scenery  # keys of items covering the screen, everything is redrawn when they move or change
+        self.last_items = {}
+        self.full_redraw = True
+
+    def invalidate(self) -> None:
+
+        """
+        Redraw the whole screen next frame, used after another screen has been drawn over the game
+        """
+
+        self.full_redraw = True
+
+    def render(self, items: list) -> None:
+
+        """
+        items: list of (key, surface, rect) tuples in drawing order, key identifies the item between frames
+        Draws the items and updates the regions of the display that changed
+        """
+
+        current = {key: (surf, rect) for key, surf, rect in items}
+
+        # the world scrolled so nearly every pixel changed
+        for key in self.scenery:
+            if key not in self.last_items or key not in current or self.last_items[key][0] is not current[key][0] \
+                    or self.last_items[key][1] != current[key][1]:
+                self.full_redraw = True
+
+        if self.full_redraw:
+            for key, surf, rect in items:
+                self.screen.blit(surf, rect)
+            self.profiler.begin('flip')
+            pygame.display.flip()
+            self.full_redraw = False
+            self.last_items = current
+            return
+
+        # regions of items that moved, changed image, appeared or disappeared
+        dirty = []
+        for key, (surf, rect) in current.items():
+            last = self.last_items.get(key)
+            if last is None:
+                dirty.append(rect)
+            elif last[0] is not surf or last[1] != rect:
+                dirty.append(last[1])
+                dirty.append(rect)
+        for key, (surf, rect) in self.last_items.items():
+            if key not in current:
+                dirty.append(rect)
+        dirty = merge_rects(dirty, self.screen.get_rect())
+
+        # redraw every item overlapping a dirty region, clipped to that region
+        for region in dirty:
+            self.screen.set_clip(region)
+            for key, surf, rect in items:
+                if rect.colliderect(region):
+                    self.screen.blit(surf, rect)
+        self.screen.set_clip(None)
+
+        self.profiler.begin('flip')
+        pygame.display.update(dirty)
+        self.last_items = current
+
+
+def merge_rects(rects: list, bounds: pygame.Rect) -> list:
+
+    """
+    rects: list of pygame.Rect objects
+    bounds: area the rects are clipped to
+    Returns the rects clipped to bounds with overlapping rects joined together
+    """
+
+    merged = []
+    for rect in rects:
+        rect = rect.clip(bounds)
+        if rect.width == 0 or rect.height == 0:
+            continue
+
+        # keep joining until the rect overlaps none of the merged rects
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect = rect.union(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class IdleScreen:
+
+    def __init__(self, buttons: list, idle=True, pacer=None):
+        self.buttons = buttons  # rects that are highlighted while the mouse is over them
+        self.idle = idle  # wait for input between redraws, False redraws every frame for moving screens
+        self.pacer = pacer  # frame pacer restarted after waiting so the wait is not counted as a frame time
+        self.hovered = None  # which buttons were under the mouse when the screen was last drawn
+        self.changed = True  # whether the screen needs a redraw
+
+    def events(self) -> list:
+
+        """
+        Returns the waiting events
+        An idle screen with nothing to redraw blocks until an event arrives or the timeout passes
+        """
+
+        if not self.idle or self.changed:
+            return pygame.event.get()
+        first = pygame.event.wait(idle_timeout)
+        if self.pacer is not None:
+            self.pacer.reset()
+        return [first]+pygame.event.get()
+
+    def needs_redraw(self, events: list, mouse_pos: tuple) -> bool:
+
+        """
+        events: events handled since the last call
+        mouse_pos: current mouse position
+        Returns true if the screen has to be drawn, always for screens that are not idle
+        Clicks, key presses and timeouts redraw, mouse movement only when it enters or leaves a button
+        """
+
+        hovered = [rect.collidepoint(mouse_pos) for rect in self.buttons]
+        if hovered != self.hovered or any(event.type != pygame.MOUSEMOTION for event in events):
+            self.changed = True
+        self.hovered = hovered
+
+        redraw = self.changed or not self.idle
+        self.changed = False
+        return redraw
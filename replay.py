@@ -0,0 +1,140 @@
+import struct
+from persistence import write_atomic
+from simulation import Inputs, Simulation
+
+#  Records the inputs of a game so it can be played again without a window
+#  File layout: header, then runs of frames with the same inputs
+#    header: magic, version, seed, recorded score, number of frames, difficulty and character names
+#    run: number of frames and the input bits, runs with a fireball are one frame long and followed by its target
+
+magic = b'DJRP'
+version = 1
+header = struct.Struct('<4sBqqI')
+name = struct.Struct('<B')
+run = struct.Struct('<HB')
+target = struct.Struct('<ii')
+max_run = 2**16-1
+
+# input bits of a frame
+LEFT = 1
+RIGHT = 2
+JUMP = 4
+FIRE = 8
+
+
+class Recording:
+
+    def __init__(self, seed: int, difficulty: str, character: str):
+        self.seed = seed
+        self.difficulty = difficulty
+        self.character = character
+        self.score = 0  # final score of the recorded game
+        self.frames = 0
+        self.runs = []  # [bits, number of frames, fireball target] lists in frame order
+
+    def record(self, inputs: Inputs) -> None:
+
+        """
+        inputs: inputs of the next simulated frame
+        """
+
+        bits = inputs.left*LEFT | inputs.right*RIGHT | inputs.jump*JUMP | (inputs.fire is not None)*FIRE
+        last = self.runs[-1] if self.runs else None
+        if last is not None and last[0] == bits and not bits & FIRE and last[1] < max_run:
+            last[1] += 1
+        else:
+            fire = None if inputs.fire is None else (round(inputs.fire[0]), round(inputs.fire[1]))
+            self.runs.append([bits, 1, fire])
+        self.frames += 1
+
+    def inputs(self):
+
+        """
+        Yields the inputs of every recorded frame in order
+        """
+
+        for bits, count, fire in self.runs:
+            for i in range(count):
+                yield Inputs(left=bool(bits & LEFT), right=bool(bits & RIGHT), jump=bool(bits & JUMP), fire=fire)
+
+    def encode(self) -> bytes:
+
+        """
+        Returns the recording in the replay file format
+        """
+
+        data = [header.pack(magic, version, self.seed, self.score, self.frames)]
+        for text in (self.difficulty, self.character):
+            encoded = text.encode()
+            data += [name.pack(len(encoded)), encoded]
+        for bits, count, fire in self.runs:
+            data.append(run.pack(count, bits))
+            if bits & FIRE:
+                data.append(target.pack(*fire))
+        return b''.join(data)
+
+    def save(self, path: str) -> None:
+
+        """
+        path: file to write the recording to
+        """
+
+        write_atomic(path, self.encode())
+
+
+def load(path: str) -> Recording:
+
+    """
+    path: recording file
+    Returns the recording, raises ValueError if the file is not a recording
+    """
+
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    try:
+        file_magic, file_version, seed, score, frames = header.unpack_from(data)
+        if file_magic != magic or file_version != version:
+            raise ValueError('{} is not a version {} recording'.format(path, version))
+        offset = header.size
+        texts = []
+        for i in range(2):
+            length, = name.unpack_from(data, offset)
+            offset += name.size
+            texts.append(data[offset:offset+length].decode())
+            offset += length
+
+        recording = Recording(seed, *texts)
+        recording.score = score
+        while offset < len(data):
+            count, bits = run.unpack_from(data, offset)
+            offset += run.size
+            fire = None
+            if bits & FIRE:
+                fire = target.unpack_from(data, offset)
+                offset += target.size
+            recording.runs.append([bits, count, fire])
+            recording.frames += count
+    except struct.error:
+        raise ValueError('{} is truncated'.format(path))
+
+    if recording.frames != frames:
+        raise ValueError('{} is truncated'.format(path))
+    return recording
+
+
+def play(recording: Recording, vectorized=False) -> Simulation:
+
+    """
+    Plays a recorded game again as fast as possible, without a window
+    recording: the recorded game
+    vectorized: check collisions with numpy
+    Returns the finished simulation, its score matches the recorded score unless the game rules changed
+    """
+
+    sim = Simulation(recording.difficulty, recording.character, recording.seed, vectorized=vectorized)
+    for inputs in recording.inputs():
+        if sim.game_over:
+            break
+        sim.step(inputs)
+    return sim
@@ -0,0 +1,116 @@
+import abc
+
+#  Screens of the game as scenes on a stack, only the scene on top runs
+#  Scenes are built the first time they are needed and kept, later visits only run their enter hook
+#  Overlays such as the options screen over the pause screen are pushed on top and popped to go back
+
+
+class Scene(abc.ABC):
+
+    # base of every screen, the hooks do nothing unless a scene needs them
+
+    def __init__(self, state):
+        self.state = state
+
+    def enter(self, **options) -> None:
+
+        """
+        Called when the scene is put on the stack
+        options: values passed to push or switch
+        """
+
+        pass
+
+    def exit(self) -> None:
+
+        """
+        Called when the scene is taken off the stack
+        """
+
+        pass
+
+    def resume(self) -> None:
+
+        """
+        Called when the scene is on top again after the scene above it was popped
+        """
+
+        pass
+
+    @abc.abstractmethod
+    def frame(self) -> None:
+
+        """
+        Handles the events of one frame and draws it
+        """
+
+    def active(self) -> bool:
+
+        """
+        Returns true while the scene is on top, scenes stop drawing a frame once an event has moved to another scene
+        """
+
+        return self.state.scenes.top() is self
+
+
+class SceneStack:
+
+    def __init__(self, state, factories: dict):
+        self.state = state
+        self.factories = factories  # scene name: class built with the state the first time the scene is needed
+        self.built = {}  # scenes by name, kept between visits
+        self.stack = []
+
+    def scene(self, name: str) -> Scene:
+
+        """
+        name: name of the scene
+        Returns the scene, built the first time it is requested
+        """
+
+        if name not in self.built:
+            self.built[name] = self.factories[name](self.state)
+        return self.built[name]
+
+    def top(self) -> Scene:
+
+        """
+        Returns the scene that runs, None once the stack is empty
+        """
+
+        return self.stack[-1] if self.stack else None
+
+    def push(self, name: str, **options) -> None:
+
+        """
+        name: name of the scene to show over the current scene
+        options: passed to the enter hook of the scene
+        """
+
+        scene = self.scene(name)
+        self.stack.append(scene)
+        scene.enter(**options)
+
+    def pop(self) -> None:
+
+        """
+        Closes the scene on top and goes back to the scene below it
+        """
+
+        self.stack.pop().exit()
+        if self.stack:
+            self.stack[-1].resume()
+
+    def switch(self, name: str, **options) -> None:
+
+        """
+        name: name of the scene that replaces every scene on the stack
+        options: passed to the enter hook of the scene
+        """
+
+        while self.stack:
+            self.stack.pop().exit()
+        self.push(name, **options)
+
+    def __len__(self) -> int:
+        return len(self.stack)
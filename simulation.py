@@ -0,0 +1,422 @@
+import pygame
+import random
+import collisions
+from platforms import PlatformStore
+from profiler import NullProfiler
+from sprites import Camera, Player, Origin
+
+#  Game rules without any display, audio or frame rate limit
+
+screen_w = 512
+screen_h = 704
+
+# spawn chances are 1 in n per platform (enemies, powerups) or per frame (projectiles)
+difficulties = {
+    'easy': {'enemy_chance': 20, 'projectile_chance': 200, 'projectile_speed': 4, 'powerup_chance': 5,
+             'enemy_speed': 3},
+    'medium': {'enemy_chance': 10, 'projectile_chance': 100, 'projectile_speed': 6, 'powerup_chance': 10,
+               'enemy_speed': 5},
+    'hard': {'enemy_chance': 5, 'projectile_chance': 50, 'projectile_speed': 8, 'powerup_chance': 20,
+             'enemy_speed': 7}}
+
+
+class Inputs:
+
+    def __init__(self, left=False, right=False, jump=False, fire=None):
+        self.left = left
+        self.right = right
+        self.jump = jump
+        self.fire = fire  # world position a fireball is shot towards, None if no fireball is shot
+
+
+class Simulation:
+
+    def __init__(self, difficulty, character, seed=None, number_of_platforms=15, vectorized=False, settings=None):
+        # every game draws from its own generator so a seed and the inputs are enough to play it again
+        if seed is None:
+            seed = random.randrange(2**63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        if vectorized and not collisions.available():
+            raise RuntimeError('vectorized collisions need numpy')
+        self.vectorized = vectorized  # check all platform sprite collisions at once with numpy
+        self.difficulty = difficulty
+        self.character = character
+        self.settings = dict(difficulties.get(difficulty, difficulties['hard']))
+        if settings is not None:
+            self.settings.update(settings)  # tuning experiments override some of the difficulty settings
+
+        # sprite group that holds all world sprites, they stay in place while the camera follows the player
+        self.dynamic_sprites = pygame.sprite.Group()
+        self.camera = Camera()
+
+        # creating all the current platforms, the store always holds number_of_platforms platforms
+        pos = [self.rng.uniform(100, screen_w-100), screen_h-25]  # create lowest platform
+        self.platforms = PlatformStore(number_of_platforms, self.rng)
+        self.platforms.add(pos)
+        for i in range(1, number_of_platforms):
+            self.platforms.add_next()  # randomly create platforms using previous
+
+        start = self.platforms.slot(3)
+        self.player = Player(self.platforms.center(start)[0], self.platforms.top[start], character)
+
+        self.origin = Origin(self.player.rect.center)  # for scoring system, score is vertical distance from this object
+        self.dynamic_sprites.add(self.origin)
+
+        self.score = 0
+        self.height = 0  # highest the player has climbed above the start, the score without enemy kills
+        self.frame = 0
+        self.game_over = False
+        self.cause_of_death = None  # 'fall', 'enemy' or 'projectile' once the game is over
+        self.profiler = NullProfiler()  # times the phases of each step when the game is profiled
+
+    def positions(self) -> dict:
+
+        """
+        Returns the top left world position of the player, the enemies and the projectiles, the sprites that move
+        """
+
+        positions = {self.player: self.player.rect.topleft}
+        if self.player.projectile is not None:
+            positions[self.player.projectile] = self.player.projectile.rect.topleft
+        for sprite in self.platforms.enemy+self.platforms.projectile:
+            if sprite is not None:
+                positions[sprite] = sprite.rect.topleft
+        return positions
+
+    def step(self, inputs: Inputs) -> list:
+
+        """
+        Advances the game by one fixed step, one step per frame at 60 frames per second
+        inputs: player controls for this step
+        Returns a list of the sound events that happened during the frame: 'jump', 'step', 'fireball', 'explosion'
+        """
+
+        player = self.player
+        platforms = self.platforms
+        events = []
+        self.profiler.begin('player.move')
+
+        if inputs.jump:
+
+            # change player state to jumping if jump is pressed while on a platform
+            if player.on_platform:
+                player.is_jumping = True
+                player.on_platform = False
+                player.time = 0
+                events.append('jump')
+
+            # reset jump time if jump is pressed in the air and the player has a double jump powerup
+            elif player.powerups['double_jump'] > 0:
+                player.powerups['double_jump'] -= 1
+                player.is_jumping = True
+                player.time = 0
+                events.append('jump')
+
+        # create player fireball if player has powerup and no active fireballs
+        if inputs.fire is not None and player.powerups['fireball'] > 0 and player.projectile is None:
+            player.powerups['fireball'] -= 1
+            player.create_projectile(inputs.fire, self.dynamic_sprites)
+            events.append('fireball')
+
+        player.move(inputs.left, inputs.right, self.camera)
+
+        # move and check fireball position
+        if player.projectile is not None:
+            player.projectile.move()
+            if player.projectile.hits_boundary(self.camera):
+                player.remove_projectile()
+
+        # check if lowest platform is out of bounds, create new one if true
+        self.profiler.begin('spawn')
+        if platforms.top[platforms.start]-self.camera.y > screen_h+50:
+            platforms.remove_lowest()
+            slot = platforms.add_next()
+
+            # create new enemy if true
+            if self.rng.choice(range(self.settings['enemy_chance'])) == 0:
+                platforms.create_enemy(slot, self.dynamic_sprites, self.settings['enemy_speed'])
+
+            # create new powerup if true
+            if self.rng.choice(range(self.settings['powerup_chance'])) == 0:
+                platforms.create_powerup(slot, self.dynamic_sprites)
+
+        self.profiler.begin('collisions')
+
+        # only platforms with their top between the player's feet before and after moving can be landed on or fallen off
+        landing = platforms.between(min(player.last_bottom, player.rect.bottom), player.rect.bottom)
+
+        if self.vectorized:
+            self.update_platforms_vectorized(landing, events)
+        else:
+            self.update_platforms(landing, events)
+
+        # if player is below the lowest platform
+        if player.falls_below(platforms.top[platforms.start]+platforms.h, self.camera):
+            self.die('fall')
+
+        # recalculate the current score
+        if self.origin.rect.center[1]-player.rect.center[1] > self.score:
+            self.score = self.origin.rect.center[1]-player.rect.center[1]
+        self.height = max(self.height, self.origin.rect.center[1]-player.rect.center[1])
+
+        self.frame += 1
+        return events
+
+    def die(self, cause: str) -> None:
+
+        """
+        cause: 'fall', 'enemy' or 'projectile'
+        Ends the game, the first cause of the step is kept
+        """
+
+        if not self.game_over:
+            self.cause_of_death = cause
+        self.game_over = True
+
+    def update_platforms(self, landing: range, events: list) -> None:
+
+        """
+        Checks the player against every platform and its enemy, powerup and projectile one pair at a time
+        landing: positions of the platforms the player can land on or fall off this step
+        events: list the sound events are added to
+        """
+
+        player = self.player
+        platforms = self.platforms
+
+        current_platform = True  # for checking player position relative to all platforms below the player
+        for i in range(len(platforms)):
+            slot = platforms.slot(i)
+
+            if current_platform and i in landing:
+                left = platforms.left[slot]
+                right = left+platforms.w
+                top = platforms.top[slot]
+
+                if player.falls_off(left, right, top):
+                    current_platform = False  # stop checking player position realtive to platforms above
+
+                # change player state to on platform and create walking sound
+                elif player.lands_on(left, right, top, self.camera):
+                    events.append('step')
+                    current_platform = False
+
+            # add powerup to player powerups and remove from game
+            powerup = platforms.powerup[slot]
+            if powerup is not None and player.touches(powerup):
+                player.consumes(powerup)
+                platforms.remove_powerup(slot)
+
+            # move enemy and check logic if platform has an enemy associated
+            enemy = platforms.enemy[slot]
+            if enemy is not None:
+                enemy.move()
+
+                # check if player kills an enemy
+                if player.projectile is not None and player.projectile.hits(enemy):
+                    events.append('explosion')
+                    platforms.remove_enemy(slot)
+                    self.score += 500
+
+                # check if enemy kills the player
+                elif player.touches(enemy):
+                    self.die('enemy')
+
+            # if platform enemy created a projectile
+            projectile = platforms.projectile[slot]
+            if projectile is not None:
+                projectile.move()
+
+                if projectile.hits(player):
+                    events.append('explosion')
+
+                    # check if player has any extra lives
+                    if player.powerups['lives'] > 1:
+                        player.powerups['lives'] -= 1
+                        platforms.remove_projectile(slot)
+
+                    else:
+                        self.die('projectile')
+
+                # remove projectile if out of bounds
+                elif projectile.hits_boundary(self.camera):
+                    platforms.remove_projectile(slot)
+
+            # create new projectile if platform has an associated enemy and random chance returns true
+            elif platforms.enemy[slot] is not None and self.rng.choice(range(self.settings['projectile_chance'])) == 0:
+                platforms.create_projectile(slot, self.settings['projectile_speed'], self.dynamic_sprites)
+                events.append('fireball')
+
+    def update_platforms_vectorized(self, landing: range, events: list) -> None:
+
+        """
+        Same as update_platforms but checks every collision of the step at once with numpy
+        landing: positions of the platforms the player can land on or fall off this step
+        events: list the sound events are added to
+        """
+
+        player = self.player
+        platforms = self.platforms
+        slots = [platforms.slot(i) for i in range(len(platforms))]
+
+        # landing only moves the player, platforms checked before the one landed on see the player where it was
+        before = player.rect.copy()
+        landed = None
+        for i in landing:
+            slot = slots[i]
+            left = platforms.left[slot]
+            right = left+platforms.w
+            top = platforms.top[slot]
+            if player.falls_off(left, right, top):
+                break
+            elif player.lands_on(left, right, top, self.camera):
+                landed = i
+                break
+
+        # enemies and projectiles move on their own, so all of them can move before any collision is checked
+        for slot in slots:
+            if platforms.enemy[slot] is not None:
+                platforms.enemy[slot].move()
+            if platforms.projectile[slot] is not None:
+                platforms.projectile[slot].move()
+
+        if landed is None:
+            player_rects = collisions.rect_array([player.rect]*len(slots))
+        else:
+            player_rects = collisions.rect_array([before]*landed+[player.rect]*(len(slots)-landed))
+        powerups = collisions.rect_array([None if platforms.powerup[slot] is None else platforms.powerup[slot].rect
+                                          for slot in slots])
+        enemies = collisions.rect_array([None if platforms.enemy[slot] is None else platforms.enemy[slot].rect
+                                         for slot in slots])
+        projectiles = collisions.rect_array([None if platforms.projectile[slot] is None
+                                             else platforms.projectile[slot].rect for slot in slots])
+
+        consumed = collisions.overlapping(player_rects, powerups)
+        touched = collisions.overlapping(player_rects, enemies)
+        hit = collisions.overlapping(projectiles, player_rects)
+        if player.projectile is not None:
+            killed = collisions.overlapping(collisions.rect_array([player.projectile.rect]), enemies)
+        else:
+            killed = collisions.overlapping(collisions.rect_array([None]), enemies)
+
+        # outcomes are applied lowest platform first, like the per pair checks, since lives and spawns depend on order
+        active = consumed | touched | hit | collisions.occupied(enemies) | collisions.occupied(projectiles)
+        if landed is not None:
+            active[landed] = True
+        for i in active.nonzero()[0].tolist():
+            slot = slots[i]
+
+            if i == landed:
+                events.append('step')
+
+            # add powerup to player powerups and remove from game
+            if consumed[i]:
+                player.consumes(platforms.powerup[slot])
+                platforms.remove_powerup(slot)
+
+            # check if player kills an enemy, otherwise if enemy kills the player
+            if killed[i]:
+                events.append('explosion')
+                platforms.remove_enemy(slot)
+                self.score += 500
+            elif touched[i]:
+                self.die('enemy')
+
+            projectile = platforms.projectile[slot]
+            if projectile is not None:
+                if hit[i]:
+                    events.append('explosion')
+
+                    # check if player has any extra lives
+                    if player.powerups['lives'] > 1:
+                        player.powerups['lives'] -= 1
+                        platforms.remove_projectile(slot)
+
+                    else:
+                        self.die('projectile')
+
+                # remove projectile if out of bounds
+                elif projectile.hits_boundary(self.camera):
+                    platforms.remove_projectile(slot)
+
+            # create new projectile if platform has an associated enemy and random chance returns true
+            elif platforms.enemy[slot] is not None and self.rng.choice(range(self.settings['projectile_chance'])) == 0:
+                platforms.create_projectile(slot, self.settings['projectile_speed'], self.dynamic_sprites)
+                events.append('fireball')
+
+
+class ReferencePlayer:
+
+    """
+    Scripted player for headless runs, jumps whenever it stands on a platform, steers towards the next platform above
+    and shoots fireballs at the closest enemy
+    """
+
+    def __init__(self):
+        self.target = None  # serial number of the platform the player is currently jumping to
+
+    def inputs(self, sim: Simulation) -> Inputs:
+
+        """
+        sim: the running simulation
+        Returns the inputs for the next frame
+        """
+
+        player = sim.player
+
+        platforms = sim.platforms
+        slots = [platforms.slot(i) for i in range(len(platforms))]
+
+        # pick the next platform above when standing or when the target has been removed
+        target = None
+        if not player.on_platform:
+            for slot in slots:
+                if platforms.serial[slot] == self.target:
+                    target = slot
+        if target is None:
+            self.target = None
+            for slot in slots:
+                if platforms.top[slot] < player.rect.bottom:
+                    target = slot
+                    self.target = platforms.serial[slot]
+                    break
+
+        left = right = False
+        if target is not None:
+            dx = platforms.center(target)[0]-player.rect.center[0]
+            left = dx < -player.v_x
+            right = dx > player.v_x
+
+        fire = None
+        if player.powerups['fireball'] > 0 and player.projectile is None:
+            enemies = [platforms.enemy[slot] for slot in slots if platforms.enemy[slot] is not None]
+            if enemies:
+                enemy = min(enemies, key=lambda e: abs(e.rect.center[1]-player.rect.center[1]))
+                if enemy.rect.center != player.rect.center:
+                    fire = enemy.rect.center
+
+        return Inputs(left=left, right=right, jump=player.on_platform, fire=fire)
+
+
+def run_headless(difficulty: str, character: str, seed=None, frames=10000, vectorized=False, recording=None) -> Simulation:
+
+    """
+    Runs a single game with the scripted player as fast as possible
+    difficulty: 'easy', 'medium' or 'hard'
+    character: name of the player character
+    seed: random seed for platform, enemy and powerup generation
+    frames: maximum number of frames to simulate
+    vectorized: check collisions with numpy
+    recording: replay.Recording the inputs of every frame are added to, None to not record the game
+    Returns the finished simulation
+    """
+
+    sim = Simulation(difficulty, character, seed, vectorized=vectorized)
+    bot = ReferencePlayer()
+    while not sim.game_over and sim.frame < frames:
+        inputs = bot.inputs(sim)
+        if recording is not None:
+            recording.record(inputs)
+        sim.step(inputs)
+    return sim
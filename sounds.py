@@ -1,24 +1,106 @@
+import time
 import pygame
 
-pygame.mixer.init()
+#  Plays the sound effects on mixer channels reserved for each kind of sound
+#  The mixer is opened on first use so importing the game never needs an audio device, without one the game is silent
 
-jump_sound = pygame.mixer.Sound('sounds/jump.wav')
-step_sound = pygame.mixer.Sound('sounds/step.wav')
-fireball_sound = pygame.mixer.Sound('sounds/fireball.wav')
-explosion_sound = pygame.mixer.Sound('sounds/fireball_explosion.wav')
+files = {
+    'jump': 'sounds/jump.wav',
+    'step': 'sounds/step.wav',
+    'fireball': 'sounds/fireball.wav',
+    'explosion': 'sounds/fireball_explosion.wav'}
 
+# channels reserved for each category, a sound only plays on the channels of its category
+categories = {'jump': 'movement', 'step': 'movement', 'fireball': 'fireball', 'explosion': 'explosion'}
+reserved = {'movement': 2, 'fireball': 2, 'explosion': 2}
 
-def adjust_volume(volume: float) -> None:
+# shortest time between two plays of the same sound in seconds, plays closer together are dropped
+min_interval = {'jump': 0.05, 'step': 0.08, 'fireball': 0.03, 'explosion': 0.03}
+
+frequency = 44100
+buffer = 512  # samples per mixer buffer, smaller buffers play sooner but can crackle on slow machines
+
+
+def pre_init(buffer_size=buffer) -> None:
 
     """
-    volume: float value between 0 and 1 representing the volume of sound effects
-    Sets the volume of all sound effects to the value volume
+    buffer_size: samples per mixer buffer
+    Sets the mixer options, call before pygame.init which opens the mixer with them
     """
 
-    jump_sound.set_volume(volume)
-    step_sound.set_volume(volume)
-    fireball_sound.set_volume(volume)
-    explosion_sound.set_volume(volume)
+    pygame.mixer.pre_init(frequency, -16, 2, buffer_size)
+
+
+class SoundManager:
+
+    def __init__(self, volume=0.5):
+        self.volume = volume  # volume of every sound effect between 0 and 1
+        self.enabled = None  # whether the mixer opened, None until the first use
+        self.sounds = {}
+        self.channels = {}  # category: reserved channels
+        self.started = {}  # channel: time its sound started playing
+        self.last_played = {}  # sound: time it last started playing
+
+    def init(self) -> bool:
+
+        """
+        Opens the mixer and loads the sounds if that was not tried before
+        Returns whether sounds can be played
+        """
+
+        if self.enabled is not None:
+            return self.enabled
+
+        try:
+            if pygame.mixer.get_init() is None:
+                pygame.mixer.init()
+            self.sounds = {sound: pygame.mixer.Sound(path) for sound, path in files.items()}
+        except pygame.error:
+            self.enabled = False
+            return False
+
+        # reserved channels are never picked by pygame for sounds played without a channel
+        total = sum(reserved.values())
+        pygame.mixer.set_num_channels(max(total, pygame.mixer.get_num_channels()))
+        pygame.mixer.set_reserved(total)
+        first = 0
+        for category, n in reserved.items():
+            self.channels[category] = [pygame.mixer.Channel(i) for i in range(first, first+n)]
+            first += n
+
+        self.enabled = True
+        self.adjust_volume(self.volume)
+        return True
+
+    def play(self, sound: str) -> None:
+
+        """
+        sound: name of the sound effect
+        Plays the sound on a free channel of its category, or on the one that has played the longest if all are busy
+        """
+
+        if not self.init():
+            return
+
+        now = time.perf_counter()
+        if now-self.last_played.get(sound, -1) < min_interval[sound]:
+            return
+        self.last_played[sound] = now
+
+        channels = self.channels[categories[sound]]
+        channel = next((channel for channel in channels if not channel.get_busy()), None)
+        if channel is None:
+            channel = min(channels, key=lambda busy: self.started.get(busy, 0))
+        channel.play(self.sounds[sound])
+        self.started[channel] = now
+
+    def adjust_volume(self, volume: float) -> None:
 
+        """
+        volume: float value between 0 and 1 representing the volume of sound effects
+        Sets the volume of all sound effects to the value volume
+        """
 
-adjust_volume(0.5)
+        self.volume = volume
+        for sound in self.sounds.values():
+            sound.set_volume(volume)
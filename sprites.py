@@ -0,0 +1,427 @@
+import pygame
+import random
+import frames
+
+#  Holds all the sprite classes used by the game
+#  Sprite rects are in world coordinates, the camera gives the world height at the top of the screen
+
+screen_w = 512
+screen_h = 704
+
+selection_run_rate = 12  # run frames per second of the characters on the selection screen
+
+
+class Camera:
+
+    def __init__(self):
+        self.y = 0  # world y coordinate shown at the top of the screen
+
+    def scroll(self, dy: int) -> None:
+
+        """
+        dy: distance to scroll the world down the screen, positive when the player rises
+        """
+
+        self.y -= dy
+
+    def to_screen(self, rect: pygame.Rect) -> pygame.Rect:
+
+        """
+        rect: rect in world coordinates
+        Returns the rect in screen coordinates
+        """
+
+        return rect.move(0, -self.y)
+
+
+class Player(pygame.sprite.Sprite):
+
+    def __init__(self, x, y, name):
+        super().__init__()
+        self.name = name
+        self.v_x = 5
+        self.v_y = 8.5
+        self.g = 6
+        self.time = 0
+        self.dt = 0.135
+        self.on_platform = True
+        self.is_jumping = False
+        self.is_falling = False
+        self.face_right = True
+        self.is_stationary = True
+        self.powerups = {'lives': 1, 'double_jump': 0, 'fireball': 0}
+        self.projectile = None
+        self.frame = 0
+        self.selection_time = 0  # seconds the character has run on the selection screen
+        self.last_bottom = 0  # world position of the player's feet before the last move
+
+        animations = frames.character_frames(name)
+        self.run_right = animations['run_right']
+        self.run_left = animations['run_left']
+        self.jump_image = animations['jump']
+        self.stationary_image = animations['idle']
+        self.surf = self.stationary_image[0]
+        self.w, self.h = self.surf.get_size()
+        self.rect = self.surf.get_rect()
+        self.rect.center = (round(x), 0)
+        self.rect.bottom = round(y)
+
+    def move(self, left: bool, right: bool, camera: Camera) -> None:
+    
+        """
+        Moves the player and camera vertically the calculated distance each frame according to projectile motion equations
+        Moves the player horizontally according to the pressed direction
+        left: true if the player is moving left
+        right: true if the player is moving right
+        camera: camera following the player
+        """
+
+        self.last_bottom = self.rect.bottom
+
+        if left:
+            self.rect.move_ip((-self.v_x, 0))
+            self.face_right = False
+            self.frame += 1
+            self.is_stationary = False
+            if self.rect.center[0] < 0:
+                self.rect.right = screen_w+self.w//2
+        elif right:
+            self.rect.move_ip((self.v_x, 0))
+            self.face_right = True
+            self.frame += 1
+            self.is_stationary = False
+            if self.rect.center[0] > screen_w:
+                self.rect.left = -self.w//2
+        else:
+            self.frame = 0
+            self.is_stationary = True
+
+        dy = 0
+        if self.is_jumping:
+            self.time += self.dt
+            dy = round(self.v_y*self.time-0.5*self.g*self.time ** 2)  # projectile motion equation dy = v_y*t - 0.5*g*t**2
+        elif self.is_falling:
+            self.time += self.dt
+            dy = round(-0.5*self.g*self.time ** 2)  # projectile motion equation dy = - 0.5*g*t**2
+        if dy < -1.6*self.v_y:
+            dy = -14
+        if dy != 0:
+            self.rect.move_ip((0, -dy))
+            camera.scroll(dy)
+
+    def touches(self, enemy: pygame.sprite.Sprite) -> bool:
+    
+        """
+        enemy: sprite object to be checked for a collision with player
+        Return truth value of collision
+        """
+    
+        return self.rect.colliderect(enemy.rect)
+
+    def falls_below(self, bottom: int, camera: Camera) -> bool:
+    
+        """
+        bottom: bottom of the platform to compare height with player
+        camera: camera following the player
+        Return true if player is below the platform and has fallen off the screen
+        """
+    
+        if self.rect.top > bottom:
+            self.rect.move_ip((0, 5))
+            if self.rect.top-camera.y >= screen_h:
+                return True
+        return False
+
+    def lands_on(self, left: int, right: int, top: int, camera: Camera) -> bool:
+    
+        """
+        left, right, top: edges of the platform to check if player landed on
+        camera: camera following the player, shifted along with the player if needed to prevent issues with rounding
+        Return true if the player's feet passed the platform top while moving down this frame
+        """
+    
+        if not self.on_platform and (self.rect.left <= right) and (self.rect.right >= left):
+            if self.last_bottom <= top <= self.rect.bottom:
+                dy = round(top-self.rect.bottom)
+                
+                # handling rounding errors
+                self.rect.move_ip((0, dy))
+                camera.scroll(-dy)
+                self.on_platform = True
+                self.is_jumping = False
+                self.is_falling = False
+                self.time = 0
+                return True
+        return False
+
+    def falls_off(self, left: int, right: int, top: int) -> bool:
+    
+        """
+        left, right, top: edges of the platform to check if player fell off
+        Returns boolean indicating if player moved off a platform without jumping
+        """
+     
+        if (self.rect.left > right) or (self.rect.right < left):
+            if self.rect.bottom == top:
+                self.on_platform = False
+                self.is_falling = True
+                return True
+        return False
+
+    def consumes(self, powerup: pygame.sprite.Sprite) -> None:
+    
+        """
+        powerup: powerup to add to player inventory
+        """
+    
+        self.powerups[powerup.name] += 1
+
+    def animate(self) -> None:
+    
+        """
+        For handling player animations
+        """
+    
+        if self.face_right:
+            if self.is_jumping or self.is_falling:
+                self.surf = self.jump_image[0]
+            elif self.is_stationary:
+                self.surf = self.stationary_image[0]
+            else:
+                self.surf = self.run_right[self.frame//5 % 4]
+        else:
+            if self.is_jumping or self.is_falling:
+                self.surf = self.jump_image[1]
+            elif self.is_stationary:
+                self.surf = self.stationary_image[1]
+            else:
+                self.surf = self.run_left[self.frame//5 % 4]
+
+    def selection_animate(self, dt: float) -> None:
+    
+        """
+        For handling animations in the character selection screen
+        dt: seconds since the last frame
+        """
+    
+        self.surf = self.run_right[int(self.selection_time*selection_run_rate) % 4]
+        self.selection_time += dt
+
+    def create_projectile(self, pos, dynamic_sprites: pygame.sprite.Group) -> None:
+    
+        """
+        Create fireball upon mouse click
+        pos: mouse position when clicked to create the projectile
+        dynamic_sprites: sprite group to add the projectile to
+        """
+    
+        v = pygame.math.Vector2()
+        v.xy = (pos[0]-self.rect.center[0]) / 40, (pos[1]-self.rect.center[1]) / 40
+        norm = v.length()
+        if norm < 6:
+            v = v*6 / norm
+        self.projectile = Projectile(self.rect.center, round(v[0]), round(v[1]))
+        dynamic_sprites.add(self.projectile)
+
+    def remove_projectile(self) -> None:
+    
+        """
+        Remove projectile from associated objects
+        """
+    
+        self.projectile.kill()
+        self.projectile = None
+
+
+class Enemy(pygame.sprite.Sprite):
+
+    def __init__(self, x, y, v_x, rng: random.Random):
+        super().__init__()
+        self.v_x = v_x
+        self.face_right = rng.randint(0, 1)
+        self.frame = 0
+        self.run_right = frames.demon_run_right_img
+        self.run_left = frames.demon_run_left_img
+        if self.face_right:
+            self.surf = self.run_right[0]
+        else:
+            self.surf = self.run_left[0]
+        self.rect = self.surf.get_rect()
+        self.rect.center = (x, 0)
+        self.rect.bottom = y
+
+    def move(self) -> None:
+    
+        """
+        Moves the enemy distance (v_x, v_y) per frame
+        """
+    
+        if self.face_right:
+            self.rect.move_ip((self.v_x, 0))
+            self.frame += 1
+            self.surf = self.run_right[self.frame//4 % 4]
+            if self.rect.right > screen_w:
+                self.face_right = False
+        else:
+            self.rect.move_ip((-self.v_x, 0))
+            self.frame += 1
+            self.surf = self.run_left[self.frame//4 % 4]
+            if self.rect.left < 0:
+                self.face_right = True
+
+
+class Projectile(pygame.sprite.Sprite):
+
+    def __init__(self, pos, v_x, v_y):
+        super().__init__()
+        self.v_x = v_x
+        self.v_y = v_y
+        self.surf = frames.fire_img
+        self.rect = self.surf.get_rect()
+        self.rect.center = (pos[0], pos[1])
+        self.new_projectile = True
+
+    def move(self) -> None:
+    
+        """
+        Moves the projectile distance (v_x, v_y) per frame
+        """
+    
+        self.rect.move_ip((self.v_x, self.v_y))
+
+    def hits(self, obj: pygame.sprite.Sprite) -> bool:
+    
+        """
+        obj: pygame.sprite.Sprite object that may have collided with the projectile
+        Return boolean value indicating a collision
+        """
+    
+        if self.rect.colliderect(obj.rect):
+            return True
+        return False
+
+    def hits_boundary(self, camera: Camera) -> bool:
+    
+        """
+        camera: camera showing the current screen
+        Return a boolean indicating whether the projectile has moved out of bounds
+        """
+
+        rect = camera.to_screen(self.rect)
+        if self.new_projectile and rect.bottom <= 0:
+            return False
+        else:
+            self.new_projectile = False
+        if rect.left >= screen_w or rect.right <= 0:
+            return True
+        if rect.top >= screen_h or rect.bottom <= 0:
+            return True
+        return False
+
+
+class Powerup(pygame.sprite.Sprite):
+
+    def __init__(self, x, y, name):
+        super().__init__()
+        self.name = name
+        if self.name == 'lives':
+            self.surf = frames.heart_img
+        elif self.name == 'double_jump':
+            self.surf = frames.blue_flask_img
+        elif self.name == 'fireball':
+            self.surf = frames.red_flask_img
+        self.rect = self.surf.get_rect()
+        self.rect.center = (round(x), 0)
+        self.rect.bottom = round(y)
+
+
+class Origin(pygame.sprite.Sprite):
+
+    def __init__(self, pos):
+        super().__init__()
+        self.surf = pygame.Surface((1, 1))
+        self.rect = self.surf.get_rect()
+        self.rect.center = (pos[0], pos[1])
+
+
+# background layers from back to front, the image in frames and how fast the layer scrolls compared to the world
+# the back layer is opaque and copied without blending, the layers in front of it are blended over it
+background_layers = [('background_img', 1)]
+
+
+class BackgroundLayer:
+
+    def __init__(self, image: pygame.Surface, rate: float, opaque: bool):
+        self.rate = rate
+        self.w, self.h = image.get_size()
+
+        # the image repeated down a strip so any screen high window of it is one piece, in the display pixel format
+        # images narrower than the screen are also repeated across it
+        copies = 1-(-screen_h//self.h)
+        columns = -(-screen_w//self.w)
+        size = (self.w*columns, self.h*copies)
+        if opaque:
+            self.strip = pygame.Surface(size).convert()
+        else:
+            self.strip = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+        for i in range(copies):
+            for j in range(columns):
+                self.strip.blit(image, (j*self.w, i*self.h), special_flags=pygame.BLEND_RGBA_MAX)
+
+        self.area = None  # part of the strip shown on the screen
+        self.surf = None  # that part as a subsurface of the strip
+
+    def window(self, scroll: float) -> pygame.Rect:
+
+        """
+        scroll: distance the world has moved down the screen
+        Returns the part of the strip shown on the screen
+        """
+
+        return pygame.Rect(0, -round(scroll*self.rate) % self.h, screen_w, screen_h)
+
+    def view(self, scroll: float) -> pygame.Surface:
+
+        """
+        scroll: distance the world has moved down the screen
+        Returns the part of the strip shown on the screen, the same surface until the layer moves
+        """
+
+        area = self.window(scroll)
+        if area != self.area:
+            self.area = area
+            self.surf = self.strip.subsurface(area)
+        return self.surf
+
+
+class Background:
+
+    def __init__(self, scroll=0):
+        self.layers = [BackgroundLayer(getattr(frames, name), rate, i == 0)
+                       for i, (name, rate) in enumerate(background_layers)]
+        self.scroll = scroll  # distance the world has moved down the screen, each layer moves by its rate
+
+    def move(self, dy: float) -> None:
+
+        """
+        dy: distance to move the background down the screen, positive when the player rises
+        """
+
+        self.scroll += dy
+
+    def draw(self, screen: pygame.Surface) -> None:
+
+        """
+        Draws every layer with one blit of the visible part of its strip
+        """
+
+        for layer in self.layers:
+            screen.blit(layer.strip, (0, 0), layer.window(self.scroll))
+
+    def views(self) -> list:
+
+        """
+        Returns the layers and the parts of their strips shown on the screen, for drawing with other sprites
+        """
+
+        return [(layer, layer.view(self.scroll)) for layer in self.layers]
@@ -0,0 +1,22 @@
+import pytest
+import collisions
+
+#  The vectorized collision stage must play exactly the same games as the per sprite checks
+
+pytest.importorskip('numpy')
+
+frames = 2000  # most frames of each game
+
+
+@pytest.mark.parametrize('difficulty', ['easy', 'medium', 'hard'])
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_vectorized_matches_per_sprite(difficulty, seed):
+    expected = collisions.trace(difficulty, seed, False, frames)
+    result = collisions.trace(difficulty, seed, True, frames)
+    assert len(result) == len(expected)
+    assert result[-1][0] == expected[-1][0]
+    assert result == expected
+
+
+def test_check():
+    assert collisions.check(seeds=range(2), frames=500)